@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 import os
 from decouple import config
+from core.db.sqlite import production_options as sqlite_production_options
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -40,16 +41,21 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'core',
     'users',
     'course',
+    'messaging',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
+    'core.middleware.TemplateProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.RequestContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -60,8 +66,16 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': ['templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept for the life of the worker (runserver
+            # still reloads them on change); wsgi.py/asgi.py precompile them all
+            # at boot when TEMPLATE_WARM_UP is set (see core.rendering).
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -78,24 +92,81 @@ WSGI_APPLICATION = 'afterschool.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.postgresql',
-#         'NAME': 'afterschool',
-#         'USER': 'postgres',  # Ou 'afterschool_user' si vous avez créé un utilisateur spécifique
-#         'PASSWORD': 'votre_mot_de_passe_postgres',  # Remplacez par le mot de passe de l'utilisateur
-#         'HOST': 'localhost',
-#         'PORT': '5432',
-#     }
-# }
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+DB_ENGINE = config('DB_ENGINE', default='sqlite3')
+
+if DB_ENGINE == 'postgresql':
+    # Connections come from a bounded per-process pool (see
+    # core.db.backends.postgresql); CONN_MAX_AGE=0 returns them to the pool
+    # at the end of each request.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='afterschool'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            'CONN_MAX_AGE': 0,
+            'POOL': {
+                'max_size': config('DB_POOL_MAX_SIZE', default=20, cast=int),
+                'timeout': config('DB_POOL_TIMEOUT', default=5.0, cast=float),
+                'max_idle': config('DB_POOL_MAX_IDLE', default=300.0, cast=float),
+                'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=3600.0, cast=float),
+                'ping_after': config('DB_POOL_PING_AFTER', default=1.0, cast=float),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+    if config('SQLITE_PRODUCTION', default=False, cast=bool):
+        # WAL, busy timeout and BEGIN IMMEDIATE writes (see core.db.sqlite).
+        # Keep connections open so the pragmas are applied once per worker.
+        DATABASES['default'].update({
+            'OPTIONS': sqlite_production_options(),
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
+        })
+
+# Cache
+# The shared tier of core.cache.tiered_cache. Use Redis whenever more than
+# one worker process serves the site; LocMemCache is per-process.
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'afterschool',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
     }
+
+TIERED_CACHE = {
+    'ALIAS': 'default',
+    'LOCAL_MAX_ENTRIES': config('CACHE_LOCAL_MAX_ENTRIES', default=1024, cast=int),
+    # Upper bound on how long another worker may serve an invalidated entry.
+    'LOCAL_TTL': config('CACHE_LOCAL_TTL', default=5.0, cast=float),
+    'DEFAULT_TIMEOUT': 300,
 }
 
+# Sessions are read from the cache and written to the database only when
+# their content changes. Run `purge_sessions` periodically to drop expired rows.
+SESSION_ENGINE = 'core.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -134,6 +205,28 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+# Production: minified CSS/JS, optimised images, hashed names and .gz/.br
+# siblings, set STATIC_ASSET_PIPELINE=True and run `manage.py build_assets`
+# on deploy (see core.storage). The manifest it reads only exists after that
+# run, so development and tests keep the plain storage.
+STATIC_ASSET_PIPELINE = config('STATIC_ASSET_PIPELINE', default=False, cast=bool)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'core.storage.AssetStorage' if STATIC_ASSET_PIPELINE
+        else 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+ASSETS = {
+    'MIN_COMPRESS_SIZE': 256,
+    # Longest side in px, per static path; the logo is shown at 180px at most.
+    'IMAGE_MAX_SIZE': {
+        'media/logo.png': 384,
+        'media/images/logo.png': 384,
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -154,6 +247,63 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
 
 
+# Per-request SQL profiling (core.middleware.QueryInstrumentationMiddleware).
+# A shape repeated N_PLUS_ONE_THRESHOLD times in one request is reported as
+# an N+1 suspect on the 'afterschool.sql' logger.
+SQL_INSTRUMENTATION = {
+    'SAMPLE_RATE': config('SQL_SAMPLE_RATE', default=1.0 if DEBUG else 0.01, cast=float),
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'MAX_FINGERPRINTS': 200,
+    'STACK_DEPTH': 4,
+}
+
+# Per-template/per-block render time and query counts for sampled requests,
+# reported in Server-Timing and on the afterschool.templates logger.
+TEMPLATE_PROFILING = {
+    'SAMPLE_RATE': config('TEMPLATE_SAMPLE_RATE', default=1.0 if DEBUG else 0.01, cast=float),
+    'TOP': 5,
+}
+TEMPLATE_WARM_UP = config('TEMPLATE_WARM_UP', default=not DEBUG, cast=bool)
+
+# Bearer token accepted by /metrics/ in addition to staff sessions.
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Trust the first X-Forwarded-For entry as client IP (only behind a proxy
+# that sets it).
+USE_X_FORWARDED_FOR = config('USE_X_FORWARDED_FOR', default=False, cast=bool)
+
+# Token buckets for endpoints that hash passwords or send email
+# (core.ratelimit). '10/m' = 10 requests, refilled at 10 per minute.
+RATE_LIMITS = {
+    'ENABLED': config('RATE_LIMITS_ENABLED', default=True, cast=bool),
+    'CACHE_ALIAS': 'default',
+    'SCOPES': {
+        'login': {'ip': '30/m', 'email': '10/m'},
+        'signup': {'ip': '5/h', 'email': '3/h'},
+        'activate': {'ip': '20/m'},
+        'two_factor': {'ip': '20/m'},
+    },
+}
+
+# Emailed one-time login codes (users.two_factor), kept in the cache.
+TWO_FACTOR = {
+    'REQUIRED_FOR_STAFF': config('TWO_FACTOR_REQUIRED_FOR_STAFF', default=False, cast=bool),
+    'TTL': 600,
+    'MAX_ATTEMPTS': 5,
+    'CACHE_ALIAS': 'default',
+}
+
+# Write-behind activity log (core.events): events are buffered in memory
+# and inserted by a background thread every BATCH_SIZE events or
+# FLUSH_INTERVAL_MS milliseconds. Events beyond MAX_QUEUE are dropped.
+ACTIVITY_EVENTS = {
+    'ENABLED': config('ACTIVITY_EVENTS_ENABLED', default=True, cast=bool),
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL_MS': 1000,
+    'MAX_QUEUE': 10000,
+}
+
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -169,3 +319,22 @@ LOGGING = {
         },
     },
 }
+
+# Announcement e-mails (messaging.announcements), sent by
+# `manage.py send_announcements` over one SMTP connection: BATCH_SIZE
+# messages per send_messages() call, at most RATE_PER_MINUTE per minute (the
+# mail provider's limit). A worker that stops renewing its lease for
+# LEASE_SECONDS is presumed dead and its announcement resumes elsewhere.
+ANNOUNCEMENTS = {
+    'BATCH_SIZE': 50,
+    'RATE_PER_MINUTE': config('ANNOUNCEMENT_EMAILS_PER_MINUTE', default=60, cast=int),
+    'LEASE_SECONDS': 300,
+    'MAX_RETRIES': 3,
+    'SITE_URL': config('SITE_URL', default='http://localhost:8000'),
+}
+
+# Course and module content, rendered to sanitized HTML on save (course.content).
+CONTENT_RENDERING = {
+    'MARKDOWN_EXTENSIONS': ['extra', 'sane_lists'],
+    'WORDS_PER_MINUTE': 200,
+}
@@ -23,5 +23,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('users.urls')),
     path('courses/', include('course.urls')),
+    path('api/', include('course.api_urls')),
+    path('messages/', include('messaging.urls')),
+    path('', include('core.urls')),
 ]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
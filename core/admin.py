@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import ActivityEvent
+
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'author', 'target_type', 'target_id', 'ip_address', 'occurred_at')
+    list_filter = ('kind',)
+    list_select_related = False
+    search_fields = ('author',)
+    date_hierarchy = 'occurred_at'
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
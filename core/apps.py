@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+
+        if getattr(settings, 'TEMPLATE_PROFILING', {}).get('SAMPLE_RATE'):
+            from . import rendering
+            rendering.install()
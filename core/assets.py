@@ -0,0 +1,161 @@
+"""Third-party front-end assets, self-hosted under ``static/vendor/``.
+
+``VENDOR_ASSETS`` pins every library, font and stock image the templates
+load. ``manage.py build_assets`` downloads them (with the fonts and images
+their stylesheets reference) into ``static/vendor/``, then runs
+``collectstatic`` so ``core.storage.AssetStorage`` can minify, hash and
+precompress them with the rest of the static files.
+
+Templates reference an asset by name through ``{% vendor %}`` /
+``{% vendor_url %}`` (``core.templatetags.assets``): the local copy is used
+once it has been vendored, the pinned CDN URL until then.
+"""
+import os
+import posixpath
+import re
+import urllib.request
+from dataclasses import dataclass
+from functools import lru_cache
+from urllib.parse import urljoin, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+
+# Google Fonts serves woff2 only to browsers it recognises.
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+@dataclass(frozen=True)
+class Asset:
+    url: str
+    path: str
+
+
+VENDOR_ASSETS = {
+    'bootstrap.css': Asset(
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css',
+        'vendor/bootstrap/bootstrap.min.css',
+    ),
+    'bootstrap.js': Asset(
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js',
+        'vendor/bootstrap/bootstrap.bundle.min.js',
+    ),
+    'bootstrap-icons.css': Asset(
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/bootstrap-icons.css',
+        'vendor/bootstrap-icons/bootstrap-icons.css',
+    ),
+    'font-awesome.css': Asset(
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/css/all.min.css',
+        'vendor/font-awesome/css/all.min.css',
+    ),
+    'animate.css': Asset(
+        'https://cdnjs.cloudflare.com/ajax/libs/animate.css/4.1.1/animate.min.css',
+        'vendor/animate/animate.min.css',
+    ),
+    'aos.css': Asset('https://unpkg.com/aos@2.3.1/dist/aos.css', 'vendor/aos/aos.css'),
+    'aos.js': Asset('https://unpkg.com/aos@2.3.1/dist/aos.js', 'vendor/aos/aos.js'),
+    'chart.js': Asset(
+        'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js',
+        'vendor/chart.js/chart.umd.js',
+    ),
+    'jquery.js': Asset('https://code.jquery.com/jquery-3.6.0.min.js', 'vendor/jquery/jquery-3.6.0.min.js'),
+    'popper.js': Asset(
+        'https://cdn.jsdelivr.net/npm/@popperjs/core@2.11.6/dist/umd/popper.min.js',
+        'vendor/popper/popper.min.js',
+    ),
+    'fonts.css': Asset(
+        'https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700'
+        '&family=Playfair+Display:wght@600;700&display=swap',
+        'vendor/fonts/fonts.css',
+    ),
+    'hero.jpg': Asset(
+        'https://images.unsplash.com/photo-1516321318423-f06f85e504b3?auto=format&fit=crop&w=2070&q=80',
+        'vendor/images/hero.jpg',
+    ),
+    'cta.jpg': Asset(
+        'https://images.unsplash.com/photo-1522202176988-66273c2fd55f?auto=format&fit=crop&w=2071&q=80',
+        'vendor/images/cta.jpg',
+    ),
+    'course-default.jpg': Asset(
+        'https://images.unsplash.com/photo-1501504905252-473c47e087f8?auto=format&fit=crop&w=800&q=80',
+        'vendor/images/course-default.jpg',
+    ),
+    'testimonial-1.jpg': Asset('https://randomuser.me/api/portraits/women/32.jpg', 'vendor/images/testimonial-1.jpg'),
+    'testimonial-2.jpg': Asset('https://randomuser.me/api/portraits/men/44.jpg', 'vendor/images/testimonial-2.jpg'),
+    'testimonial-3.jpg': Asset('https://randomuser.me/api/portraits/women/68.jpg', 'vendor/images/testimonial-3.jpg'),
+}
+
+
+@lru_cache(maxsize=None)
+def asset_url(name):
+    """URL of vendor asset ``name``: the self-hosted copy if there is one, else the CDN."""
+    asset = VENDOR_ASSETS[name]
+    if finders.find(asset.path) if settings.DEBUG else staticfiles_storage.exists(asset.path):
+        return static(asset.path)
+    return asset.url
+
+
+def vendor_root():
+    return os.path.join(settings.STATICFILES_DIRS[0], 'vendor')
+
+
+def fetch(url, timeout=30):
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def vendor(asset, root, refresh=False):
+    """Download ``asset`` under ``root`` (the static directory); returns the files written.
+
+    Stylesheets are scanned for ``url()`` references, which are downloaded
+    next to them and rewritten as relative paths.
+    """
+    target = os.path.join(root, asset.path)
+    if os.path.exists(target) and not refresh:
+        return []
+    content = fetch(asset.url)
+    written = []
+    if asset.path.endswith('.css'):
+        css, written = _vendor_references(content.decode('utf-8'), asset, root, refresh)
+        content = css.encode('utf-8')
+    _write(target, content)
+    return [asset.path, *written]
+
+
+def _vendor_references(css, asset, root, refresh):
+    base_dir = posixpath.dirname(asset.path)
+    written = []
+
+    def replace(match):
+        reference = match.group(2).strip()
+        if reference.startswith(('data:', '#')):
+            return match.group(0)
+        parts = urlsplit(reference)
+        if parts.scheme or reference.startswith('//'):
+            # Absolute (e.g. fonts.gstatic.com): keep it under files/ next to the stylesheet.
+            relative = f"files/{posixpath.basename(parts.path)}"
+        else:
+            relative = parts.path
+        local = posixpath.normpath(posixpath.join(base_dir, relative))
+        if not local.startswith('vendor/'):
+            return match.group(0)
+        target = os.path.join(root, local)
+        if refresh or not os.path.exists(target):
+            _write(target, fetch(urljoin(asset.url, reference)))
+            written.append(local)
+        return f"url('{posixpath.relpath(local, base_dir)}')"
+
+    return CSS_URL.sub(replace, css), written
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as handle:
+        handle.write(content)
@@ -0,0 +1,243 @@
+"""Two-tier cache: a small in-process LRU in front of the shared Django cache.
+
+Entries can carry tags (``course:<id>``, ``teacher:<id>``, ``catalog`` ...).
+Each tag has a version stored in the shared cache; invalidating a tag bumps
+its version, which makes every shared entry written under the old version a
+miss. Local entries carrying the tag are dropped immediately in the process
+that invalidates, and expire after ``LOCAL_TTL`` seconds everywhere else, so
+other workers serve stale data for at most that long.
+
+Usage::
+
+    from core.cache import tiered_cache
+
+    courses = tiered_cache.get_or_set(
+        'catalog:published', lambda: list(queryset), tags=['catalog'])
+    tiered_cache.invalidate_tags('catalog')
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import metrics
+
+_MISSING = object()
+
+
+class LocalLRU:
+    """Size- and TTL-bounded in-process cache. Thread-safe."""
+
+    def __init__(self, max_entries=1024, ttl=5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value, tags)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, tags, ttl=None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value, frozenset(tags))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def purge_tags(self, tags):
+        tags = set(tags)
+        with self._lock:
+            for key in [k for k, (_, _, t) in self._data.items() if t & tags]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class _Flight:
+    """A computation of one key, shared by every caller that asks for it meanwhile."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.callers = 0
+        self.error = None
+
+
+class TieredCache:
+    """Local LRU + shared backend behind one get/set/invalidate API."""
+
+    key_prefix = 'tc:'
+
+    def __init__(self, alias='default', local_max_entries=1024, local_ttl=5.0,
+                 default_timeout=300):
+        self.alias = alias
+        self.default_timeout = default_timeout
+        self.local = LocalLRU(local_max_entries, local_ttl)
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._purges = 0
+        self._stats_lock = threading.Lock()
+        self.stats = dict(local_hits=0, shared_hits=0, misses=0, stale=0,
+                          sets=0, invalidations=0, recomputes=0)
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value, timeout=None, tags=()):
+        self._set(key, value, timeout, self._tag_versions(tags, create=True))
+
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(self.key_prefix + key)
+
+    def get_or_set(self, key, compute, timeout=None, tags=()):
+        """Return the cached value, computing it at most once per process on a miss.
+
+        Callers arriving while a computation runs wait for it. If it fails,
+        they get its exception instead of recomputing in turn; the flight is
+        only dropped once its last caller has left, so the next miss retries.
+
+        The tag versions are read before computing, and the value is stored
+        under them: if a tag is invalidated meanwhile, the value (computed
+        from the old data) is stale from the start instead of served as fresh.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+            flight.callers += 1
+        try:
+            with flight.lock:
+                if flight.error is not None:
+                    raise flight.error
+                # Another thread may have filled the entry while we waited.
+                value = self._lookup(key, count=False)
+                if value is _MISSING:
+                    self._count('recomputes')
+                    versions = self._tag_versions(tags, create=True)
+                    purges = self._purges
+                    try:
+                        value = compute()
+                    except Exception as exc:
+                        flight.error = exc
+                        raise
+                    # Local entries are not checked against the versions.
+                    self._set(key, value, timeout, versions, local=purges == self._purges)
+                return value
+        finally:
+            with self._flights_lock:
+                flight.callers -= 1
+                if not flight.callers:
+                    del self._flights[key]
+
+    def invalidate_tags(self, *tags):
+        if not tags:
+            return
+        token = time.time_ns()
+        self.shared.set_many({self._tag_key(tag): token for tag in tags}, None)
+        self._purges += 1
+        self.local.purge_tags(tags)
+        self._count('invalidations', len(tags))
+
+    def clear_local(self):
+        self.local.clear()
+
+    def snapshot(self):
+        with self._stats_lock:
+            data = dict(self.stats)
+        data['local_entries'] = len(self.local)
+        lookups = data['local_hits'] + data['shared_hits'] + data['misses']
+        data['hit_ratio'] = round((lookups - data['misses']) / lookups, 4) if lookups else None
+        return data
+
+    def _set(self, key, value, timeout, versions, local=True):
+        timeout = self.default_timeout if timeout is None else timeout
+        self.shared.set(self.key_prefix + key, {'value': value, 'tags': versions}, timeout)
+        if local:
+            self.local.set(key, value, versions, timeout)
+        self._count('sets')
+
+    def _lookup(self, key, count=True):
+        value = self.local.get(key)
+        if value is not _MISSING:
+            if count:
+                self._count('local_hits')
+            return value
+        entry = self.shared.get(self.key_prefix + key)
+        if entry is not None and entry['tags'] and entry['tags'] != self._tag_versions(entry['tags']):
+            if count:
+                self._count('stale')
+            entry = None
+        if entry is None:
+            if count:
+                self._count('misses')
+            return _MISSING
+        if count:
+            self._count('shared_hits')
+        self.local.set(key, entry['value'], entry['tags'])
+        return entry['value']
+
+    def _tag_key(self, tag):
+        return f'{self.key_prefix}tag:{tag}'
+
+    def _tag_versions(self, tags, create=False):
+        if not tags:
+            return {}
+        keys = {self._tag_key(tag): tag for tag in tags}
+        found = self.shared.get_many(list(keys))
+        versions = {tag: found.get(key) for key, tag in keys.items()}
+        if create:
+            missing = {key: time.time_ns() for key, tag in keys.items() if versions[tag] is None}
+            for key, token in missing.items():
+                # add() keeps a version another process created concurrently.
+                if not self.shared.add(key, token, None):
+                    token = self.shared.get(key)
+                versions[keys[key]] = token
+        return versions
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+
+def _build():
+    options = getattr(settings, 'TIERED_CACHE', {})
+    cache = TieredCache(
+        alias=options.get('ALIAS', 'default'),
+        local_max_entries=options.get('LOCAL_MAX_ENTRIES', 1024),
+        local_ttl=options.get('LOCAL_TTL', 5.0),
+        default_timeout=options.get('DEFAULT_TIMEOUT', 300),
+    )
+    metrics.register('cache', cache.snapshot)
+    return cache
+
+
+tiered_cache = _build()
@@ -0,0 +1,56 @@
+"""Per-request context (client IP and user) reachable from anywhere in the request.
+
+``RequestContextMiddleware`` stores the request's client IP and its lazy
+``user`` in a context variable; ``BaseModel.save()`` and the activity event
+log read them to fill ``ip_address`` / ``author`` without passing the request
+around. The user is only evaluated when read, and by then the view has
+usually loaded it already, so this costs no query.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_request_context = ContextVar('request_context', default=None)
+
+
+def client_ip(request):
+    """Client IP of ``request``.
+
+    ``X-Forwarded-For`` is only trusted when ``settings.USE_X_FORWARDED_FOR``
+    is set, i.e. when the app runs behind a proxy that overwrites it.
+    """
+    if getattr(settings, 'USE_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR') or None
+
+
+def bind(request):
+    """Make ``request`` the current context; returns a token for ``reset``."""
+    return _request_context.set((client_ip(request), request))
+
+
+def reset(token):
+    _request_context.reset(token)
+
+
+def current_ip():
+    context = _request_context.get()
+    return context[0] if context else None
+
+
+def current_user():
+    """Authenticated user of the current request, or None."""
+    context = _request_context.get()
+    if context is None:
+        return None
+    user = getattr(context[1], 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user
+
+
+def current_author():
+    user = current_user()
+    return user.email if user is not None else None
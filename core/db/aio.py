@@ -0,0 +1,10 @@
+"""Helpers for the async ORM."""
+
+
+async def alist(queryset):
+    """Evaluate ``queryset`` with async iteration into a list."""
+    return [item async for item in queryset]
+
+
+async def aset(queryset):
+    return {item async for item in queryset}
@@ -0,0 +1,72 @@
+"""PostgreSQL backend that checks connections out of a process-wide pool.
+
+Django's built-in ``OPTIONS["pool"]`` requires psycopg 3; this backend gives
+psycopg2 deployments the same behaviour. Configure it with a ``POOL`` entry
+next to ``OPTIONS`` in ``DATABASES``::
+
+    'POOL': {'max_size': 20, 'timeout': 5, 'max_idle': 300,
+             'max_lifetime': 3600, 'ping_after': 1}
+
+Keep ``CONN_MAX_AGE`` at 0: Django then hands the connection back to the pool
+at the end of every request instead of pinning it to a worker thread.
+"""
+import threading
+
+from django.db.backends.postgresql import base
+
+from core import metrics
+from core.db.pool import ConnectionPool, PoolTimeout
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def pool(self):
+        pool_options = self.settings_dict.get('POOL')
+        if self.alias == base.NO_DB_ALIAS or not pool_options:
+            return None
+        with _pools_lock:
+            if self.alias not in _pools:
+                _pools[self.alias] = ConnectionPool(
+                    factory=self._connect,
+                    reset=_rollback_if_in_transaction,
+                    **(pool_options if isinstance(pool_options, dict) else {}),
+                )
+                metrics.register(f'db_pool.{self.alias}', _pools[self.alias].snapshot)
+            return _pools[self.alias]
+
+    def close_pool(self):
+        with _pools_lock:
+            pool = _pools.pop(self.alias, None)
+        if pool is not None:
+            metrics.unregister(f'db_pool.{self.alias}')
+            pool.close()
+
+    def _connect(self):
+        """Open a physical connection; called by the pool when it needs to grow."""
+        connection = self.Database.connect(**self.get_connection_params())
+        if self._configure_connection(connection):
+            connection.commit()
+        return connection
+
+    def get_new_connection(self, conn_params):
+        try:
+            return super().get_new_connection(conn_params)
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+
+    def _close(self):
+        pool = self.pool
+        if self.connection is None or pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
+            self.connection = None
+
+
+def _rollback_if_in_transaction(connection):
+    if connection.info.transaction_status != base.Database.extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class PoolStats:
+    """Counters describing the activity of a connection pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.closed = 0
+        self.evicted = 0
+        self.ping_failures = 0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    Connections are created lazily through ``factory`` up to ``max_size``.
+    A checked-in connection that stayed idle longer than ``max_idle`` seconds
+    or that is older than ``max_lifetime`` seconds is closed instead of being
+    reused. Connections idle for more than ``ping_after`` seconds are
+    pre-pinged with ``SELECT 1`` before being handed out.
+    """
+
+    def __init__(self, factory, max_size=10, timeout=5.0, max_idle=300.0,
+                 max_lifetime=3600.0, ping_after=1.0, reset=None):
+        self.factory = factory
+        self.reset = reset
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self.stats = PoolStats()
+        self._idle = deque()  # (connection, created_at, returned_at)
+        self._born = {}  # id(connection) -> created_at
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def open(self):
+        """Connections are opened lazily on checkout; kept for API parity."""
+
+    @property
+    def in_use(self):
+        return self._size - len(self._idle)
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to ``timeout`` seconds."""
+        deadline = None
+        with self._cond:
+            while True:
+                self._evict_idle()
+                if self._idle:
+                    connection, created_at, returned_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection = None
+                    break
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.timeout
+                    self.stats.waits += 1
+                remaining = deadline - now
+                if remaining <= 0:
+                    self.stats.timeouts += 1
+                    raise PoolTimeout(
+                        f"No connection available within {self.timeout}s "
+                        f"(pool size {self.max_size})."
+                    )
+                waited_from = now
+                self._cond.wait(remaining)
+                self.stats.wait_time += time.monotonic() - waited_from
+
+        if connection is not None and not self._is_healthy(connection, returned_at):
+            # Keep the slot reserved and replace the dead connection in place.
+            with self._cond:
+                self._born.pop(id(connection), None)
+                self.stats.closed += 1
+            self._close_quietly(connection)
+            connection = None
+        if connection is None:
+            connection = self._create()
+        with self._cond:
+            self.stats.checkouts += 1
+        return connection
+
+    def putconn(self, connection):
+        """Return a connection to the pool, or close it if it is unusable."""
+        created_at = self._born.get(id(connection))
+        now = time.monotonic()
+        reusable = (
+            created_at is not None
+            and not getattr(connection, 'closed', False)
+            and now - created_at < self.max_lifetime
+        )
+        if reusable and self.reset is not None:
+            try:
+                self.reset(connection)
+            except Exception:
+                logger.warning("Discarding connection that failed to reset.", exc_info=True)
+                reusable = False
+        if not reusable:
+            self._discard(connection)
+            return
+        with self._cond:
+            self.stats.checkins += 1
+            self._idle.append((connection, created_at, now))
+            self._cond.notify()
+
+    def close(self):
+        """Close every idle connection. Checked-out connections are closed on return."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _, _ in idle:
+            self._discard(connection)
+
+    def snapshot(self):
+        with self._cond:
+            data = self.stats.as_dict()
+            data.update(size=self._size, idle=len(self._idle), in_use=self.in_use,
+                        max_size=self.max_size)
+        return data
+
+    def _create(self):
+        try:
+            connection = self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._born[id(connection)] = time.monotonic()
+            self.stats.created += 1
+        return connection
+
+    def _discard(self, connection):
+        with self._cond:
+            if self._born.pop(id(connection), None) is not None:
+                self._size -= 1
+                self.stats.closed += 1
+            self._cond.notify()
+        self._close_quietly(connection)
+
+    def _evict_idle(self):
+        """Drop idle connections past ``max_idle``/``max_lifetime``. Caller holds the lock."""
+        now = time.monotonic()
+        keep = deque()
+        expired = []
+        for entry in self._idle:
+            connection, created_at, returned_at = entry
+            if now - returned_at > self.max_idle or now - created_at > self.max_lifetime:
+                expired.append(connection)
+            else:
+                keep.append(entry)
+        if not expired:
+            return
+        self._idle = keep
+        for connection in expired:
+            self._born.pop(id(connection), None)
+            self._size -= 1
+            self.stats.evicted += 1
+            self._close_quietly(connection)
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, connection, returned_at):
+        if getattr(connection, 'closed', False):
+            return False
+        if time.monotonic() - returned_at < self.ping_after:
+            return True
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+            # Do not leave the ping's implicit transaction open.
+            connection.rollback()
+        except Exception:
+            with self._cond:
+                self.stats.ping_failures += 1
+            return False
+        return True
@@ -0,0 +1,47 @@
+"""Purging expired rows without long write locks.
+
+A single ``DELETE ... WHERE expiry < now`` over a large table holds its
+write lock (the whole database on SQLite) until it finishes. ``PurgeCommand``
+deletes ``--chunk-size`` rows per transaction, in index order, and sleeps
+``--pause`` seconds between chunks so other writers get in.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+def delete_in_chunks(queryset, chunk_size=1000, pause=0.05, sleep=time.sleep):
+    """Delete the rows of the ordered ``queryset`` by chunks; returns how many were deleted."""
+    model = queryset.model
+    total = 0
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+        with transaction.atomic():
+            deleted, _ = model.objects.filter(pk__in=pks).delete()
+        total += deleted
+        if len(pks) < chunk_size:
+            break
+        sleep(pause)
+    return total
+
+
+class PurgeCommand(BaseCommand):
+    """Base of the purge commands: ``expired()`` returns the rows to delete, in index order."""
+    noun = 'rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help="Seconds to sleep between chunks to let other writers in.",
+        )
+
+    def expired(self):
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        total = delete_in_chunks(self.expired(), options['chunk_size'], options['pause'])
+        self.stdout.write(f"Deleted {total} expired {self.noun}.")
@@ -0,0 +1,8 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+class ActivityKind(models.TextChoices):
+    LOGIN = 'login', _('Login')
+    ENROLL = 'enroll', _('Enrollment')
+    MODULE_COMPLETE = 'module_complete', _('Module completed')
+    CERTIFICATE_DOWNLOAD = 'certificate_download', _('Certificate downloaded')
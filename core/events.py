@@ -0,0 +1,154 @@
+"""Write-behind activity event log.
+
+Views call ``activity_log.record(kind, target=...)``; the event is built from
+values already in memory and put on a bounded in-process queue, so the
+request never waits for the INSERT. A daemon thread drains the queue and
+writes ``ActivityEvent`` rows with ``bulk_create`` once ``BATCH_SIZE``
+events are buffered or ``FLUSH_INTERVAL_MS`` milliseconds after the first
+buffered event, whichever comes first.
+
+Delivery is best effort: events still buffered when the process is killed
+are lost (a normal exit flushes them), and events are dropped and counted
+when the queue is full or the insert fails. Counters are exposed on
+``/metrics/`` under ``activity_events``.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from . import context, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLog:
+    """Bounded queue of pending events plus the thread that writes them."""
+
+    def __init__(self, batch_size=500, flush_interval=1.0, max_queue=10000, enabled=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enabled = enabled
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self.stats = {'recorded': 0, 'written': 0, 'dropped': 0, 'failed': 0}
+        self._stats_lock = threading.Lock()
+
+    def record(self, kind, user=None, target=None, **metadata):
+        """Queue an event. ``user`` defaults to the user of the current request."""
+        if not self.enabled:
+            return
+        if user is None:
+            user = context.current_user()
+        event = (
+            kind,
+            user.pk if user is not None else None,
+            user.email if user is not None else None,
+            target._meta.label_lower if target is not None else '',
+            target.pk if target is not None else None,
+            timezone.now(),
+            context.current_ip(),
+            metadata,
+        )
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._count('dropped')
+            return
+        self._count('recorded')
+
+    def flush(self):
+        """Write every buffered event now, in the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(batch), self.batch_size):
+            self._write(batch[start:start + self.batch_size])
+
+    def snapshot(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == pid and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != pid:
+                # Forked worker: the parent's buffer and thread are not ours.
+                self._queue = queue.Queue(maxsize=self.max_queue)
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='activity-log', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        from .models import ActivityEvent
+
+        events = [
+            ActivityEvent(
+                kind=kind, user_id=user_id, author=author, target_type=target_type,
+                target_id=target_id, occurred_at=occurred_at, ip_address=ip, metadata=extra,
+            )
+            for kind, user_id, author, target_type, target_id, occurred_at, ip, extra in batch
+        ]
+        try:
+            ActivityEvent.objects.bulk_create(events)
+        except Exception:
+            logger.exception("Could not write %d activity events", len(events))
+            self._count('failed', len(events))
+        else:
+            self._count('written', len(events))
+        finally:
+            # This thread outlives requests; let it honour CONN_MAX_AGE too.
+            close_old_connections()
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+
+def _build():
+    options = getattr(settings, 'ACTIVITY_EVENTS', {})
+    log = ActivityLog(
+        batch_size=options.get('BATCH_SIZE', 500),
+        flush_interval=options.get('FLUSH_INTERVAL_MS', 1000) / 1000,
+        max_queue=options.get('MAX_QUEUE', 10000),
+        enabled=options.get('ENABLED', True),
+    )
+    metrics.register('activity_events', log.snapshot)
+    atexit.register(log.flush)
+    return log
+
+
+activity_log = _build()
@@ -0,0 +1,137 @@
+"""HTTP helpers: fast JSON responses and conditional GET validators.
+
+``json_response`` serializes with orjson when it is installed (it handles
+UUIDs and datetimes natively and is several times faster than the stdlib)
+and falls back to ``json`` with ``DjangoJSONEncoder``.
+
+``conditional_response`` answers ``If-None-Match`` / ``If-Modified-Since``
+from a version computed before any rendering, so an unchanged resource
+costs one small query and no serialization. ``aconditional_page`` does the
+same for per-user HTML pages rendered by async views.
+
+``encode_cursor`` / ``decode_cursor`` make the opaque keyset pagination
+cursors (a timestamp and a primary key) used by the API and the inbox.
+"""
+import base64
+import hashlib
+import json
+import uuid
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.contrib.messages import get_messages
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(data):
+    """Serialize ``data`` to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def json_response(data, status=200):
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def make_etag(*parts):
+    """Strong ETag from the values identifying a representation."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_response(request, etag=None, last_modified=None):
+    """Return a 304 (or 412) response if the client's copy is current, else None.
+
+    ``last_modified`` is a datetime or None.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def encode_cursor(position, pk):
+    """Opaque cursor for the row at ``(position, pk)``; ``position`` is a datetime."""
+    raw = json.dumps([position.isoformat(), str(pk)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """``(datetime, UUID)`` from ``encode_cursor``, None for an empty value.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+        position, pk = json.loads(raw)
+        position = parse_datetime(position)
+        if position is None:
+            raise ValueError
+        return position, uuid.UUID(pk)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+async def auser(request):
+    """The request's user, loaded with the async ORM.
+
+    It is also installed as ``request.user`` so that sync code later in the
+    request (templates, ``BaseModel.save``) reuses it instead of loading it again.
+    """
+    user = await request.auser()
+    request.user = user
+    return user
+
+
+async def aconditional_page(request, version, render):
+    """Answer a per-user HTML page from its ``version`` (a dict of timestamps and
+    counts), awaiting ``render()`` only if the client's copy is stale.
+
+    The ETag also covers the user, the path and the CSRF secret (rotated at
+    login, and embedded in the page's forms). Pages with pending flash
+    messages, or without a version, are always rendered. ``request.user``
+    must already be loaded (see ``auser``).
+    """
+    if version is None or len(get_messages(request)):
+        return await render()
+    stamps = [value for value in version.values() if hasattr(value, 'timestamp')]
+    last_modified = max(stamps, default=None)
+    get_token(request)  # make sure the secret exists before it is hashed in
+    etag = make_etag(
+        request.user.pk, request.path, request.META.get('CSRF_COOKIE'), sorted(version.items()),
+    )
+    response = conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = await render()
+        if response.status_code == 200:
+            set_validators(response, etag, last_modified)
+    # Always revalidate, never store in a shared cache.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,155 @@
+import json
+import logging
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, F, Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+from django.urls import reverse
+
+from core import rendering
+from course.models import CourseEnrollment
+from users.models import Teacher, User
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the hot views through the test client and report p50/p95 latency "
+        "and query counts. Run `seed_data` first. Use --save to record a baseline "
+        "and --compare to diff against one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--only', nargs='*', help="Run only the named scenarios.")
+        parser.add_argument('--save', metavar='PATH', help="Write results to a baseline JSON file.")
+        parser.add_argument('--compare', metavar='PATH', help="Compare against a baseline JSON file.")
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help="Allowed relative p95 slowdown before flagging a regression (default 0.2).",
+        )
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        profiled = rendering.installed()
+        setup_test_environment()
+        if profiled:
+            # setup_test_environment() swapped Template._render, dropping the
+            # profiler; measure the same code path as the server.
+            rendering.install()
+        logging.getLogger('django.db.backends').setLevel(logging.WARNING)
+        scenarios = self.build_scenarios()
+        if options['only']:
+            scenarios = [s for s in scenarios if s[0] in options['only']]
+
+        results = {}
+        # Measure the views, not the profilers (and their log lines).
+        with override_settings(SQL_INSTRUMENTATION={'SAMPLE_RATE': 0.0}, TEMPLATE_PROFILING={'SAMPLE_RATE': 0.0}):
+            for name, client, url in scenarios:
+                results[name] = self.measure(client, url, options['warmup'], options['iterations'])
+
+        baseline = None
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())['scenarios']
+        regressions = self.report(results, baseline, options['tolerance'])
+
+        if options['save']:
+            Path(options['save']).write_text(json.dumps(
+                {'iterations': options['iterations'], 'scenarios': results}, indent=2) + '\n')
+            self.stdout.write(f"Baseline written to {options['save']}")
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f"Regressions: {', '.join(regressions)}")
+
+    def build_scenarios(self):
+        enrollment = (CourseEnrollment.objects.select_related('user', 'course')
+                      .filter(course__modules__isnull=False).order_by('created_at').first())
+        teacher = Teacher.objects.select_related('user').filter(courses__isnull=False).first()
+        admin = User.objects.filter(is_superuser=True).first()
+        if not (enrollment and teacher and admin):
+            raise CommandError("No data to benchmark; run `manage.py seed_data` first.")
+        completed = (
+            CourseEnrollment.objects
+            .annotate(
+                total=Count('course__modules', distinct=True),
+                done=Count('user__module_completions', distinct=True,
+                           filter=Q(user__module_completions__module__course=F('course'))),
+            )
+            .filter(total__gt=0, done=F('total'))
+            .select_related('user').first()
+        )
+
+        learner = self.client_for(enrollment.user)
+        course = enrollment.course
+        module = course.modules.first()
+        scenarios = [
+            ('catalog', learner, reverse('courses:course_list')),
+            ('student_dashboard', learner, reverse('users:student_dashboard')),
+            ('course_detail', learner, reverse('courses:course_detail', args=[course.pk])),
+            ('module_detail', learner, reverse('courses:module_detail', args=[module.pk])),
+        ]
+        if completed:
+            scenarios.append(('certificate', self.client_for(completed.user),
+                              reverse('courses:download_certificate', args=[completed.course_id])))
+        else:
+            self.stderr.write("No completed enrollment found; skipping the certificate scenario.")
+        scenarios.append(('teacher_courses', self.client_for(teacher.user), reverse('courses:teacher_courses')))
+        staff = self.client_for(admin)
+        for model in ('course_course', 'course_module', 'course_courseenrollment', 'users_user'):
+            scenarios.append((f'admin_{model}', staff, reverse(f'admin:{model}_changelist')))
+        return scenarios
+
+    def client_for(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def measure(self, client, url, warmup, iterations):
+        for _ in range(warmup):
+            client.get(url)
+        timings, queries = [], []
+        status = None
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured.captured_queries))
+            status = response.status_code
+        return {
+            'url': url,
+            'status': status,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'queries': percentile(queries, 50),
+        }
+
+    def report(self, results, baseline, tolerance):
+        regressions = []
+        header = f"{'scenario':<32}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}"
+        if baseline:
+            header += f"{'Δp95':>10}{'Δqueries':>10}"
+        self.stdout.write(header)
+        for name, result in results.items():
+            line = (f"{name:<32}{result['status']:>7}{result['p50_ms']:>10.1f}"
+                    f"{result['p95_ms']:>10.1f}{result['queries']:>9}")
+            previous = (baseline or {}).get(name)
+            if previous:
+                delta = (result['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] if previous['p95_ms'] else 0
+                extra = result['queries'] - previous['queries']
+                line += f"{delta:>+10.0%}{extra:>+10d}"
+                if delta > tolerance or extra > 0:
+                    regressions.append(name)
+                    line = self.style.ERROR(line + "  REGRESSION")
+            self.stdout.write(line)
+        return regressions
@@ -0,0 +1,79 @@
+import logging
+import os
+from urllib.error import URLError
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from core import storage
+from core.assets import VENDOR_ASSETS, vendor
+
+
+class Command(BaseCommand):
+    help = (
+        "Download the third-party assets in core.assets.VENDOR_ASSETS into static/vendor/, "
+        "then collect static files (minified, content-hashed, with .gz/.br siblings)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='*', choices=sorted(VENDOR_ASSETS), help="Vendor only these assets.")
+        parser.add_argument('--refresh', action='store_true', help="Download again even if already vendored.")
+        parser.add_argument('--skip-vendor', action='store_true', help="Only run collectstatic.")
+        parser.add_argument('--skip-collect', action='store_true', help="Only download the vendor assets.")
+
+    def handle(self, *args, **options):
+        if not options['skip_vendor']:
+            self.vendor(options['only'] or sorted(VENDOR_ASSETS), options['refresh'])
+        if not options['skip_collect']:
+            if not settings.STATIC_ROOT:
+                raise CommandError("STATIC_ROOT is not set.")
+            if not settings.STATIC_ASSET_PIPELINE:
+                raise CommandError("Set STATIC_ASSET_PIPELINE=True to build the hashed, minified assets.")
+            self.warn_missing()
+            logging.getLogger('PIL').setLevel(logging.WARNING)
+            call_command('collectstatic', interactive=False, verbosity=0)
+            self.report(settings.STATIC_ROOT)
+
+    def warn_missing(self):
+        """Name each optional optimiser that is not installed, and what the build does without it."""
+        fallbacks = [
+            (storage.brotli, 'brotli', "writing .gz files only"),
+            (storage.rcssmin, 'rcssmin', "minifying CSS with the stdlib fallback"),
+            (storage.rjsmin, 'rjsmin', "minifying JS with the stdlib fallback"),
+            (storage.Image, 'Pillow', "copying images without optimising them"),
+        ]
+        for module, name, fallback in fallbacks:
+            if module is None:
+                self.stderr.write(self.style.WARNING(f"{name} is not installed; {fallback}."))
+
+    def vendor(self, names, refresh):
+        root = settings.STATICFILES_DIRS[0]
+        failed = []
+        for name in names:
+            try:
+                written = vendor(VENDOR_ASSETS[name], root, refresh=refresh)
+            except (URLError, OSError) as exc:
+                failed.append(name)
+                self.stderr.write(self.style.WARNING(f"{name}: {exc}"))
+                continue
+            state = f"{len(written)} file(s) downloaded" if written else "already vendored"
+            self.stdout.write(f"{name:<22}{state}")
+        if failed:
+            # Templates keep using the CDN for these until a later run succeeds.
+            self.stderr.write(self.style.WARNING(f"Not vendored (served from the CDN): {', '.join(failed)}"))
+
+    def report(self, root):
+        manifest = storage.AssetStorage(location=root)
+        hashed = set(manifest.hashed_files.values())
+        sizes = {'files': 0, 'gz': 0, 'br': 0}
+        for name in hashed:
+            path = os.path.join(root, name)
+            sizes['files'] += os.path.getsize(path)
+            for suffix in ('gz', 'br'):
+                if os.path.exists(f'{path}.{suffix}'):
+                    sizes[suffix] += os.path.getsize(f'{path}.{suffix}')
+        self.stdout.write(self.style.SUCCESS(
+            f"Collected {len(hashed)} hashed files into {root}: {sizes['files'] / 1024:.0f} KiB, "
+            f"{sizes['gz'] / 1024:.0f} KiB gzipped, {sizes['br'] / 1024:.0f} KiB brotli."
+        ))
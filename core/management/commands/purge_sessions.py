@@ -0,0 +1,12 @@
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+from core.db.purge import PurgeCommand
+
+
+class Command(PurgeCommand):
+    help = "Delete expired rows from django_session in small batches (see core.db.purge)."
+    noun = 'sessions'
+
+    def expired(self):
+        return Session.objects.filter(expire_date__lt=timezone.now()).order_by('expire_date')
@@ -0,0 +1,119 @@
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from course import ordering
+from course.content import render_content
+from course.enrollment import recount_seats
+from course.enums import ClassLevel, CourseCategory, CourseStatus
+from course.models import Course, CourseEnrollment, CourseReview, Module, ModuleCompletion
+from users.models import Teacher, User
+
+PASSWORD = 'afterschool'
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset (learners, teachers, courses, modules, "
+        f"enrollments, completions, reviews) with bulk_create. Every user's password is '{PASSWORD}'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--teachers', type=int, default=50)
+        parser.add_argument('--courses-per-level', type=int, default=10)
+        parser.add_argument('--modules', type=int, default=12, help="Modules per course.")
+        parser.add_argument('--enrollments', type=int, default=5, help="Enrollments per learner.")
+        parser.add_argument(
+            '--completion-rate', type=float, default=0.5,
+            help="Average fraction of an enrolled course's modules a learner completed.",
+        )
+        parser.add_argument('--reviews', type=float, default=0.2, help="Fraction of enrollments with a review.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        run = f"{int(time.time()):x}"
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            password = make_password(PASSWORD)
+            users = User.objects.bulk_create(
+                [
+                    User(email=f"learner{i}-{run}@example.com", first_name=f"Learner{i}",
+                         last_name="Seed", password=password, is_active=True)
+                    for i in range(options['users'])
+                ] + [
+                    User(email=f"teacher{i}-{run}@example.com", first_name=f"Teacher{i}",
+                         last_name="Seed", password=password, is_active=True)
+                    for i in range(options['teachers'])
+                ],
+                batch_size=batch_size,
+            )
+            if not User.objects.filter(is_superuser=True).exists():
+                User.objects.create_superuser(f"admin-{run}@example.com", "Seed", PASSWORD)
+            learners, teacher_users = users[:options['users']], users[options['users']:]
+
+            teachers = Teacher.objects.bulk_create(
+                [Teacher(user=user, is_approved=True) for user in teacher_users],
+                batch_size=batch_size,
+            )
+
+            courses = Course.objects.bulk_create(
+                [
+                    render_content(Course(
+                        title=f"{level.label} course {n}",
+                        description="Synthetic course generated by seed_data.",
+                        content="<p>Course syllabus.</p>",
+                        class_level=level,
+                        category=rng.choice(CourseCategory.values),
+                        status=CourseStatus.PUBLISHED,
+                        teacher=rng.choice(teachers),
+                    ))
+                    for level in ClassLevel
+                    for n in range(options['courses_per_level'])
+                ],
+                batch_size=batch_size,
+            )
+
+            modules = Module.objects.bulk_create(
+                [
+                    render_content(Module(course=course, title=f"Module {number}", order=number * ordering.STEP,
+                                          description="Synthetic module.", content="<p>Module content.</p>"))
+                    for course in courses
+                    for number in range(1, options['modules'] + 1)
+                ],
+                batch_size=batch_size,
+            )
+            modules_by_course = {}
+            for module in modules:
+                modules_by_course.setdefault(module.course_id, []).append(module)
+
+            enrollments, completions, reviews = [], [], []
+            per_learner = min(options['enrollments'], len(courses))
+            for learner in learners:
+                for course in rng.sample(courses, per_learner):
+                    enrollments.append(CourseEnrollment(course=course, user=learner))
+                    course_modules = modules_by_course.get(course.pk, [])
+                    done = round(len(course_modules) * min(1.0, rng.random() * 2 * options['completion_rate']))
+                    completions.extend(
+                        ModuleCompletion(user=learner, module=module) for module in course_modules[:done]
+                    )
+                    if rng.random() < options['reviews']:
+                        reviews.append(CourseReview(course=course, user=learner,
+                                                    rating=rng.randint(1, 5), comment="Synthetic review."))
+            CourseEnrollment.objects.bulk_create(enrollments, batch_size=batch_size)
+            recount_seats([course.pk for course in courses])
+            ModuleCompletion.objects.bulk_create(completions, batch_size=batch_size)
+            CourseReview.objects.bulk_create(reviews, batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(learners)} learners, {len(teachers)} teachers, {len(courses)} courses, "
+            f"{len(modules)} modules, {len(enrollments)} enrollments, {len(completions)} completions "
+            f"and {len(reviews)} reviews in {time.perf_counter() - start:.1f}s."
+        ))
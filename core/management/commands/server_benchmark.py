@@ -0,0 +1,234 @@
+import asyncio
+import io
+import logging
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from course.models import CourseEnrollment
+from .benchmark import percentile
+
+SCENARIOS = ('catalog', 'course_detail', 'module_detail', 'student_dashboard')
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare WSGI and ASGI throughput of the async read views at high concurrency. "
+        "Requests go straight to Django's WSGIHandler (one thread per concurrent client, "
+        "like a threaded WSGI server) and ASGIHandler (one event loop, like uvicorn), so "
+        "the numbers exclude the HTTP server itself. Run `seed_data` first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 64, 256])
+        parser.add_argument('--requests', type=int, default=1000, help="Requests per run.")
+        parser.add_argument('--only', nargs='*', choices=SCENARIOS, help="Request only these views.")
+        parser.add_argument('--mode', nargs='*', choices=('wsgi', 'asgi'), default=['wsgi', 'asgi'])
+        parser.add_argument(
+            '--db-latency', type=float, default=0.0, metavar='MS',
+            help="Sleep this long in every query, to model a database across the network.",
+        )
+
+    def handle(self, *args, **options):
+        logging.getLogger('django.db.backends').setLevel(logging.WARNING)
+        logging.getLogger('asyncio').setLevel(logging.WARNING)
+        urls, cookie = self.build_requests(options['only'] or SCENARIOS)
+        latency = options['db_latency'] / 1000
+
+        def slow_down(sender, connection, **kwargs):
+            connection.execute_wrappers.append(
+                lambda execute, *query: (time.sleep(latency), execute(*query))[1]
+            )
+
+        if latency:
+            connection_created.connect(slow_down, dispatch_uid='server_benchmark')
+        no_sampling = {'SAMPLE_RATE': 0.0}
+        try:
+            with override_settings(
+                SQL_INSTRUMENTATION={**settings.SQL_INSTRUMENTATION, **no_sampling},
+                TEMPLATE_PROFILING={**settings.TEMPLATE_PROFILING, **no_sampling},
+                ALLOWED_HOSTS=['*'],
+            ):
+                # Connections opened before the signal was connected skip the latency.
+                connections.close_all()
+                results = []
+                for concurrency in options['concurrency']:
+                    for mode in options['mode']:
+                        run = self.run_wsgi if mode == 'wsgi' else self.run_asgi
+                        results.append((mode, concurrency, run(urls, cookie, concurrency, options['requests'])))
+        finally:
+            connection_created.disconnect(dispatch_uid='server_benchmark')
+        self.report(results)
+
+    def build_requests(self, scenarios):
+        enrollment = (CourseEnrollment.objects.select_related('user', 'course')
+                      .filter(course__modules__isnull=False).order_by('created_at').first())
+        if enrollment is None:
+            raise CommandError("No data to benchmark; run `manage.py seed_data` first.")
+        client = Client()
+        client.force_login(enrollment.user)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        course = enrollment.course
+        paths = {
+            'catalog': reverse('courses:course_list'),
+            'course_detail': reverse('courses:course_detail', args=[course.pk]),
+            'module_detail': reverse('courses:module_detail', args=[course.modules.first().pk]),
+            'student_dashboard': reverse('users:student_dashboard'),
+        }
+        connection.close()
+        return [paths[name] for name in scenarios], cookie
+
+    def run_wsgi(self, urls, cookie, concurrency, total):
+        handler = get_wsgi_application()
+        latencies, errors = [], []
+        counter = iter(range(total))
+        lock = threading.Lock()
+        start_gate = threading.Barrier(concurrency)
+
+        def client():
+            start_gate.wait()
+            try:
+                while True:
+                    with lock:
+                        n = next(counter, None)
+                    if n is None:
+                        return
+                    status = []
+                    begin = time.perf_counter()
+                    body = handler(self.environ(urls[n % len(urls)], cookie),
+                                   lambda code, headers, exc_info=None: status.append(code))
+                    b''.join(body)
+                    body.close()
+                    elapsed = time.perf_counter() - begin
+                    with lock:
+                        latencies.append(elapsed)
+                        if not status[0].startswith('200'):
+                            errors.append(status[0])
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        with ThreadSampler() as sampler:
+            begin = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - begin
+        return self.summary(latencies, errors, wall, sampler.peak)
+
+    def environ(self, path, cookie):
+        return {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1', 'HTTP_HOST': 'localhost', 'HTTP_COOKIE': cookie,
+            'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr, 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+    def run_asgi(self, urls, cookie, concurrency, total):
+        handler = get_asgi_application()
+        latencies, errors = [], []
+        counter = iter(range(total))
+
+        async def request(path):
+            done = asyncio.Event()
+            status = []
+
+            async def receive():
+                if not status:
+                    status.append(None)
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await done.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status[0] = message['status']
+                elif not message.get('more_body'):
+                    done.set()
+
+            await handler(self.scope(path, cookie), receive, send)
+            return status[0]
+
+        async def client():
+            for n in counter:
+                begin = time.perf_counter()
+                code = await request(urls[n % len(urls)])
+                latencies.append(time.perf_counter() - begin)
+                if code != 200:
+                    errors.append(code)
+
+        async def main():
+            await asyncio.gather(*(client() for _ in range(concurrency)))
+
+        with ThreadSampler() as sampler:
+            begin = time.perf_counter()
+            asyncio.run(main())
+            wall = time.perf_counter() - begin
+        return self.summary(latencies, errors, wall, sampler.peak)
+
+    def scope(self, path, cookie):
+        return {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+            'root_path': '', 'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+            'headers': [(b'host', b'localhost'), (b'cookie', cookie.encode())],
+        }
+
+    def summary(self, latencies, errors, wall, peak_threads):
+        latencies = latencies or [0.0]
+        return {
+            'requests': len(latencies),
+            'rps': len(latencies) / wall if wall else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'errors': len(errors),
+            'threads': peak_threads,
+        }
+
+    def report(self, results):
+        self.stdout.write(
+            f"{'mode':<6}{'clients':>8}{'requests':>10}{'req/s':>9}{'p50 ms':>9}"
+            f"{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'threads':>9}"
+        )
+        for mode, concurrency, row in results:
+            line = (
+                f"{mode:<6}{concurrency:>8}{row['requests']:>10}{row['rps']:>9.0f}{row['p50_ms']:>9.1f}"
+                f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['errors']:>8}{row['threads']:>9}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['errors'] else line)
+
+
+class ThreadSampler:
+    """Record the peak number of live threads while the block runs."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
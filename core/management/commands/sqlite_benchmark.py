@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.db.sqlite import BUSY_TIMEOUT_MS, PRODUCTION_PRAGMAS
+
+SCHEMA = """
+CREATE TABLE enrollment (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    course_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (user_id, course_id)
+);
+CREATE TABLE completion (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    module_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (user_id, module_id)
+);
+"""
+
+# Django's defaults: rollback journal, sqlite3's 5 s timeout, deferred transactions.
+PROFILES = {
+    'default': {'pragmas': {}, 'begin': 'BEGIN', 'timeout': 5.0},
+    'production': {'pragmas': PRODUCTION_PRAGMAS, 'begin': 'BEGIN IMMEDIATE',
+                   'timeout': BUSY_TIMEOUT_MS / 1000},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure lock errors and write throughput of concurrent enroll/complete "
+        "transactions on a scratch SQLite file, with Django's default settings "
+        "and with the production profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--writes', type=int, default=200, help="Transactions per thread.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['threads']} threads x {options['writes']} transactions")
+        self.stdout.write(f"{'profile':<12}{'ok':>8}{'locked':>8}{'lock %':>9}{'tx/s':>10}")
+        for name, profile in PROFILES.items():
+            ok, locked, elapsed = self.run_profile(profile, options['threads'], options['writes'])
+            total = ok + locked
+            self.stdout.write(
+                f"{name:<12}{ok:>8}{locked:>8}{100 * locked / total:>8.1f}%{ok / elapsed:>10.0f}"
+            )
+
+    def run_profile(self, profile, threads, writes):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.sqlite3')
+            setup = self.connect(path, profile)
+            setup.executescript(SCHEMA)
+            setup.close()
+
+            results = [(0, 0)] * threads
+            barrier = threading.Barrier(threads)
+
+            def worker(index):
+                connection = self.connect(path, profile)
+                barrier.wait()
+                ok = locked = 0
+                for i in range(writes):
+                    try:
+                        self.get_or_create(connection, profile, index, i)
+                        ok += 1
+                    except sqlite3.OperationalError as exc:
+                        if 'locked' not in str(exc) and 'busy' not in str(exc):
+                            raise
+                        locked += 1
+                connection.close()
+                results[index] = (ok, locked)
+
+            workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        return sum(r[0] for r in results), sum(r[1] for r in results), elapsed
+
+    def connect(self, path, profile):
+        connection = sqlite3.connect(path, timeout=profile['timeout'],
+                                     isolation_level=None, check_same_thread=False)
+        for name, value in profile['pragmas'].items():
+            connection.execute(f"PRAGMA {name}={value}")
+        return connection
+
+    def get_or_create(self, connection, profile, user_id, i):
+        """Mirror ``get_or_create``: SELECT, then INSERT in the same transaction."""
+        table, column = ('enrollment', 'course_id') if i % 2 else ('completion', 'module_id')
+        connection.execute(profile['begin'])
+        try:
+            row = connection.execute(
+                f"SELECT id FROM {table} WHERE user_id = ? AND {column} = ?", (user_id, i)
+            ).fetchone()
+            if row is None:
+                connection.execute(
+                    f"INSERT INTO {table} (user_id, {column}, created_at) VALUES (?, ?, datetime('now'))",
+                    (user_id, i),
+                )
+            connection.execute("COMMIT")
+        except Exception:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
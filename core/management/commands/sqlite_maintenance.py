@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = "Checkpoint the SQLite WAL and refresh query planner statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument(
+            '--mode', default='TRUNCATE', choices=['PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'],
+            help="wal_checkpoint mode (default: TRUNCATE).",
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="Repeat every N seconds instead of running once.",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Database '{options['database']}' is not SQLite.")
+        while True:
+            self.run_once(connection, options['mode'])
+            if not options['interval']:
+                return
+            connection.close()
+            time.sleep(options['interval'])
+
+    def run_once(self, connection, mode):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA wal_checkpoint({mode})")
+            busy, log_frames, checkpointed = cursor.fetchone()
+            cursor.execute("PRAGMA optimize")
+        self.stdout.write(
+            f"wal_checkpoint({mode}): busy={busy} log={log_frames} checkpointed={checkpointed}; optimize done"
+        )
@@ -0,0 +1,22 @@
+import threading
+
+_providers = {}
+_lock = threading.Lock()
+
+
+def register(name, provider):
+    """Register a callable returning a JSON-serialisable dict under ``name``."""
+    with _lock:
+        _providers[name] = provider
+
+
+def unregister(name):
+    with _lock:
+        _providers.pop(name, None)
+
+
+def snapshot():
+    """Collect the current value of every registered metrics provider."""
+    with _lock:
+        providers = dict(_providers)
+    return {name: provider() for name, provider in sorted(providers.items())}
@@ -0,0 +1,271 @@
+import json
+import logging
+import random
+import re
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from . import context, rendering
+
+logger = logging.getLogger('afterschool.sql')
+template_logger = logging.getLogger('afterschool.templates')
+
+_DEFAULTS = {
+    'SAMPLE_RATE': 0.0,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'MAX_FINGERPRINTS': 200,
+    'STACK_DEPTH': 4,
+}
+
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def fingerprint(sql):
+    """Collapse literals and IN lists so queries of the same shape compare equal."""
+    sql = _IN_LIST.sub('(%s, ...)', sql)
+    sql = _STRING.sub('?', sql)
+    return _NUMBER.sub('?', sql)
+
+
+def _caller(depth):
+    """Return (template location, project stack) for the query being executed."""
+    base_dir = str(settings.BASE_DIR)
+    template = None
+    stack = []
+    frame = sys._getframe(2)
+    while frame is not None and (template is None or len(stack) < depth):
+        code = frame.f_code
+        if template is None and code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None:
+                template = f"{origin.template_name}:{getattr(token, 'lineno', '?')}"
+        elif (len(stack) < depth and code.co_filename.startswith(base_dir)
+              and 'site-packages' not in code.co_filename
+              and code.co_filename != __file__):
+            path = Path(code.co_filename).relative_to(base_dir)
+            stack.append(f"{path}:{frame.f_lineno} in {code.co_name}")
+        frame = frame.f_back
+    return template, stack
+
+
+class QueryRecorder:
+    """``execute_wrapper`` hook collecting per-request query statistics."""
+
+    def __init__(self, threshold, max_fingerprints, stack_depth):
+        self.threshold = threshold
+        self.max_fingerprints = max_fingerprints
+        self.stack_depth = stack_depth
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = {}  # fingerprint -> [count, duration, template, stack]
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            self.record(sql, elapsed)
+
+    def record(self, sql, elapsed):
+        key = fingerprint(sql)
+        shape = self.shapes.get(key)
+        if shape is None:
+            if len(self.shapes) < self.max_fingerprints:
+                self.shapes[key] = [1, elapsed, None, None]
+            return
+        shape[0] += 1
+        shape[1] += elapsed
+        if shape[0] == 2:
+            # Only repeated shapes pay for the stack walk.
+            shape[2], shape[3] = _caller(self.stack_depth)
+
+    def n_plus_one(self):
+        return [
+            {
+                'fingerprint': key,
+                'count': count,
+                'duration_ms': round(duration * 1000, 2),
+                'template': template,
+                'stack': stack,
+            }
+            for key, (count, duration, template, stack) in sorted(
+                self.shapes.items(), key=lambda item: -item[1][0])
+            if count >= self.threshold
+        ]
+
+    def duplicates(self):
+        return sum(count - 1 for count, _, _, _ in self.shapes.values())
+
+
+class HybridMiddleware:
+    """Base for middleware that runs natively under both WSGI and ASGI, so an
+    async view is not pushed onto a thread by a sync-only middleware.
+
+    Subclasses implement ``around(request)``: a context manager wrapping the
+    rest of the chain, yielding an object whose ``response`` attribute is set
+    before it exits.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self._acall(request)
+        with self.around(request) as outcome:
+            outcome.response = self.get_response(request)
+        return outcome.response
+
+    async def _acall(self, request):
+        with self.around(request) as outcome:
+            outcome.response = await self.get_response(request)
+        return outcome.response
+
+    def around(self, request):
+        raise NotImplementedError
+
+
+class QueryInstrumentationMiddleware(HybridMiddleware):
+    """Record query count, DB time and repeated query shapes for sampled requests.
+
+    Configure with ``settings.SQL_INSTRUMENTATION`` (``SAMPLE_RATE``,
+    ``N_PLUS_ONE_THRESHOLD``, ``MAX_FINGERPRINTS``, ``STACK_DEPTH``). Sampled
+    responses get a ``Server-Timing`` header and one JSON log line on the
+    ``afterschool.sql`` logger; parameters are never logged. Unsampled
+    requests run without any wrapper installed.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.options = {**_DEFAULTS, **getattr(settings, 'SQL_INSTRUMENTATION', {})}
+
+    @contextmanager
+    def around(self, request):
+        outcome = SimpleNamespace(response=None)
+        if random.random() >= self.options['SAMPLE_RATE']:
+            yield outcome
+            return
+        recorder = QueryRecorder(
+            self.options['N_PLUS_ONE_THRESHOLD'],
+            self.options['MAX_FINGERPRINTS'],
+            self.options['STACK_DEPTH'],
+        )
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            yield outcome
+        total = time.perf_counter() - start
+        self.report(request, outcome.response, recorder, total)
+
+    def report(self, request, response, recorder, total):
+        db_ms = recorder.duration * 1000
+        timing = (
+            f'db;dur={db_ms:.1f};desc="{recorder.count} queries", '
+            f'app;dur={(total - recorder.duration) * 1000:.1f}'
+        )
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+        suspects = recorder.n_plus_one()
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'duplicates': recorder.duplicates(),
+            'db_ms': round(db_ms, 2),
+            'total_ms': round(total * 1000, 2),
+            'n_plus_one': suspects,
+        }
+        level = logging.WARNING if suspects else logging.INFO
+        logger.log(level, json.dumps(record), extra={'sql_profile': record})
+
+
+class TemplateProfilingMiddleware(HybridMiddleware):
+    """Profile template rendering (see ``core.rendering``) for sampled requests.
+
+    Configure with ``settings.TEMPLATE_PROFILING`` (``SAMPLE_RATE``, ``TOP``).
+    Sampled responses get ``Server-Timing`` entries for the total render time
+    and the ``TOP`` templates by self time, and one JSON log line on the
+    ``afterschool.templates`` logger with per-template times and query counts
+    and per-block times.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.options = {'SAMPLE_RATE': 0.0, 'TOP': 5, **getattr(settings, 'TEMPLATE_PROFILING', {})}
+
+    @contextmanager
+    def around(self, request):
+        outcome = SimpleNamespace(response=None)
+        if random.random() >= self.options['SAMPLE_RATE']:
+            yield outcome
+            return
+        with ExitStack() as stack:
+            profile = stack.enter_context(rendering.RenderProfile())
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(profile.execute_wrapper))
+            yield outcome
+        if profile.templates:
+            self.report(request, outcome.response, profile)
+
+    def report(self, request, response, profile):
+        templates, blocks = profile.summary()
+        entries = [f'tpl;dur={profile.total * 1000:.1f};desc="{len(templates)} templates"']
+        entries += [
+            f'tpl{n};dur={row["self_ms"]:.1f};desc="{row["template"]} ({row["queries"]} queries)"'
+            for n, row in enumerate(templates[:self.options['TOP']], 1)
+        ]
+        timing = ', '.join(entries)
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'render_ms': round(profile.total * 1000, 2),
+            'view_queries': profile.view_queries,
+            'templates': templates,
+            'blocks': blocks,
+        }
+        template_logger.info(json.dumps(record), extra={'template_profile': record})
+
+
+class RequestContextMiddleware(HybridMiddleware):
+    """Expose the client IP and user of the request through ``core.context``."""
+
+    @contextmanager
+    def around(self, request):
+        token = context.bind(request)
+        try:
+            yield SimpleNamespace(response=None)
+        finally:
+            context.reset(token)
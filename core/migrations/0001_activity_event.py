@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:09
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('kind', models.CharField(choices=[('login', 'Login'), ('enroll', 'Enrollment'), ('module_complete', 'Module completed'), ('certificate_download', 'Certificate downloaded')], help_text='What happened.', max_length=30, verbose_name='Kind')),
+                ('target_type', models.CharField(blank=True, help_text='Model label of the object acted upon, e.g. course.course.', max_length=50, verbose_name='Target type')),
+                ('target_id', models.UUIDField(blank=True, help_text='Primary key of the object acted upon.', null=True, verbose_name='Target ID')),
+                ('occurred_at', models.DateTimeField(help_text='When the event happened; created_at is when it was written.', verbose_name='Occurred at')),
+                ('user', models.ForeignKey(blank=True, help_text='User who performed the action.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_events', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Activity Event',
+                'verbose_name_plural': 'Activity Events',
+                'ordering': ['-occurred_at'],
+                'indexes': [models.Index(fields=['kind', 'occurred_at'], name='core_activi_kind_0008f9_idx'), models.Index(fields=['user', 'occurred_at'], name='core_activi_user_id_2acb40_idx')],
+            },
+        ),
+    ]
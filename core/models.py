@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from users.models import BaseModel
+from .enums import ActivityKind
+
+
+class ActivityEvent(BaseModel):
+    """Append-only learning activity event, written in batches by ``core.events``."""
+    kind = models.CharField(
+        max_length=30,
+        choices=ActivityKind.choices,
+        verbose_name=_("Kind"),
+        help_text=_("What happened.")
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="activity_events",
+        verbose_name=_("User"),
+        help_text=_("User who performed the action.")
+    )
+    target_type = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name=_("Target type"),
+        help_text=_("Model label of the object acted upon, e.g. course.course.")
+    )
+    target_id = models.UUIDField(
+        null=True,
+        blank=True,
+        verbose_name=_("Target ID"),
+        help_text=_("Primary key of the object acted upon.")
+    )
+    occurred_at = models.DateTimeField(
+        verbose_name=_("Occurred at"),
+        help_text=_("When the event happened; created_at is when it was written.")
+    )
+
+    class Meta:
+        verbose_name = _("Activity Event")
+        verbose_name_plural = _("Activity Events")
+        ordering = ["-occurred_at"]
+        indexes = [
+            models.Index(fields=['kind', 'occurred_at']),
+            models.Index(fields=['user', 'occurred_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} by {self.user_id} at {self.occurred_at}"
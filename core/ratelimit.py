@@ -0,0 +1,173 @@
+"""Token-bucket rate limiting for expensive endpoints (login, signup, activation).
+
+Limits are configured per scope in ``settings.RATE_LIMITS``::
+
+    RATE_LIMITS = {
+        'ENABLED': True,
+        'CACHE_ALIAS': 'default',
+        'SCOPES': {
+            'login': {'ip': '30/m', 'email': '10/m'},
+        },
+    }
+
+``'10/m'`` is a bucket of 10 tokens refilled at 10 per minute (periods:
+``s``, ``m``, ``h``, ``d``). Each bucket is stored as a single timestamp
+(GCRA, the "virtual scheduling" form of a token bucket) in the shared cache,
+so every worker sees the same budget. If the shared cache fails, buckets
+fall back to this process's memory. Read-modify-write on the cache is not
+atomic; a burst arriving in the same instant on several workers may get a
+few extra tokens, which is fine for abuse control.
+
+The check runs before the view, so a rejected request costs a cache read,
+never a password hash or an email.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from . import metrics
+from .context import client_ip
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """``'10/m'`` -> ``(10, 60.0)`` (capacity, period in seconds)."""
+    count, _, period = rate.partition('/')
+    return int(count), float(PERIODS[period.strip()[-1]] * int(period.strip()[:-1] or 1))
+
+
+class LocalBuckets:
+    """In-process bucket store used when the shared cache is unavailable."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class RateLimiter:
+    def __init__(self, alias='default', scopes=None, enabled=True):
+        self.alias = alias
+        self.scopes = {
+            scope: {kind: parse_rate(rate) for kind, rate in limits.items()}
+            for scope, limits in (scopes or {}).items()
+        }
+        self.enabled = enabled
+        self.local = LocalBuckets()
+        self.stats = {'allowed': 0, 'rejected': 0, 'fallback': 0}
+        self._stats_lock = threading.Lock()
+
+    def hit(self, scope, kind, value, now=None):
+        """Take a token from the ``scope``/``kind`` bucket of ``value``.
+
+        Returns ``0`` when allowed, else the seconds to wait before retrying.
+        """
+        limit = self.scopes.get(scope, {}).get(kind)
+        if not self.enabled or limit is None or not value:
+            return 0
+        capacity, period = limit
+        interval = period / capacity
+        now = time.time() if now is None else now
+        key = f"rl:{scope}:{kind}:{hashlib.blake2b(value.encode(), digest_size=12).hexdigest()}"
+
+        store = self._store()
+        try:
+            tat = store.get(key)
+        except Exception:
+            logger.warning("Rate limit cache unavailable; using in-process buckets", exc_info=True)
+            self._count('fallback')
+            store = self.local
+            tat = store.get(key)
+        tat = max(tat or now, now)
+        allow_at = tat + interval - capacity * interval
+        if now < allow_at:
+            return allow_at - now
+        try:
+            store.set(key, tat + interval, math.ceil(tat + interval - now) + 1)
+        except Exception:
+            self._count('fallback')
+            self.local.set(key, tat + interval, None)
+        return 0
+
+    def check(self, scope, request):
+        """Hit every configured bucket of ``scope`` for ``request``; returns the longest wait."""
+        wait = 0
+        for kind in self.scopes.get(scope, {}):
+            wait = max(wait, self.hit(scope, kind, _key_value(kind, request)))
+        self._count('rejected' if wait else 'allowed')
+        return wait
+
+    def snapshot(self):
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _store(self):
+        return caches[self.alias]
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+
+def _key_value(kind, request):
+    if kind == 'ip':
+        return client_ip(request)
+    if kind == 'email':
+        return (request.POST.get('email') or '').strip().lower()
+    raise ValueError(f"Unknown rate limit key '{kind}'.")
+
+
+def ratelimit(scope, methods=('POST',)):
+    """View decorator answering 429 once a bucket of ``scope`` is empty."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                wait = limiter.check(scope, request)
+                if wait:
+                    response = HttpResponse(
+                        "Trop de tentatives. Veuillez réessayer plus tard.",
+                        status=429, content_type='text/plain; charset=utf-8',
+                    )
+                    response['Retry-After'] = str(math.ceil(wait))
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _build():
+    options = getattr(settings, 'RATE_LIMITS', {})
+    built = RateLimiter(
+        alias=options.get('CACHE_ALIAS', 'default'),
+        scopes=options.get('SCOPES', {}),
+        enabled=options.get('ENABLED', True),
+    )
+    metrics.register('ratelimit', built.snapshot)
+    return built
+
+
+limiter = _build()
@@ -0,0 +1,186 @@
+"""Template render profiling and template cache warm-up.
+
+Profiling: ``install()`` (called from ``CoreConfig.ready``) wraps
+``Template._render`` and ``BlockNode.render``. ``Template._render`` is the
+same hook Django's test runner uses for its ``template_rendered`` signal:
+``setup_test_environment()`` replaces it and so drops the wrapper, and
+callers must run ``install()`` again after it (it wraps whatever is
+current, once). The wrappers only do work while a ``RenderProfile`` is
+active for the current request (see ``TemplateProfilingMiddleware``);
+otherwise they cost a context variable lookup. A profile records, per
+template, the render count, inclusive and self time and the queries issued
+while it was the innermost template being rendered, and the inclusive time
+of every ``{% block %}``. Block bodies are charged to the template that
+defines them, so a child page's ``content`` block counts towards the child,
+not the base it extends.
+
+Warm-up: ``warm_up()`` compiles every template the Django engines can find,
+so the cached loader holds them all before the first request.
+"""
+import logging
+import os
+import time
+from contextvars import ContextVar
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.base import Template
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, BlockNode
+
+logger = logging.getLogger('afterschool.templates')
+
+_profile = ContextVar('render_profile', default=None)
+
+
+class RenderProfile:
+    def __init__(self):
+        self.templates = {}  # name -> [renders, inclusive s, self s, queries, top level?]
+        self.blocks = {}  # name -> [renders, inclusive s]
+        self.stack = []  # [name, child seconds] of the templates being rendered
+        self.view_queries = 0
+
+    def __enter__(self):
+        self._token = _profile.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _profile.reset(self._token)
+
+    def enter(self, name):
+        self.stack.append([name, 0.0])
+        return self.templates.setdefault(name, [0, 0.0, 0.0, 0, False])
+
+    def exit(self, start):
+        """Close the innermost frame opened at ``start``; returns its elapsed seconds."""
+        elapsed = time.perf_counter() - start
+        name, children = self.stack.pop()
+        self.templates[name][2] += elapsed - children
+        if self.stack:
+            self.stack[-1][1] += elapsed
+        return elapsed
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook charging each query to the current template."""
+        if self.stack:
+            self.templates[self.stack[-1][0]][3] += 1
+        else:
+            self.view_queries += 1
+        return execute(sql, params, many, context)
+
+    @property
+    def total(self):
+        """Time spent in top-level template renders."""
+        return sum(stats[1] for name, stats in self.templates.items() if stats[4])
+
+    def summary(self, top=None):
+        templates = sorted(
+            ({'template': name, 'renders': renders, 'ms': round(inclusive * 1000, 2),
+              'self_ms': round(own * 1000, 2), 'queries': queries}
+             for name, (renders, inclusive, own, queries, _) in self.templates.items()),
+            key=lambda row: -row['self_ms'],
+        )
+        blocks = sorted(
+            ({'block': name, 'renders': renders, 'ms': round(inclusive * 1000, 2)}
+             for name, (renders, inclusive) in self.blocks.items()),
+            key=lambda row: -row['ms'],
+        )
+        return templates[:top], blocks[:top]
+
+
+def _template_name(origin):
+    return getattr(origin, 'template_name', None) or getattr(origin, 'name', None) or '<string>'
+
+
+def _profiled_render(original):
+    def _render(self, context):
+        profile = _profile.get()
+        if profile is None:
+            return original(self, context)
+        stats = profile.enter(_template_name(self.origin))
+        if len(profile.stack) == 1:
+            stats[4] = True  # rendered at top level, counts towards the total
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            elapsed = profile.exit(start)
+            stats[0] += 1
+            stats[1] += elapsed
+    _render.profiled = True
+    return _render
+
+
+def _profiled_block(original):
+    def render(self, context):
+        profile = _profile.get()
+        if profile is None:
+            return original(self, context)
+        # Charge the block to the template that defines the version being
+        # rendered (the child's override, not the base that declares it).
+        block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
+        block = (block_context.get_block(self.name) if block_context else None) or self
+        profile.enter(_template_name(getattr(block, 'origin', None)))
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            elapsed = profile.exit(start)
+            stats = profile.blocks.setdefault(self.name, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+    render.profiled = True
+    return render
+
+
+def installed():
+    return getattr(Template._render, 'profiled', False)
+
+
+def install():
+    """Wrap the current ``Template._render`` and ``BlockNode.render`` unless already wrapped."""
+    if not installed():
+        Template._render = _profiled_render(Template._render)
+    if not getattr(BlockNode.render, 'profiled', False):
+        BlockNode.render = _profiled_block(BlockNode.render)
+
+
+def template_names(engine):
+    """Names of every template file the loaders of a Django template ``engine`` can see."""
+    names = set()
+    for directory in dict.fromkeys(_loader_dirs(engine.template_loaders)):
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(('.html', '.txt', '.xml')):
+                    names.add(os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def _loader_dirs(loaders):
+    for loader in loaders:
+        if hasattr(loader, 'loaders'):  # cached.Loader wraps other loaders
+            yield from _loader_dirs(loader.loaders)
+        elif hasattr(loader, 'get_dirs'):
+            yield from (str(directory) for directory in loader.get_dirs())
+
+
+def warm_up():
+    """Compile every template into the engines' cached loaders; returns the count."""
+    start = time.perf_counter()
+    compiled = failed = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+                compiled += 1
+            except Exception as exc:
+                # Partials meant for other engines, e-mail fragments with
+                # missing libraries, ...: they are compiled on first use instead.
+                failed += 1
+                logger.debug("Could not precompile %s: %s", name, exc)
+    logger.info(
+        "Precompiled %d templates in %.0f ms (%d skipped)",
+        compiled, (time.perf_counter() - start) * 1000, failed,
+    )
+    return compiled
@@ -0,0 +1,72 @@
+"""Cache-first sessions that only write to the database when data changes.
+
+Django's ``cached_db`` backend reads from the cache but writes every save
+through to ``django_session``. This store keeps the same durability (the
+database row is always current when the session *content* changes) but
+skips the UPDATE when a save would store identical data, unless the row's
+expiry has less than half of the session age left.
+"""
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.sessions.backends import cached_db
+from django.utils import timezone
+
+KEY_PREFIX = 'core.sessions.cached_db'
+
+
+class SessionStore(cached_db.SessionStore):
+    """Cache entries are ``(session_dict, db_expire_date)`` tuples."""
+
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._db_state = None  # (fingerprint, expire_date) of the stored row
+
+    def load(self):
+        try:
+            entry = self._cache.get(self.cache_key)
+        except Exception:
+            # Invalid cache keys raise on some backends; treat as a miss.
+            entry = None
+        if entry is None:
+            s = self._get_session_from_db()
+            if not s:
+                self._db_state = None
+                return {}
+            entry = (self.decode(s.session_data), s.expire_date)
+            self._cache.set(self.cache_key, entry, self.get_expiry_age(expiry=s.expire_date))
+        data, expire_date = entry
+        self._db_state = (self._fingerprint(data), expire_date)
+        return data
+
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    def save(self, must_create=False):
+        if not must_create and self.session_key is not None and self._is_unchanged():
+            return
+        cached_db.DBStore.save(self, must_create)
+        expire_date = self.get_expiry_date()
+        entry = (self._session, expire_date)
+        try:
+            self._cache.set(self.cache_key, entry, self.get_expiry_age())
+        except Exception:
+            cached_db.logger.exception("Error saving to cache (%s)", self._cache)
+        self._db_state = (self._fingerprint(self._session), expire_date)
+
+    async def asave(self, must_create=False):
+        await sync_to_async(self.save)(must_create)
+
+    def _is_unchanged(self):
+        if self._db_state is None:
+            return False
+        fingerprint, expire_date = self._db_state
+        remaining = expire_date - timezone.now()
+        if remaining < timedelta(seconds=self.get_expiry_age() / 2):
+            return False
+        return fingerprint == self._fingerprint(self._get_session())
+
+    def _fingerprint(self, data):
+        return self.serializer().dumps(data)
@@ -0,0 +1,191 @@
+"""Static files storage: minified, optimised, content-hashed and
+precompressed output (``settings.STATIC_ASSET_PIPELINE``).
+
+``AssetStorage`` optimises each collected file before
+``ManifestStaticFilesStorage`` hashes it, so a hashed name always matches
+the content it was computed from:
+
+* CSS and JS are minified with ``rcssmin`` / ``rjsmin`` when installed,
+  else by conservative stdlib strippers (comments and indentation; JS keeps
+  its line breaks so automatic semicolon insertion is unaffected). Files
+  already named ``*.min.*`` are left alone.
+* PNG/JPEG images are re-encoded with Pillow, optionally downscaled per
+  ``settings.ASSETS['IMAGE_MAX_SIZE']``, and kept only if smaller.
+* Optimisation always starts from the original file in the source
+  directory, so repeated runs give the same bytes and the same names.
+
+Then the hashed text files larger than ``MIN_COMPRESS_SIZE`` get ``.gz``
+(and ``.br`` with ``brotli`` installed) siblings for the web server to serve
+as is (``gzip_static`` / ``brotli_static``), with far-future cache headers
+since the names are content-hashed.
+
+``brotli``, ``rcssmin``, ``rjsmin`` and Pillow are pinned in
+requirements.txt; ``manage.py build_assets`` warns about any that is missing.
+"""
+import gzip
+import io
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+try:
+    import rcssmin
+except ImportError:  # pragma: no cover - optional dependency
+    rcssmin = None
+try:
+    import rjsmin
+except ImportError:  # pragma: no cover - optional dependency
+    rjsmin = None
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+_options = getattr(settings, 'ASSETS', {})
+COMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.xml', '.ttf', '.otf', '.eot', '.ico')
+MIN_COMPRESS_SIZE = _options.get('MIN_COMPRESS_SIZE', 256)
+IMAGE_MAX_SIZE = _options.get('IMAGE_MAX_SIZE', {})
+
+_CSS_COMMENT = re.compile(r'/\*(?!!).*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,])\s*')
+
+
+def minify_css(css):
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+    css = _CSS_COMMENT.sub('', css)
+    css = _CSS_SPACE.sub(' ', css)
+    return _CSS_PUNCTUATION.sub(r'\1', css).replace(';}', '}').strip()
+
+
+def minify_js(js):
+    if rjsmin is not None:
+        return rjsmin.jsmin(js)
+    return _strip_js(js)
+
+
+# Characters after which a ``/`` starts a regular expression rather than a division.
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def _strip_js(js):
+    """Drop comments, indentation and blank lines outside of string, template and regex literals."""
+    out = []
+    i, n = 0, len(js)
+    quote = None  # the delimiter of the literal being copied, if any
+    at_line_start = True
+    while i < n:
+        char = js[i]
+        if quote:
+            out.append(char)
+            if char == '\\' and i + 1 < n:
+                out.append(js[i + 1])
+                i += 1
+            elif char == quote or (char == '\n' and quote in '"\''):
+                quote = None
+            i += 1
+            continue
+        if at_line_start and char in ' \t\r\n':
+            i += 1
+            continue
+        if js.startswith('//', i):
+            i = js.find('\n', i)
+            i = n if i == -1 else i
+            continue
+        if js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        if char in '"\'`' or (char == '/' and _starts_regex(out)):
+            quote = char
+        if char == '\n':
+            while out and out[-1] in ' \t\r':
+                out.pop()
+            at_line_start = True
+        else:
+            at_line_start = False
+        out.append(char)
+        i += 1
+    return ''.join(out).strip() + '\n'
+
+
+def _starts_regex(out):
+    for char in reversed(out):
+        if not char.isspace():
+            return char in _REGEX_PRECEDERS
+    return True
+
+
+def optimise_image(content, max_size=None):
+    """Re-encoded (and downscaled to ``max_size`` px) image bytes, or None if not smaller."""
+    if Image is None:
+        return None
+    image = Image.open(io.BytesIO(content))
+    fmt = image.format
+    if max_size and max(image.size) > max_size:
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+    out = io.BytesIO()
+    if fmt == 'PNG':
+        image.save(out, 'PNG', optimize=True)
+    elif fmt == 'JPEG':
+        image.save(out, 'JPEG', quality=82, optimize=True, progressive=True)
+    else:
+        return None
+    return out.getvalue() if out.tell() < len(content) else None
+
+
+class AssetStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run=dry_run, **options)
+            return
+        # Hash (and rewrite the url()s of) the optimised copies, not the originals.
+        paths = {name: self.optimise(name, storage, path) for name, (storage, path) in paths.items()}
+        for name, hashed_name, processed in super().post_process(paths, dry_run=dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                self.compress(hashed_name, refresh=processed)
+            yield name, hashed_name, processed
+
+    def optimise(self, name, storage, path):
+        """``(storage, path)`` to hash for ``name``: an optimised copy saved under ``name``, or the original."""
+        lowered = name.lower()
+        if '.min.' in lowered or not lowered.endswith(('.css', '.js', '.png', '.jpg', '.jpeg')):
+            return storage, path
+        with storage.open(path) as handle:
+            content = handle.read()
+        if lowered.endswith('.css'):
+            optimised = minify_css(content.decode('utf-8')).encode('utf-8')
+        elif lowered.endswith('.js'):
+            optimised = minify_js(content.decode('utf-8')).encode('utf-8')
+        else:
+            optimised = optimise_image(content, IMAGE_MAX_SIZE.get(name))
+        if optimised is None or len(optimised) >= len(content):
+            return storage, path
+        self._replace(name, optimised)
+        return self, name
+
+    def compress(self, hashed_name, refresh=True):
+        if not hashed_name.lower().endswith(COMPRESS_EXTENSIONS):
+            return
+        if not refresh and self.exists(f'{hashed_name}.gz'):
+            # Same name, same content: the siblings from a previous run hold.
+            return
+        with self.open(hashed_name) as handle:
+            content = handle.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        self._replace(f'{hashed_name}.gz', gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            self._replace(f'{hashed_name}.br', brotli.compress(content))
+
+    def _replace(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content))
@@ -0,0 +1,20 @@
+from django import template
+from django.utils.html import format_html
+
+from core.assets import asset_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor(name):
+    """``<link>`` or ``<script>`` for vendor asset ``name`` (see ``core.assets``)."""
+    if name.endswith('.css'):
+        return format_html('<link href="{}" rel="stylesheet">', asset_url(name))
+    return format_html('<script src="{}"></script>', asset_url(name))
+
+
+@register.simple_tag
+def vendor_url(name):
+    """Bare URL of vendor asset ``name``, for images and CSS ``url()``."""
+    return asset_url(name)
@@ -0,0 +1,220 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .cache import TieredCache
+from .db.pool import ConnectionPool, PoolTimeout
+from .db.purge import delete_in_chunks
+from .ratelimit import RateLimiter, parse_rate
+
+
+class FakeConnection:
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        if not self.healthy:
+            raise RuntimeError("connection lost")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_returned_connection_is_reused(self):
+        pool = ConnectionPool(FakeConnection, max_size=2)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        self.assertIs(pool.getconn(), connection)
+        self.assertEqual(pool.stats.created, 1)
+
+    def test_checkout_times_out_when_the_pool_is_exhausted(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.05)
+        pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.stats.timeouts, 1)
+
+    def test_waiter_gets_the_connection_returned_meanwhile(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=2)
+        connection = pool.getconn()
+        threading.Timer(0.05, pool.putconn, [connection]).start()
+        self.assertIs(pool.getconn(), connection)
+        self.assertEqual(pool.stats.waits, 1)
+
+    def test_dead_connection_is_replaced_in_its_slot(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, ping_after=0)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        connection.healthy = False
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.snapshot()['size'], 1)
+        self.assertEqual(pool.stats.ping_failures, 1)
+
+    def test_connection_past_its_lifetime_is_closed_on_return(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, max_lifetime=0)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.snapshot()['size'], 0)
+
+    def test_connection_failing_reset_is_discarded(self):
+        def reset(connection):
+            raise RuntimeError("reset failed")
+
+        pool = ConnectionPool(FakeConnection, max_size=1, reset=reset)
+        connection = pool.getconn()
+        with self.assertLogs('core.db.pool', 'WARNING'):
+            pool.putconn(connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.snapshot()['idle'], 0)
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.cache = TieredCache()
+
+    def test_get_or_set_computes_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 'value'
+
+        self.assertEqual(self.cache.get_or_set('key', compute), 'value')
+        self.assertEqual(self.cache.get_or_set('key', compute), 'value')
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidating_a_tag_drops_entries_in_every_process(self):
+        other = TieredCache()
+        self.cache.set('key', 'old', tags=['course:1'])
+        self.assertEqual(other.get('key'), 'old')
+        other.clear_local()
+        self.cache.invalidate_tags('course:1')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertIsNone(other.get('key'))
+        self.assertEqual(other.snapshot()['stale'], 1)
+
+    def test_other_tags_survive_an_invalidation(self):
+        self.cache.set('a', 1, tags=['course:1'])
+        self.cache.set('b', 2, tags=['course:2'])
+        self.cache.invalidate_tags('course:1')
+        self.cache.clear_local()
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('b'), 2)
+
+    def test_invalidation_during_compute_leaves_the_entry_stale(self):
+        def compute():
+            self.cache.invalidate_tags('course:1')
+            return 'computed from the old data'
+
+        self.assertEqual(self.cache.get_or_set('key', compute, tags=['course:1']), 'computed from the old data')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertIsNone(TieredCache().get('key'))
+
+    def test_waiters_share_a_failed_computation(self):
+        started = threading.Event()
+        calls, errors = [], []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                self.cache.get_or_set('key', compute)
+            except ValueError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call)]
+        threads[0].start()
+        started.wait(1)
+        threads += [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(errors), 5)
+        self.assertEqual(self.cache._flights, {})
+        # The next miss computes again.
+        self.assertEqual(self.cache.get_or_set('key', lambda: 'value'), 'value')
+
+
+class DeleteInChunksTests(TestCase):
+    def test_deletes_only_the_queryset_by_chunks(self):
+        now = timezone.now()
+        Session.objects.bulk_create(
+            [Session(session_key=f'expired{i}', session_data='', expire_date=now - timedelta(days=1))
+             for i in range(5)]
+            + [Session(session_key='live', session_data='', expire_date=now + timedelta(days=1))]
+        )
+        pauses = []
+        deleted = delete_in_chunks(
+            Session.objects.filter(expire_date__lt=now).order_by('expire_date'),
+            chunk_size=2, pause=0.5, sleep=pauses.append,
+        )
+        self.assertEqual(deleted, 5)
+        self.assertEqual(pauses, [0.5, 0.5])
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+
+
+class RateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.limiter = RateLimiter(scopes={'login': {'ip': '3/m'}})
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/m'), (10, 60.0))
+        self.assertEqual(parse_rate('5/2h'), (5, 7200.0))
+
+    def test_bucket_allows_a_burst_then_refills_steadily(self):
+        now = 1000.0
+        for _ in range(3):
+            self.assertEqual(self.limiter.hit('login', 'ip', '10.0.0.1', now=now), 0)
+        self.assertAlmostEqual(self.limiter.hit('login', 'ip', '10.0.0.1', now=now), 20.0)
+        # One token comes back every 20 seconds.
+        self.assertEqual(self.limiter.hit('login', 'ip', '10.0.0.1', now=now + 20), 0)
+        self.assertGreater(self.limiter.hit('login', 'ip', '10.0.0.1', now=now + 20), 0)
+
+    def test_buckets_are_per_value(self):
+        now = 1000.0
+        for _ in range(3):
+            self.limiter.hit('login', 'ip', '10.0.0.1', now=now)
+        self.assertEqual(self.limiter.hit('login', 'ip', '10.0.0.2', now=now), 0)
+
+    def test_unknown_scope_or_disabled_limiter_allows(self):
+        self.assertEqual(self.limiter.hit('signup', 'ip', '10.0.0.1'), 0)
+        disabled = RateLimiter(scopes={'login': {'ip': '1/m'}}, enabled=False)
+        disabled.hit('login', 'ip', '10.0.0.1')
+        self.assertEqual(disabled.hit('login', 'ip', '10.0.0.1'), 0)
+
+    def test_falls_back_to_local_buckets_when_the_cache_fails(self):
+        class Broken:
+            def get(self, key):
+                raise ConnectionError("cache down")
+
+        self.limiter._store = Broken
+        now = 1000.0
+        with self.assertLogs('core.ratelimit', 'WARNING'):
+            for _ in range(3):
+                self.assertEqual(self.limiter.hit('login', 'ip', '10.0.0.1', now=now), 0)
+            self.assertGreater(self.limiter.hit('login', 'ip', '10.0.0.1', now=now), 0)
+        self.assertEqual(self.limiter.snapshot()['fallback'], 4)
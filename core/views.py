@@ -0,0 +1,26 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponseForbidden, JsonResponse
+from django.views.decorators.cache import never_cache
+
+from . import metrics
+
+
+def _is_monitoring_request(request):
+    """Allow staff users, or scrapers presenting ``Authorization: Bearer <METRICS_TOKEN>``."""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    if token and header.startswith('Bearer '):
+        return hmac.compare_digest(header[len('Bearer '):], token)
+    return False
+
+
+@never_cache
+def metrics_view(request):
+    """Expose the registered runtime metrics as JSON for monitoring."""
+    if not _is_monitoring_request(request):
+        return HttpResponseForbidden()
+    return JsonResponse(metrics.snapshot())
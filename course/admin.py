@@ -1,7 +1,19 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db import transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 
+from core.cache import tiered_cache
 from users.models import Teacher
-from .models import Course, Module, CourseReview, CourseEnrollment, Qualification, TeacherApplication
+from .models import (
+    Course, Module, CourseReview, CourseEnrollment, CourseWaitlistEntry, Qualification, TeacherApplication,
+)
+from .jsonl import export_courses, import_courses
+from .enrollment import promote_waitlist, release_seat
+from .exports import stream_enrollments_csv
 
 @admin.register(TeacherApplication)
 class TeacherApplicationAdmin(admin.ModelAdmin):
@@ -21,7 +33,10 @@ class TeacherApplicationAdmin(admin.ModelAdmin):
     approve_application.short_description = "Approuver les demandes sélectionnées"
 
     def reject_application(self, request, queryset):
+        user_ids = list(queryset.values_list('user_id', flat=True))
         queryset.update(status='rejected')
+        # update() bypasses post_save, so drop the cached statuses here.
+        tiered_cache.invalidate_tags(*[f'applications:{user_id}' for user_id in user_ids])
         self.message_user(request, "Les demandes sélectionnées ont été rejetées.")
     reject_application.short_description = "Rejeter les demandes sélectionnées"
 
@@ -42,7 +57,7 @@ class CourseAdmin(admin.ModelAdmin):
     list_filter = ['status', 'category', 'class_level', 'is_public']
     search_fields = ['title', 'description', 'teacher__user__email', 'teacher__user__last_name']
     inlines = [ModuleInline]
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'seats_taken']
     fieldsets = (
         (None, {
             'fields': ('title', 'description', 'thumbnail', 'class_level', 'category')
@@ -51,13 +66,14 @@ class CourseAdmin(admin.ModelAdmin):
             'fields': ('video', 'content', 'prerequisites')
         }),
         ('Details', {
-            'fields': ('teacher', 'status', 'is_public', 'estimated_duration', 'price')
+            'fields': ('teacher', 'status', 'is_public', 'estimated_duration', 'price', 'capacity', 'seats_taken')
         }),
         ('Metadata', {
             'fields': ('created_at', 'updated_at', 'id', 'ip_address', 'author', 'metadata')
         }),
     )
     list_editable = ['status', 'price']
+    change_list_template = 'admin/course/course/change_list.html'
 
     def get_teacher_name(self, obj):
         return obj.teacher.user.full_name
@@ -66,6 +82,42 @@ class CourseAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('teacher__user')
 
+    def get_urls(self):
+        urls = [
+            path('export-jsonl/', self.admin_site.admin_view(self.export_jsonl_view), name='course_course_export_jsonl'),
+            path('import-jsonl/', self.admin_site.admin_view(self.import_jsonl_view), name='course_course_import_jsonl'),
+        ]
+        return urls + super().get_urls()
+
+    def export_jsonl_view(self, request):
+        """Stream the whole catalog (or the filtered changelist) as JSON Lines."""
+        if not self.has_view_permission(request):
+            return redirect('admin:index')
+        queryset = self.get_changelist_instance(request).get_queryset(request)
+        response = StreamingHttpResponse(export_courses(queryset), content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="courses.jsonl"'
+        return response
+
+    def import_jsonl_view(self, request):
+        if not (self.has_add_permission(request) and self.has_change_permission(request)):
+            return redirect('admin:index')
+        if request.method == 'POST' and request.FILES.get('file'):
+            stats = import_courses(request.FILES['file'])
+            for number, error in stats['errors'][:20]:
+                self.message_user(request, f"Ligne {number} : {error}", messages.WARNING)
+            self.message_user(
+                request,
+                f"{stats['courses']} cours et {stats['modules']} modules importés "
+                f"({len(stats['errors'])} erreurs).",
+            )
+            return redirect('admin:course_course_changelist')
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': "Importer des cours (JSON Lines)",
+        }
+        return TemplateResponse(request, 'admin/course/course/import_jsonl.html', context)
+
 @admin.register(Module)
 class ModuleAdmin(admin.ModelAdmin):
     list_display = ['title', 'course', 'order', 'created_at']
@@ -111,6 +163,7 @@ class CourseEnrollmentAdmin(admin.ModelAdmin):
     list_filter = ['course']
     search_fields = ['course__title', 'user__email', 'user__last_name']
     readonly_fields = ['created_at', 'updated_at']
+    actions = ['export_progress_csv']
     fieldsets = (
         (None, {
             'fields': ('course', 'user')
@@ -121,4 +174,33 @@ class CourseEnrollmentAdmin(admin.ModelAdmin):
     )
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('course', 'user')
\ No newline at end of file
+        return super().get_queryset(request).select_related('course', 'user')
+
+    def save_model(self, request, obj, form, change):
+        # Admins may overbook: count the seat without checking the capacity.
+        with transaction.atomic():
+            if change and 'course' in form.changed_data:
+                release_seat(form.initial['course'])
+            if not change or 'course' in form.changed_data:
+                Course.objects.filter(pk=obj.course_id).update(seats_taken=F('seats_taken') + 1)
+            super().save_model(request, obj, form, change)
+
+    def export_progress_csv(self, request, queryset):
+        return stream_enrollments_csv(queryset, 'inscriptions.csv')
+    export_progress_csv.short_description = "Exporter la progression (CSV)"
+
+@admin.register(CourseWaitlistEntry)
+class CourseWaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ['course', 'user', 'created_at']
+    list_filter = ['course']
+    search_fields = ['course__title', 'user__email', 'user__last_name']
+    readonly_fields = ['created_at', 'updated_at']
+    actions = ['promote']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('course', 'user')
+
+    def promote(self, request, queryset):
+        promoted = sum(promote_waitlist(course_id) for course_id in set(queryset.values_list('course_id', flat=True)))
+        self.message_user(request, f"{promoted} apprenant(s) inscrit(s) depuis la liste d'attente.")
+    promote.short_description = "Inscrire les premiers de la liste selon les places libres"
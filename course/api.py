@@ -0,0 +1,208 @@
+"""Read-only JSON API over the public catalog: courses, modules and teachers.
+
+Lists are keyset-paginated on ``(created_at, id)``, newest first: the
+response carries a ``next`` URL whose opaque ``cursor`` encodes the last row
+seen, so deep pages cost the same as the first one. ``?fields=a,b`` selects
+a sparse fieldset; only the requested columns are read (``values()``), and
+rows are serialized straight from those dicts.
+
+Every response has a strong ``ETag`` and a ``Last-Modified`` computed by an
+aggregate query over ``updated_at`` before any row is read, so a client
+revalidating an unchanged resource gets a 304 without serialization.
+"""
+import uuid
+
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max, Q
+from django.http import Http404
+from django.views.decorators.http import require_GET
+
+from core.http import (
+    conditional_response, decode_cursor, encode_cursor, json_response, make_etag, set_validators,
+)
+from users.models import Teacher
+from .enums import CourseStatus
+from .models import Course, Module
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Public field name -> model column.
+COURSE_FIELDS = {
+    'id': 'id', 'title': 'title', 'description': 'description', 'class_level': 'class_level',
+    'category': 'category', 'price': 'price', 'estimated_duration': 'estimated_duration',
+    'capacity': 'capacity', 'teacher': 'teacher_id', 'thumbnail': 'thumbnail',
+    'external_key': 'external_key', 'created_at': 'created_at', 'updated_at': 'updated_at',
+}
+MODULE_FIELDS = {
+    'id': 'id', 'course': 'course_id', 'title': 'title', 'description': 'description',
+    'order': 'order', 'created_at': 'created_at', 'updated_at': 'updated_at',
+}
+TEACHER_FIELDS = {
+    'id': 'id', 'first_name': 'user__first_name', 'last_name': 'user__last_name', 'bio': 'bio',
+    'course_count': 'course_count', 'created_at': 'created_at', 'updated_at': 'updated_at',
+}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def catalog_courses():
+    return Course.objects.filter(is_public=True, status=CourseStatus.PUBLISHED)
+
+
+def catalog_teachers():
+    return Teacher.objects.filter(is_active=True, is_approved=True).annotate(
+        course_count=Count('courses', filter=Q(courses__is_public=True, courses__status=CourseStatus.PUBLISHED))
+    )
+
+
+@require_GET
+def course_list(request):
+    queryset = catalog_courses()
+    for name in ('class_level', 'category'):
+        if request.GET.get(name):
+            queryset = queryset.filter(**{name: request.GET[name]})
+    if request.GET.get('teacher'):
+        queryset = queryset.filter(teacher_id=_uuid(request.GET['teacher']))
+    return _list_response(request, queryset, COURSE_FIELDS)
+
+
+@require_GET
+def course_detail(request, pk):
+    return _detail_response(request, catalog_courses().filter(pk=pk), COURSE_FIELDS)
+
+
+@require_GET
+def course_modules(request, pk):
+    """All modules of a public course, in course order (not paginated)."""
+    modules = Module.objects.filter(course__in=catalog_courses().filter(pk=pk))
+    version = _version(modules)
+    if not version['count'] and not catalog_courses().filter(pk=pk).exists():
+        raise Http404
+    return _respond(
+        request, version, MODULE_FIELDS,
+        lambda columns: list(modules.order_by('order', 'pk').values(*columns)),
+        lambda rows: {'results': rows},
+    )
+
+
+@require_GET
+def module_detail(request, pk):
+    return _detail_response(request, Module.objects.filter(pk=pk, course__in=catalog_courses()), MODULE_FIELDS)
+
+
+@require_GET
+def teacher_list(request):
+    return _list_response(request, catalog_teachers(), TEACHER_FIELDS, version=_teacher_version)
+
+
+@require_GET
+def teacher_detail(request, pk):
+    return _detail_response(request, catalog_teachers().filter(pk=pk), TEACHER_FIELDS, version=_teacher_version)
+
+
+def _version(queryset):
+    return queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk', distinct=True))
+
+
+def _teacher_version(queryset):
+    """Teacher summaries also change with the user's name and the course catalog."""
+    teachers = Teacher.objects.filter(pk__in=queryset.values('pk')).aggregate(
+        last=Max('updated_at'), user_last=Max('user__updated_at'), count=Count('pk'),
+    )
+    courses = _version(catalog_courses())
+    stamps = [stamp for stamp in (teachers['last'], teachers['user_last'], courses['last']) if stamp]
+    return {'last': max(stamps, default=None), 'count': (teachers['count'], courses['count'])}
+
+
+def _list_response(request, queryset, field_map, version=_version):
+    try:
+        limit = min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return _error(f"'limit' must be an integer between 1 and {MAX_LIMIT}.")
+    try:
+        cursor = decode_cursor(request.GET.get('cursor'))
+    except ValueError:
+        return _error("Invalid cursor.")
+    if cursor:
+        created_at, pk = cursor
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    # The version covers every row from the cursor on, so an edit to any of
+    # them changes the ETag of the page.
+    current = version(queryset)
+
+    def fetch(columns):
+        columns = list(dict.fromkeys([*columns, 'created_at', 'id']))
+        return list(queryset.order_by('-created_at', '-pk').values(*columns)[:limit + 1])
+
+    def wrap(rows):
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_url = None
+        if has_more:
+            query = request.GET.copy()
+            query['cursor'] = encode_cursor(rows[-1]['_created_at'], rows[-1]['_id'])
+            next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        for row in rows:
+            row.pop('_created_at'), row.pop('_id')
+        return {'results': rows, 'next': next_url}
+
+    return _respond(request, current, field_map, fetch, wrap, keyset=True)
+
+
+def _detail_response(request, queryset, field_map, version=_version):
+    current = version(queryset)
+    if not current['count']:
+        raise Http404
+    return _respond(request, current, field_map, lambda columns: list(queryset.values(*columns)),
+                    lambda rows: rows[0])
+
+
+def _respond(request, version, field_map, fetch, wrap, keyset=False):
+    try:
+        fields = _fields(request, field_map)
+    except BadRequest as exc:
+        return _error(str(exc))
+    etag = make_etag(request.path, sorted(request.GET.lists()), version['last'], version['count'])
+    not_modified = conditional_response(request, etag=etag, last_modified=version['last'])
+    if not_modified is not None:
+        return not_modified
+
+    columns = [field_map[name] for name in fields]
+    rows = [_rename(row, field_map, fields, keyset) for row in fetch(columns)]
+    return set_validators(json_response(wrap(rows)), etag, version['last'])
+
+
+def _rename(row, field_map, fields, keyset=False):
+    data = {name: row[field_map[name]] for name in fields}
+    if 'thumbnail' in data:
+        data['thumbnail'] = default_storage.url(data['thumbnail']) if data['thumbnail'] else None
+    if keyset:
+        data['_created_at'], data['_id'] = row['created_at'], row['id']
+    return data
+
+
+def _fields(request, field_map):
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(field_map)
+    fields = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in field_map]
+    if unknown:
+        raise BadRequest(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(field_map)}.")
+    return fields
+
+
+def _uuid(value):
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise Http404
+
+
+def _error(message):
+    return json_response({'error': message}, status=400)
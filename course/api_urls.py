@@ -0,0 +1,14 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path('courses/', api.course_list, name='course_list'),
+    path('courses/<uuid:pk>/', api.course_detail, name='course_detail'),
+    path('courses/<uuid:pk>/modules/', api.course_modules, name='course_modules'),
+    path('modules/<uuid:pk>/', api.module_detail, name='module_detail'),
+    path('teachers/', api.teacher_list, name='teacher_list'),
+    path('teachers/<uuid:pk>/', api.teacher_detail, name='teacher_detail'),
+]
@@ -0,0 +1,207 @@
+"""Rendering of the ``content`` of courses and modules, done once on save.
+
+``Course.save()`` and ``Module.save()`` call ``render_content``. It fills
+``content_html``, ``word_count`` and ``reading_time`` from ``content``, so
+pages emit the stored HTML and never parse content per request. Bulk
+inserts (``seed_data``, the JSON Lines import) skip ``save()`` and call it
+themselves.
+
+The content is Markdown (``markdown``, pinned in requirements.txt so every
+environment renders alike). Inline HTML passes through it, so content
+written as HTML renders the same. The output then goes through
+``Sanitizer``, an allowlist built on the stdlib ``html.parser``:
+
+* Unknown tags are dropped but their text is kept. ``<script>``,
+  ``<style>`` and similar tags are dropped with their content.
+* Only the attributes listed per tag are kept.
+* Links to other sites (absolute or protocol-relative URLs) get
+  ``rel="nofollow noopener"``.
+* URLs must be relative or ``http``/``https``/``mailto`` (images: no
+  ``mailto``).
+* Unclosed tags are closed, and stray closing tags are dropped.
+
+When these rules change, re-render the stored HTML with
+``manage.py render_content``.
+"""
+import math
+import re
+from html import escape
+from html.parser import HTMLParser
+
+import markdown
+from django.conf import settings
+from django.utils import timezone
+
+from core.cache import tiered_cache
+
+_options = getattr(settings, 'CONTENT_RENDERING', {})
+MARKDOWN_EXTENSIONS = _options.get('MARKDOWN_EXTENSIONS', ['extra', 'sane_lists'])
+WORDS_PER_MINUTE = _options.get('WORDS_PER_MINUTE', 200)
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt', 'em',
+    'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'kbd',
+    'li', 'mark', 'ol', 'p', 'pre', 's', 'span', 'strong', 'sub', 'sup', 'table', 'tbody',
+    'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'ol': {'start'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+}
+URL_ATTRIBUTES = {'href': {'http', 'https', 'mailto'}, 'src': {'http', 'https'}}
+DROPPED_WITH_CONTENT = {
+    'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript',
+    'textarea', 'select', 'svg', 'math', 'head', 'title',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Tags inside a word; any other tag separates words for the word count.
+INLINE_TAGS = {'a', 'abbr', 'b', 'code', 'del', 'em', 'i', 'kbd', 'mark', 's', 'span', 'strong', 'sub', 'sup', 'u'}
+
+RENDERED_FIELDS = ('content_html', 'word_count', 'reading_time')
+
+_SCHEME = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+_URL_NOISE = re.compile(r'[\x00-\x20\x7f]+')
+
+
+class Sanitizer(HTMLParser):
+    """Rewrites HTML keeping only the allowlisted markup; collects its text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.text = []
+        self.open = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_WITH_CONTENT:
+            self.dropping += 1
+            return
+        if tag not in INLINE_TAGS:
+            self.text.append(' ')
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        kept = []
+        external = False
+        allowed = ALLOWED_ATTRIBUTES.get(tag, ())
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not _safe_url(value, URL_ATTRIBUTES[name]):
+                continue
+            kept.append(f' {name}="{escape(value)}"')
+            external = external or (name == 'href' and _is_external(value))
+        if external:
+            kept.append(' rel="nofollow noopener"')
+        self.out.append(f"<{tag}{''.join(kept)}>")
+        if tag not in VOID_TAGS:
+            self.open.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_WITH_CONTENT:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if tag not in INLINE_TAGS:
+            self.text.append(' ')
+        if self.dropping or tag not in self.open:
+            return
+        while self.open:
+            current = self.open.pop()
+            self.out.append(f'</{current}>')
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(escape(data, quote=False))
+            self.text.append(data)
+
+    def close(self):
+        super().close()
+        while self.open:
+            self.out.append(f'</{self.open.pop()}>')
+
+    @property
+    def html(self):
+        return ''.join(self.out)
+
+    @property
+    def word_count(self):
+        return len(''.join(self.text).split())
+
+
+def sanitize(html):
+    """``(safe_html, word_count)`` for ``html``."""
+    sanitizer = Sanitizer()
+    sanitizer.feed(html)
+    sanitizer.close()
+    return sanitizer.html, sanitizer.word_count
+
+
+def to_html(text):
+    """Unsanitized HTML for the Markdown ``text``."""
+    return markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+
+
+def render(text):
+    """``(html, word_count, reading_time)`` for ``text``; the reading time is in minutes."""
+    if not text or not text.strip():
+        return '', 0, 0
+    html, words = sanitize(to_html(text))
+    return html, words, math.ceil(words / WORDS_PER_MINUTE)
+
+
+def render_content(instance):
+    """Set ``content_html``, ``word_count`` and ``reading_time`` of a course or module."""
+    instance.content_html, instance.word_count, instance.reading_time = render(instance.content)
+    return instance
+
+
+def rerender(queryset, batch_size=500):
+    """Re-render the content of the rows of ``queryset``; returns how many changed.
+
+    Only rows whose output differs are written, ``batch_size`` per
+    ``bulk_update``, and the cached pages of their courses are invalidated.
+    """
+    model = queryset.model
+    course_field = 'course_id' if hasattr(model, 'course_id') else 'pk'
+    changed, total = [], 0
+
+    def flush():
+        now = timezone.now()
+        for row in changed:
+            row.updated_at = now
+        model.objects.bulk_update(changed, [*RENDERED_FIELDS, 'updated_at'])
+        # bulk_update() sends no post_save.
+        tiered_cache.invalidate_tags(*{f'course:{getattr(row, course_field)}' for row in changed})
+        changed.clear()
+
+    fields = {'pk', 'content', course_field.removesuffix('_id'), *RENDERED_FIELDS}
+    for row in queryset.only(*fields).order_by('pk').iterator(chunk_size=batch_size):
+        rendered = render(row.content)
+        if rendered == tuple(getattr(row, field) for field in RENDERED_FIELDS):
+            continue
+        row.content_html, row.word_count, row.reading_time = rendered
+        changed.append(row)
+        total += 1
+        if len(changed) >= batch_size:
+            flush()
+    if changed:
+        flush()
+    return total
+
+
+def _is_external(value):
+    """Whether the URL leaves the site: absolute, or protocol-relative (``//host``, ``\\\\host`` ...)."""
+    url = _URL_NOISE.sub('', value).replace('\\', '/').lower()
+    return url.startswith(('http:', 'https:', '//'))
+
+
+def _safe_url(value, schemes):
+    url = _URL_NOISE.sub('', value)
+    match = _SCHEME.match(url)
+    return match is None or match.group(1).lower() in schemes
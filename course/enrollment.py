@@ -0,0 +1,109 @@
+"""Enrollment with optional seat limits and a first-in, first-out waitlist.
+
+A seat is taken with a single conditional UPDATE on the course row::
+
+    UPDATE course SET seats_taken = seats_taken + 1
+    WHERE id = %s AND (capacity IS NULL OR seats_taken < capacity)
+
+The database evaluates the condition against the current row under its
+row lock, so concurrent requests can never overbook and nobody waits on a
+``SELECT ... FOR UPDATE`` taken earlier in the transaction. The seat and the
+enrollment row are written in the same transaction: if the enrollment
+insert fails (the learner enrolled twice at once), the seat is given back
+by the rollback.
+
+Seats are released by the ``post_delete`` handler of ``CourseEnrollment``,
+which then promotes the head of the waitlist once the transaction commits.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Course, CourseEnrollment, CourseWaitlistEntry
+
+ENROLLED = 'enrolled'
+ALREADY_ENROLLED = 'already_enrolled'
+WAITLISTED = 'waitlisted'
+
+
+def take_seat(course_id):
+    """Atomically reserve a seat; returns False when the course is full."""
+    return bool(
+        Course.objects.filter(Q(capacity__isnull=True) | Q(seats_taken__lt=F('capacity')), pk=course_id)
+        .update(seats_taken=F('seats_taken') + 1)
+    )
+
+
+def release_seat(course_id):
+    Course.objects.filter(pk=course_id, seats_taken__gt=0).update(seats_taken=F('seats_taken') - 1)
+
+
+def enroll(user, course):
+    """Enroll ``user`` in ``course`` or put them on its waitlist.
+
+    Returns ``ENROLLED``, ``ALREADY_ENROLLED`` or ``WAITLISTED``.
+    """
+    if CourseEnrollment.objects.filter(user=user, course=course).exists():
+        return ALREADY_ENROLLED
+    try:
+        with transaction.atomic():
+            if take_seat(course.pk):
+                CourseEnrollment.objects.create(user=user, course=course)
+                CourseWaitlistEntry.objects.filter(user=user, course=course).delete()
+                return ENROLLED
+    except IntegrityError:
+        # A concurrent request enrolled the same learner; the rollback
+        # returned the seat.
+        return ALREADY_ENROLLED
+    try:
+        with transaction.atomic():
+            CourseWaitlistEntry.objects.get_or_create(user=user, course=course)
+    except IntegrityError:
+        pass
+    return WAITLISTED
+
+
+def waitlist_position(user, course):
+    """1-based position of ``user`` in the course waitlist, or None."""
+    entry = CourseWaitlistEntry.objects.filter(user=user, course=course).values_list('created_at', 'pk').first()
+    if entry is None:
+        return None
+    created_at, pk = entry
+    return CourseWaitlistEntry.objects.filter(course=course).filter(
+        Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+    ).count() + 1
+
+
+def promote_waitlist(course_id):
+    """Enroll waitlisted learners, oldest first, while seats are free.
+
+    Returns the number of learners promoted.
+    """
+    promoted = 0
+    while True:
+        with transaction.atomic():
+            entry = (
+                CourseWaitlistEntry.objects.select_for_update(skip_locked=True)
+                .filter(course_id=course_id).order_by('created_at', 'pk').first()
+            )
+            if entry is None or not take_seat(course_id):
+                return promoted
+            try:
+                with transaction.atomic():
+                    CourseEnrollment.objects.create(user_id=entry.user_id, course_id=course_id)
+            except IntegrityError:
+                # Enrolled meanwhile by other means: drop the entry, keep the seat free.
+                release_seat(course_id)
+            else:
+                promoted += 1
+            entry.delete()
+
+
+def recount_seats(course_ids=None):
+    """Reset ``seats_taken`` from the enrollment table, e.g. after bulk loads."""
+    courses = Course.objects.all() if course_ids is None else Course.objects.filter(pk__in=course_ids)
+    enrolled = (
+        CourseEnrollment.objects.filter(course=OuterRef('pk'))
+        .order_by().values('course').annotate(n=Count('pk')).values('n')
+    )
+    return courses.update(seats_taken=Coalesce(Subquery(enrolled, output_field=IntegerField()), 0))
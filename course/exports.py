@@ -0,0 +1,60 @@
+"""Streaming CSV export of enrollments with their progress.
+
+Progress is computed by the database in the same query as the enrollment
+rows (two correlated COUNT subqueries), so the export costs one query per
+``chunk_size`` rows instead of two per enrollment as with
+``CourseEnrollment.progress``.
+"""
+import csv
+
+from django.http import StreamingHttpResponse
+
+from .progress import with_progress
+
+HEADER = [
+    'Cours', 'Niveau', 'Enseignant', 'Apprenant', 'Email', 'Inscrit le',
+    'Modules complétés', 'Modules au total', 'Progression (%)', 'Terminé',
+]
+
+
+def enrollment_rows(queryset, chunk_size=2000):
+    """Yield CSV rows (lists) for ``queryset``, header first."""
+    yield HEADER
+    rows = (
+        with_progress(queryset)
+        .order_by('course__title', 'created_at')
+        .values_list(
+            'course__title', 'course__class_level', 'course__teacher__user__email',
+            'user__first_name', 'user__last_name', 'user__email', 'created_at',
+            'completed_modules', 'total_modules',
+        )
+    )
+    for title, level, teacher, first_name, last_name, email, created_at, done, total in rows.iterator(chunk_size):
+        progress = round(done * 100 / total, 1) if total else 0
+        yield [
+            title, level, teacher, f"{first_name or ''} {last_name}".strip(), email,
+            created_at.strftime('%Y-%m-%d %H:%M'), done, total, progress,
+            'oui' if total and done >= total else 'non',
+        ]
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def stream_enrollments_csv(queryset, filename):
+    """Return a ``StreamingHttpResponse`` sending the enrollment CSV row by row."""
+    writer = csv.writer(_Echo())
+
+    def content():
+        # BOM so spreadsheet applications detect UTF-8.
+        yield '\ufeff'
+        for row in enrollment_rows(queryset):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(content(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -10,7 +10,7 @@ class CourseForm(forms.ModelForm):
         fields = [
             'title', 'description', 'thumbnail', 'class_level',
             'video', 'content', 'prerequisites', 'category',
-            'is_public', 'estimated_duration'
+            'is_public', 'estimated_duration', 'capacity'
         ]
         widgets = {
             'description': forms.Textarea(attrs={'rows': 5}),
@@ -20,6 +20,7 @@ class CourseForm(forms.ModelForm):
             'category': forms.Select(),
             'is_public': forms.CheckboxInput(),
             'estimated_duration': forms.NumberInput(attrs={'min': 1}),
+            'capacity': forms.NumberInput(attrs={'min': 1}),
         }
         labels = {
             'title': _('Course Title'),
@@ -32,15 +33,17 @@ class CourseForm(forms.ModelForm):
             'category': _('Category'),
             'is_public': _('Public Course'),
             'estimated_duration': _('Estimated Duration (hours)'),
+            'capacity': _('Capacity (seats)'),
         }
 
 class ModuleForm(forms.ModelForm):
     class Meta:
         model = Module
-        fields = ['title', 'description', 'video', 'order']
+        # New modules are appended (Module.save); moves go through the
+        # reorder endpoint, which rewrites only the moved module.
+        fields = ['title', 'description', 'video']
         widgets = {
             'description': forms.Textarea(attrs={'rows': 4}),
-            'order': forms.HiddenInput(attrs={'value': 1}),
         }
         labels = {
             'title': _('Module Title'),
@@ -0,0 +1,213 @@
+"""Streaming JSON Lines import/export of ``Course`` + ``Module`` trees.
+
+One line per course, with its modules nested::
+
+    {"external_key": "math-6-fractions", "title": "...", "teacher": "jane@school.org",
+     "class_level": "class_6", ..., "modules": [{"external_key": "...", "title": "...",
+     "order": 1024, ...}]}
+
+Courses and modules are matched on ``external_key``: existing rows are
+updated in place, new ones are inserted. Only the fields present in a line
+are written, so a partial line leaves the other columns of an existing row
+alone; a module without an ``order`` takes its position in the line. When
+a key appears more than once in a batch, the last line wins. A course
+exported without a key gets its primary key as key, so an export can be
+re-imported losslessly.
+"""
+import json
+import uuid
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Prefetch
+
+from core.cache import tiered_cache
+from users.models import Teacher
+from . import ordering
+from .content import RENDERED_FIELDS, render_content
+from .enums import ClassLevel, CourseCategory, CourseStatus
+from .models import Course, Module
+
+COURSE_FIELDS = [
+    'title', 'description', 'class_level', 'category', 'status', 'content',
+    'prerequisites', 'is_public', 'estimated_duration', 'price', 'thumbnail', 'video',
+]
+MODULE_FIELDS = ['title', 'description', 'order', 'content', 'video']
+
+
+def export_courses(queryset=None, chunk_size=500):
+    """Yield one JSON line per course. Memory is bounded by ``chunk_size``."""
+    if queryset is None:
+        queryset = Course.objects.all()
+    queryset = (
+        queryset.select_related('teacher__user')
+        .prefetch_related(Prefetch('modules', queryset=Module.objects.order_by('order', 'pk')))
+        .order_by('pk')
+    )
+    for course in queryset.iterator(chunk_size=chunk_size):
+        record = {'external_key': course.external_key or str(course.pk)}
+        record.update({field: _dump(getattr(course, field)) for field in COURSE_FIELDS})
+        record['teacher'] = course.teacher.user.email
+        record['modules'] = [
+            {
+                'external_key': module.external_key or str(module.pk),
+                **{field: _dump(getattr(module, field)) for field in MODULE_FIELDS},
+            }
+            for module in course.modules.all()
+        ]
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def import_courses(lines, batch_size=200):
+    """Upsert the courses described by ``lines``; each batch commits on its own.
+
+    Returns a dict with ``courses``, ``modules`` and ``errors`` (a list of
+    ``(line_number, message)``). Invalid lines are skipped, not fatal.
+    """
+    stats = {'courses': 0, 'modules': 0, 'errors': []}
+    batch = []
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            _validate(record)
+        except ValidationError as exc:
+            stats['errors'].append((number, ' '.join(exc.messages)))
+            continue
+        except ValueError as exc:
+            stats['errors'].append((number, f"Invalid JSON: {exc}"))
+            continue
+        batch.append((number, record))
+        if len(batch) >= batch_size:
+            _import_batch(batch, stats)
+            batch = []
+    if batch:
+        _import_batch(batch, stats)
+    return stats
+
+
+def _import_batch(batch, stats):
+    emails = {record['teacher'].lower() for _, record in batch}
+    teachers = {
+        teacher.user.email: teacher
+        for teacher in Teacher.objects.select_related('user').filter(user__email__in=emails, is_active=True)
+    }
+    # A key repeated in the batch would make the upsert hit the same row
+    # twice, which PostgreSQL rejects: keep the last line for each key.
+    latest = {record['external_key']: (number, record) for number, record in batch}
+    courses, pending = [], []
+    for number, record in latest.values():
+        teacher = teachers.get(record['teacher'].lower())
+        if teacher is None:
+            stats['errors'].append((number, f"No active teacher with email {record['teacher']}."))
+            continue
+        values = {field: record[field] for field in COURSE_FIELDS if field in record}
+        courses.append((render_content(Course(external_key=record['external_key'], teacher=teacher, **values)), values))
+        pending.append(record)
+    if not courses:
+        return
+
+    with transaction.atomic():
+        _adopt_keys(Course, [course.external_key for course, _ in courses])
+        _adopt_keys(Module, [m.get('external_key') for r in pending for m in r.get('modules', [])])
+        _upsert(Course, courses, ['teacher', 'updated_at'])
+        # On conflict the row keeps its original primary key, so read the
+        # keys back instead of trusting the UUIDs generated for the batch.
+        course_ids = dict(
+            Course.objects.filter(external_key__in=[course.external_key for course, _ in courses])
+            .values_list('external_key', 'pk')
+        )
+        modules = {}
+        for record in pending:
+            course_id = course_ids[record['external_key']]
+            for index, item in enumerate(record.get('modules', []), start=1):
+                values = {field: item[field] for field in MODULE_FIELDS if field in item}
+                values.setdefault('order', index * ordering.STEP)
+                key = item.get('external_key') or f"{record['external_key']}:{index}"
+                modules[key] = (render_content(Module(course_id=course_id, external_key=key, **values)), values)
+        _upsert(Module, modules.values(), ['course', 'updated_at'], batch_size=1000)
+    # bulk_create() sends no post_save, so invalidate the cached views here.
+    tiered_cache.invalidate_tags(
+        'catalog',
+        *{f'course:{pk}' for pk in course_ids.values()},
+        *{f'teacher:{course.teacher_id}' for course, _ in courses},
+    )
+    stats['courses'] += len(courses)
+    stats['modules'] += len(modules)
+
+
+def _upsert(model, rows, always, batch_size=None):
+    """Insert or update ``(instance, values)`` rows on ``external_key``.
+
+    Rows are grouped by the set of fields their line gave, one statement
+    per group, so that a column missing from a line keeps its stored value
+    instead of being reset to the model default.
+    """
+    groups = defaultdict(list)
+    for instance, values in rows:
+        groups[frozenset(values)].append(instance)
+    for fields, instances in groups.items():
+        update_fields = [*always, *sorted(fields)]
+        if 'content' in fields:
+            update_fields += RENDERED_FIELDS
+        model.objects.bulk_create(
+            instances,
+            update_conflicts=True,
+            unique_fields=['external_key'],
+            update_fields=update_fields,
+            batch_size=batch_size,
+        )
+
+
+def _adopt_keys(model, keys):
+    """Give keyless rows whose primary key appears as a key that key.
+
+    Exports use the primary key of rows without an ``external_key``;
+    adopting it lets the same file be re-imported as an update.
+    """
+    pks = []
+    for key in keys:
+        try:
+            pks.append(uuid.UUID(key))
+        except (TypeError, ValueError, AttributeError):
+            continue
+    if not pks:
+        return
+    keyless = model.objects.filter(pk__in=pks, external_key__isnull=True).values_list('pk', flat=True)
+    model.objects.bulk_update(
+        [model(pk=pk, external_key=str(pk)) for pk in keyless], ['external_key'], batch_size=500
+    )
+
+
+def _validate(record):
+    if not isinstance(record, dict):
+        raise ValidationError("Each line must be a JSON object.")
+    for field in ('external_key', 'title', 'teacher', 'class_level'):
+        if not record.get(field):
+            raise ValidationError(f"Missing required field '{field}'.")
+    choices = {'class_level': ClassLevel.values, 'category': CourseCategory.values,
+               'status': CourseStatus.values}
+    for field, allowed in choices.items():
+        if field in record and record[field] not in allowed:
+            raise ValidationError(f"Invalid {field} '{record[field]}'.")
+    if 'price' in record:
+        try:
+            record['price'] = Decimal(str(record['price']))
+        except InvalidOperation:
+            raise ValidationError(f"Invalid price '{record['price']}'.")
+    modules = record.get('modules', [])
+    if not isinstance(modules, list) or not all(isinstance(m, dict) and m.get('title') for m in modules):
+        raise ValidationError("'modules' must be a list of objects with a title.")
+
+
+def _dump(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, 'name') and hasattr(value, 'storage'):
+        return value.name or None
+    return value
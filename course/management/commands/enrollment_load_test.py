@@ -0,0 +1,119 @@
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from course.enrollment import ALREADY_ENROLLED, ENROLLED, WAITLISTED, enroll
+from course.enums import ClassLevel, CourseStatus
+from course.models import Course, CourseEnrollment, CourseWaitlistEntry
+from users.models import Teacher, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Enroll many learners concurrently in one course with a seat limit, then free "
+        "seats, and check that nobody was overbooked and the waitlist was served in order."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--learners', type=int, default=300)
+        parser.add_argument('--capacity', type=int, default=50)
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--release', type=int, default=10, help="Enrollments to cancel afterwards.")
+        parser.add_argument('--keep', action='store_true', help="Keep the generated course and learners.")
+
+    def handle(self, *args, **options):
+        teacher = Teacher.objects.filter(is_active=True).first()
+        if teacher is None:
+            raise CommandError("No active teacher; run `manage.py seed_data` first.")
+        run = uuid.uuid4().hex[:8]
+        course = Course.objects.create(
+            title=f"Load test {run}", description="Enrollment load test.", content="-",
+            class_level=ClassLevel.CLASS_1, status=CourseStatus.PUBLISHED, teacher=teacher,
+            capacity=options['capacity'],
+        )
+        learners = User.objects.bulk_create([
+            User(email=f"load{i}-{run}@example.com", last_name="Load", password='!', is_active=True)
+            for i in range(options['learners'])
+        ])
+        try:
+            self.drive(course, learners, options)
+        finally:
+            if not options['keep']:
+                course.delete()
+                User.objects.filter(pk__in=[user.pk for user in learners]).delete()
+
+    def drive(self, course, learners, options):
+        outcomes = {ENROLLED: 0, ALREADY_ENROLLED: 0, WAITLISTED: 0, 'error': 0}
+        lock = threading.Lock()
+        start_gate = threading.Barrier(options['threads'])
+
+        def worker(users):
+            try:
+                start_gate.wait()
+                for user in users:
+                    outcome = self.enroll_with_retry(user, course)
+                    with lock:
+                        outcomes[outcome] += 1
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(learners[n::options['threads']],))
+            for n in range(options['threads'])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{len(learners)} enrollment requests on {options['threads']} threads in {elapsed:.2f}s "
+            f"({len(learners) / elapsed:.0f} req/s): {outcomes}"
+        )
+
+        if outcomes['error']:
+            self.stderr.write(self.style.WARNING(
+                f"{outcomes['error']} requests gave up on lock contention "
+                "(with SQLite, try SQLITE_PRODUCTION=1 for a longer busy timeout)."
+            ))
+        served = len(learners) - outcomes['error']
+        expected = min(options['capacity'], served)
+        self.verify(course, expected, served - expected)
+
+        waiting = list(CourseWaitlistEntry.objects.filter(course=course)
+                       .order_by('created_at', 'pk').values_list('user_id', flat=True))
+        released = list(CourseEnrollment.objects.filter(course=course)[:options['release']])
+        for enrollment in released:
+            enrollment.delete()
+        head = set(waiting[:len(released)])
+        promoted = set(CourseEnrollment.objects.filter(course=course, user_id__in=head)
+                       .values_list('user_id', flat=True))
+        self.stdout.write(f"Cancelled {len(released)} enrollments; {len(promoted)} promoted from the waitlist.")
+        if promoted != head:
+            raise CommandError("The waitlist was not served first in, first out.")
+        self.verify(course, expected, served - expected - len(head))
+        self.stdout.write(self.style.SUCCESS("Seat counts and waitlist order are consistent."))
+
+    def enroll_with_retry(self, user, course, attempts=5):
+        for attempt in range(attempts):
+            try:
+                return enroll(user, course)
+            except OperationalError:
+                # SQLite reports writer contention as "database is locked".
+                time.sleep(0.05 * (attempt + 1))
+        return 'error'
+
+    def verify(self, course, enrolled, waiting):
+        course.refresh_from_db(fields=['seats_taken'])
+        counts = {
+            'seats_taken': course.seats_taken,
+            'enrollments': CourseEnrollment.objects.filter(course=course).count(),
+            'waitlist': CourseWaitlistEntry.objects.filter(course=course).count(),
+        }
+        self.stdout.write(f"  {counts}")
+        if counts != {'seats_taken': enrolled, 'enrollments': enrolled, 'waitlist': waiting}:
+            raise CommandError(f"Expected {enrolled} enrolled and {waiting} waiting.")
@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from course.jsonl import export_courses
+from course.models import Course
+
+
+class Command(BaseCommand):
+    help = "Export courses and their modules as JSON Lines (one course per line)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-', help="Output file, or - for stdout.")
+        parser.add_argument('--teacher', help="Only export courses of the teacher with this email.")
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Course.objects.all()
+        if options['teacher']:
+            queryset = queryset.filter(teacher__user__email=options['teacher'].lower())
+        output = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8')
+        count = 0
+        try:
+            for line in export_courses(queryset, chunk_size=options['chunk_size']):
+                output.write(line)
+                count += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        self.stderr.write(f"Exported {count} courses.")
@@ -0,0 +1,27 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from course.jsonl import import_courses
+
+
+class Command(BaseCommand):
+    help = "Import (upsert by external_key) courses and modules from a JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="Input file, or - for stdin.")
+        parser.add_argument('--batch-size', type=int, default=200, help="Courses per transaction.")
+
+    def handle(self, *args, **options):
+        source = sys.stdin if options['input'] == '-' else open(options['input'], encoding='utf-8')
+        try:
+            stats = import_courses(source, batch_size=options['batch_size'])
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        for number, message in stats['errors']:
+            self.stderr.write(f"line {number}: {message}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats['courses']} courses and {stats['modules']} modules "
+            f"({len(stats['errors'])} errors)."
+        ))
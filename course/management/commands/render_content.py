@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from course.content import rerender
+from course.models import Course, Module
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-render the stored HTML, word count and reading time of course and "
+        "module content, e.g. after the sanitizer rules changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=['course', 'module'], help="Only re-render this model.")
+        parser.add_argument('--course', help="Only re-render this course and its modules (id).")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        querysets = {'course': Course.objects.all(), 'module': Module.objects.all()}
+        if options['course']:
+            querysets = {'course': Course.objects.filter(pk=options['course']),
+                         'module': Module.objects.filter(course_id=options['course'])}
+        for name, queryset in querysets.items():
+            if options['model'] and name != options['model']:
+                continue
+            start = time.perf_counter()
+            changed = rerender(queryset, batch_size=options['batch_size'])
+            self.stdout.write(f"Re-rendered {changed} {name} rows in {time.perf_counter() - start:.1f}s.")
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from course.rollups import rebuild_rollups, update_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold new enrollments and module completions into the daily rollups read "
+        "by the teacher dashboard. Run it from cron, or with --interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help="Drop the rollups and recompute them from the full history.",
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="Repeat every N seconds instead of running once.",
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            start = time.perf_counter()
+            folded = rebuild_rollups()
+            self.stdout.write(f"Rebuilt rollups from {folded} rows in {time.perf_counter() - start:.1f}s.")
+        while True:
+            start = time.perf_counter()
+            folded = update_rollups()
+            self.stdout.write(f"Folded {folded} new rows in {time.perf_counter() - start:.2f}s.")
+            if not options['interval']:
+                return
+            connection.close()
+            time.sleep(options['interval'])
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0007_teacherapplication_identity_card_picture_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='external_key',
+            field=models.CharField(blank=True, help_text='Stable identifier used to upsert the course from curriculum imports (optional).', max_length=100, null=True, unique=True, verbose_name='External Key'),
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='external_key',
+            field=models.CharField(blank=True, help_text='Stable identifier used to upsert the module from curriculum imports (optional).', max_length=100, null=True, unique=True, verbose_name='External Key'),
+        ),
+    ]
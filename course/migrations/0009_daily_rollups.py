@@ -0,0 +1,77 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:04
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0008_course_module_external_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('name', models.CharField(help_text='Name of the rollup stream.', max_length=50, unique=True, verbose_name='Name')),
+                ('position', models.DateTimeField(help_text='Rows created up to and including this instant have been rolled up.', verbose_name='Position')),
+            ],
+            options={
+                'verbose_name': 'Rollup Watermark',
+                'verbose_name_plural': 'Rollup Watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseDailyStats',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('day', models.DateField(help_text='Day covered by the statistics.', verbose_name='Day')),
+                ('enrollments', models.PositiveIntegerField(default=0, help_text='New enrollments on that day.', verbose_name='Enrollments')),
+                ('completions', models.PositiveIntegerField(default=0, help_text='Module completions in the course on that day.', verbose_name='Module Completions')),
+                ('active_learners', models.PositiveIntegerField(default=0, help_text='Distinct learners who completed at least one module on that day.', verbose_name='Active Learners')),
+                ('course', models.ForeignKey(help_text='Course the statistics belong to.', on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='course.course', verbose_name='Course')),
+            ],
+            options={
+                'verbose_name': 'Course Daily Statistics',
+                'verbose_name_plural': 'Course Daily Statistics',
+                'ordering': ['day'],
+                'unique_together': {('course', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ModuleDailyStats',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('day', models.DateField(help_text='Day covered by the statistics.', verbose_name='Day')),
+                ('completions', models.PositiveIntegerField(default=0, help_text='Completions of the module on that day.', verbose_name='Completions')),
+                ('module', models.ForeignKey(help_text='Module the statistics belong to.', on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='course.module', verbose_name='Module')),
+            ],
+            options={
+                'verbose_name': 'Module Daily Statistics',
+                'verbose_name_plural': 'Module Daily Statistics',
+                'ordering': ['day'],
+                'unique_together': {('module', 'day')},
+            },
+        ),
+    ]
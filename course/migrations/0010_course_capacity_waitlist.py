@@ -0,0 +1,61 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:11
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_seats(apps, schema_editor):
+    Course = apps.get_model('course', 'Course')
+    CourseEnrollment = apps.get_model('course', 'CourseEnrollment')
+    enrolled = (
+        CourseEnrollment.objects.filter(course=OuterRef('pk'))
+        .order_by().values('course').annotate(n=Count('pk')).values('n')
+    )
+    Course.objects.update(seats_taken=Coalesce(Subquery(enrolled, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0009_daily_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum number of enrolled learners; further learners join the waitlist. Leave empty for no limit.', null=True, verbose_name='Capacity'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of enrollments, maintained by conditional updates in course.enrollment.', verbose_name='Seats Taken'),
+        ),
+        migrations.CreateModel(
+            name='CourseWaitlistEntry',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('course', models.ForeignKey(help_text='Course the learner is waiting for.', on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='course.course', verbose_name='Course')),
+                ('user', models.ForeignKey(help_text='Learner waiting for a seat.', on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Waitlist Entry',
+                'verbose_name_plural': 'Waitlist Entries',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['course', 'created_at'], name='course_cour_course__e8ff37_idx')],
+                'unique_together': {('course', 'user')},
+            },
+        ),
+        migrations.RunPython(count_seats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:44
+
+from django.db import migrations, models
+
+STEP = 1024
+
+
+def space_out_modules(apps, schema_editor):
+    # Module forms posted order=1 for every module, so most courses sort by
+    # created_at: turn the current (order, created_at) sequence into
+    # STEP-spaced values.
+    Module = apps.get_model('course', 'Module')
+    modules = []
+    course_id, position = None, 0
+    for module in Module.objects.order_by('course_id', 'order', 'created_at').only('pk', 'course_id', 'order').iterator():
+        if module.course_id != course_id:
+            course_id, position = module.course_id, 0
+        position += STEP
+        module.order = position
+        modules.append(module)
+    Module.objects.bulk_update(modules, ['order'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0010_course_capacity_waitlist'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='module',
+            name='order',
+            field=models.PositiveIntegerField(default=0, help_text='Sort key of the module within the course, spaced out by course.ordering; 0 appends the module.', verbose_name='Order'),
+        ),
+        migrations.AddIndex(
+            model_name='module',
+            index=models.Index(fields=['course', 'order'], name='course_modu_course__78ea83_idx'),
+        ),
+        migrations.RunPython(space_out_modules, migrations.RunPython.noop),
+    ]
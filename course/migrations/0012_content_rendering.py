@@ -0,0 +1,165 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:49
+
+import math
+import re
+from html import escape
+from html.parser import HTMLParser
+
+import markdown
+from django.db import migrations, models
+
+# A frozen copy of the course.content renderer as of this migration, so that
+# the migration keeps producing the same output whatever becomes of that
+# module. Later rule changes are applied with ``manage.py render_content``.
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt', 'em',
+    'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'kbd',
+    'li', 'mark', 'ol', 'p', 'pre', 's', 'span', 'strong', 'sub', 'sup', 'table', 'tbody',
+    'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'ol': {'start'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+}
+URL_ATTRIBUTES = {'href': {'http', 'https', 'mailto'}, 'src': {'http', 'https'}}
+DROPPED_WITH_CONTENT = {
+    'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript',
+    'textarea', 'select', 'svg', 'math', 'head', 'title',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+INLINE_TAGS = {'a', 'abbr', 'b', 'code', 'del', 'em', 'i', 'kbd', 'mark', 's', 'span', 'strong', 'sub', 'sup', 'u'}
+WORDS_PER_MINUTE = 200
+BATCH_SIZE = 1000
+
+_SCHEME = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+_URL_NOISE = re.compile(r'[\x00-\x20\x7f]+')
+
+
+class Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.text = []
+        self.open = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_WITH_CONTENT:
+            self.dropping += 1
+            return
+        if tag not in INLINE_TAGS:
+            self.text.append(' ')
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        kept = []
+        external = False
+        for name, value in attrs:
+            if name not in ALLOWED_ATTRIBUTES.get(tag, ()) or value is None:
+                continue
+            url = _URL_NOISE.sub('', value)
+            if name in URL_ATTRIBUTES:
+                match = _SCHEME.match(url)
+                if match is not None and match.group(1).lower() not in URL_ATTRIBUTES[name]:
+                    continue
+            kept.append(f' {name}="{escape(value)}"')
+            external = external or (
+                name == 'href' and url.replace('\\', '/').lower().startswith(('http:', 'https:', '//'))
+            )
+        if external:
+            kept.append(' rel="nofollow noopener"')
+        self.out.append(f"<{tag}{''.join(kept)}>")
+        if tag not in VOID_TAGS:
+            self.open.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_WITH_CONTENT:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if tag not in INLINE_TAGS:
+            self.text.append(' ')
+        if self.dropping or tag not in self.open:
+            return
+        while self.open:
+            current = self.open.pop()
+            self.out.append(f'</{current}>')
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(escape(data, quote=False))
+            self.text.append(data)
+
+    def close(self):
+        super().close()
+        while self.open:
+            self.out.append(f'</{self.open.pop()}>')
+
+
+def render(text):
+    if not text or not text.strip():
+        return '', 0, 0
+    sanitizer = Sanitizer()
+    sanitizer.feed(markdown.markdown(text, extensions=['extra', 'sane_lists']))
+    sanitizer.close()
+    words = len(''.join(sanitizer.text).split())
+    return ''.join(sanitizer.out), words, math.ceil(words / WORDS_PER_MINUTE)
+
+
+def render_existing(apps, schema_editor):
+    for name in ('Course', 'Module'):
+        model = apps.get_model('course', name)
+        rows = []
+        for row in model.objects.only('pk', 'content').order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            row.content_html, row.word_count, row.reading_time = render(row.content)
+            rows.append(row)
+            if len(rows) >= BATCH_SIZE:
+                model.objects.bulk_update(rows, ['content_html', 'word_count', 'reading_time'])
+                rows = []
+        if rows:
+            model.objects.bulk_update(rows, ['content_html', 'word_count', 'reading_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0011_module_gap_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, help_text='Sanitized HTML of the content, rendered on save (course.content).', verbose_name='Rendered Content'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Estimated reading time of the content, in minutes.', verbose_name='Reading Time'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of words in the course content.', verbose_name='Word Count'),
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, help_text='Sanitized HTML of the content, rendered on save (course.content).', verbose_name='Rendered Content'),
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Estimated reading time of the content, in minutes.', verbose_name='Reading Time'),
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of words in the module content.', verbose_name='Word Count'),
+        ),
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
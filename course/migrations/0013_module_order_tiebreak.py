@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0012_content_rendering'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='module',
+            options={'ordering': ['order', 'pk'], 'verbose_name': 'Module', 'verbose_name_plural': 'Modules'},
+        ),
+    ]
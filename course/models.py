@@ -1,11 +1,20 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 from users.models import Teacher, BaseModel
+from .content import RENDERED_FIELDS, render_content
 from .enums import ClassLevel, CourseStatus, CourseCategory, TeacherApplicationStatus
 
+def _render_on_save(instance, kwargs):
+    """Render ``content`` unless the save leaves it out of ``update_fields``."""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or 'content' in update_fields:
+        render_content(instance)
+        if update_fields is not None:
+            kwargs['update_fields'] = [*update_fields, *RENDERED_FIELDS]
+
 class Qualification(BaseModel):
     """Model representing a teacher's qualification or certificate."""
     application = models.ForeignKey(
@@ -142,6 +151,24 @@ class Course(BaseModel):
         verbose_name=_("Course Content"),
         help_text=_("Detailed content or syllabus of the course.")
     )
+    content_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name=_("Rendered Content"),
+        help_text=_("Sanitized HTML of the content, rendered on save (course.content).")
+    )
+    word_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Word Count"),
+        help_text=_("Number of words in the course content.")
+    )
+    reading_time = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Reading Time"),
+        help_text=_("Estimated reading time of the content, in minutes.")
+    )
     prerequisites = models.TextField(
         verbose_name=_("Prerequisites"),
         null=True,
@@ -188,6 +215,28 @@ class Course(BaseModel):
         help_text=_("Price of the course (0.00 for free)."),
         validators=[MinValueValidator(0.00)]
     )
+    external_key = models.CharField(
+        max_length=100,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name=_("External Key"),
+        help_text=_("Stable identifier used to upsert the course from curriculum imports (optional).")
+    )
+    capacity = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name=_("Capacity"),
+        help_text=_("Maximum number of enrolled learners; further learners join the waitlist. Leave empty for no limit.")
+    )
+    seats_taken = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Seats Taken"),
+        help_text=_("Number of enrollments, maintained by conditional updates in course.enrollment.")
+    )
+
+    COUNTER_FIELDS = frozenset({'seats_taken'})
 
     class Meta:
         verbose_name = _("Course")
@@ -201,8 +250,16 @@ class Course(BaseModel):
 
     def save(self, *args, **kwargs):
         self.clean()
+        _render_on_save(self, kwargs)
         super().save(*args, **kwargs)
 
+    @property
+    def seats_left(self):
+        """Free seats, or None when the course has no capacity limit."""
+        if self.capacity is None:
+            return None
+        return max(0, self.capacity - self.seats_taken)
+
     def __str__(self):
         return f"{self.title} ({self.get_class_level_display()}) by {self.teacher.user.full_name}"
 
@@ -227,7 +284,7 @@ class Module(BaseModel):
     order = models.PositiveIntegerField(
         default=0,
         verbose_name=_("Order"),
-        help_text=_("Order of the module within the course.")
+        help_text=_("Sort key of the module within the course, spaced out by course.ordering; 0 appends the module.")
     )
     video = models.FileField(
         upload_to="module_videos/",
@@ -240,11 +297,50 @@ class Module(BaseModel):
         verbose_name=_("Module Content"),
         help_text=_("Detailed content of the module.")
     )
+    content_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name=_("Rendered Content"),
+        help_text=_("Sanitized HTML of the content, rendered on save (course.content).")
+    )
+    word_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Word Count"),
+        help_text=_("Number of words in the module content.")
+    )
+    reading_time = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Reading Time"),
+        help_text=_("Estimated reading time of the content, in minutes.")
+    )
+    external_key = models.CharField(
+        max_length=100,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name=_("External Key"),
+        help_text=_("Stable identifier used to upsert the module from curriculum imports (optional).")
+    )
 
     class Meta:
         verbose_name = _("Module")
         verbose_name_plural = _("Modules")
-        ordering = ["order", "created_at"]
+        # The primary key breaks ties, here and in course.ordering.
+        ordering = ["order", "pk"]
+        indexes = [models.Index(fields=['course', 'order'])]
+
+    def save(self, *args, **kwargs):
+        _render_on_save(self, kwargs)
+        if self._state.adding and not self.order:
+            from .ordering import next_position
+            # next_position() locks the course until the module is inserted.
+            with transaction.atomic():
+                self.order = next_position(self.course_id)
+                super().save(*args, **kwargs)
+            return
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} (Module {self.order} of {self.course.title})"
@@ -356,4 +452,119 @@ class CourseEnrollment(BaseModel):
         completed_modules = ModuleCompletion.objects.filter(
             user=self.user, module__course=self.course
         ).count()
-        return completed_modules == total_modules
\ No newline at end of file
+        return completed_modules == total_modules
+
+class CourseWaitlistEntry(BaseModel):
+    """Learner waiting for a seat in a full course, served first in, first out."""
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+        verbose_name=_("Course"),
+        help_text=_("Course the learner is waiting for.")
+    )
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+        verbose_name=_("User"),
+        help_text=_("Learner waiting for a seat.")
+    )
+
+    class Meta:
+        verbose_name = _("Waitlist Entry")
+        verbose_name_plural = _("Waitlist Entries")
+        unique_together = ('course', 'user')
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=['course', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.user} waiting for {self.course}"
+
+class CourseDailyStats(BaseModel):
+    """Daily rollup of enrollment and learning activity for a course."""
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        verbose_name=_("Course"),
+        help_text=_("Course the statistics belong to.")
+    )
+    day = models.DateField(
+        verbose_name=_("Day"),
+        help_text=_("Day covered by the statistics.")
+    )
+    enrollments = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Enrollments"),
+        help_text=_("New enrollments on that day.")
+    )
+    completions = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Module Completions"),
+        help_text=_("Module completions in the course on that day.")
+    )
+    active_learners = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Active Learners"),
+        help_text=_("Distinct learners who completed at least one module on that day.")
+    )
+
+    class Meta:
+        verbose_name = _("Course Daily Statistics")
+        verbose_name_plural = _("Course Daily Statistics")
+        unique_together = ('course', 'day')
+        ordering = ["day"]
+
+    def __str__(self):
+        return f"{self.course_id} {self.day}"
+
+
+class ModuleDailyStats(BaseModel):
+    """Daily rollup of completions for a module, used for drop-off funnels."""
+    module = models.ForeignKey(
+        Module,
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        verbose_name=_("Module"),
+        help_text=_("Module the statistics belong to.")
+    )
+    day = models.DateField(
+        verbose_name=_("Day"),
+        help_text=_("Day covered by the statistics.")
+    )
+    completions = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Completions"),
+        help_text=_("Completions of the module on that day.")
+    )
+
+    class Meta:
+        verbose_name = _("Module Daily Statistics")
+        verbose_name_plural = _("Module Daily Statistics")
+        unique_together = ('module', 'day')
+        ordering = ["day"]
+
+    def __str__(self):
+        return f"{self.module_id} {self.day}"
+
+
+class RollupWatermark(BaseModel):
+    """Position up to which a rollup has consumed its source table."""
+    name = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name=_("Name"),
+        help_text=_("Name of the rollup stream.")
+    )
+    position = models.DateTimeField(
+        verbose_name=_("Position"),
+        help_text=_("Rows created up to and including this instant have been rolled up.")
+    )
+
+    class Meta:
+        verbose_name = _("Rollup Watermark")
+        verbose_name_plural = _("Rollup Watermarks")
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
@@ -0,0 +1,78 @@
+"""Editing the modules of a course a page at a time.
+
+The course editor renders the course form and the first ``PAGE_SIZE``
+module forms. Further pages are fetched on demand
+(``ModuleFormsView``). Each form is prefixed with its module id instead of
+a formset index, so the browser can post any subset of them. It posts only
+the modules the teacher touched, listed in ``modules`` (new ones in
+``new``).
+
+``bind_modules`` loads the posted modules in one query. ``save_modules``
+writes only the forms that ``has_changed()``, and only their changed
+columns (``update_fields``). A video is in ``changed_data`` only when a
+file is uploaded or cleared, so untouched videos are never rebound or
+rewritten. A save costs in proportion to the edits, not to the course.
+"""
+import uuid
+
+from django.db.models import Q
+
+from .forms import ModuleForm
+from .models import Module
+
+PAGE_SIZE = 20
+
+
+def module_page(course, after=None, limit=PAGE_SIZE):
+    """``(modules, has_more)``: the modules of ``course`` that follow the module ``after``."""
+    queryset = Module.objects.filter(course=course).order_by('order', 'pk')
+    if after is not None:
+        queryset = queryset.filter(Q(order__gt=after.order) | Q(order=after.order, pk__gt=after.pk))
+    rows = list(queryset[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def module_forms(modules):
+    return [ModuleForm(instance=module, prefix=module_prefix(module)) for module in modules]
+
+
+def module_prefix(module):
+    return f'module-{module.pk}'
+
+
+def bind_modules(course, data, files):
+    """Bound forms for the posted modules of ``course``, existing ones first."""
+    ids = set()
+    for value in data.getlist('modules'):
+        try:
+            ids.add(uuid.UUID(value))
+        except ValueError:
+            continue
+    modules = Module.objects.filter(course=course, pk__in=ids).order_by('order', 'pk') if ids else []
+    forms = [ModuleForm(data, files, instance=module, prefix=module_prefix(module)) for module in modules]
+    for key in dict.fromkeys(data.getlist('new')):
+        if key.isdigit():
+            forms.append(new_module_form(course, key, data, files))
+    return forms
+
+
+def new_module_form(course=None, key='__prefix__', data=None, files=None):
+    """Form for a module added in the editor; ``key`` numbers it within the page."""
+    form = ModuleForm(data, files, instance=Module(course=course), prefix=f'new-{key}')
+    form.new_key = key
+    return form
+
+
+def save_modules(forms):
+    """Save the changed ``forms``, writing only the changed columns; returns the modules saved."""
+    saved = []
+    for form in forms:
+        if not form.has_changed():
+            continue
+        module = form.save(commit=False)
+        if module._state.adding:
+            module.save()
+        else:
+            module.save(update_fields=[*form.changed_data, 'updated_at'])
+        saved.append(module)
+    return saved
@@ -0,0 +1,90 @@
+"""Gap-based ordering of the modules of a course.
+
+``Module.order`` values are spaced ``STEP`` apart (1024, 2048, ...). A module
+is appended at ``max(order) + STEP`` and moved to the midpoint between its
+new neighbours, so a move rewrites only the moved row, whatever the length
+of the course. After about ten moves into the same gap it closes up: the
+course is then renumbered once (``rebalance``, a single ``bulk_update``) and
+the move proceeds.
+
+Appends and moves are serialized per course by a row lock on the course,
+so two concurrent ones cannot pick the same value. Modules sort on
+``(order, pk)`` everywhere, so rows that do share a value (from an import)
+still have one order, and a move next to them rebalances the course. The
+``(course, order)`` index makes the neighbour lookups and the outline query
+a range scan.
+"""
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import Course, Module
+from .signals import invalidate_on_commit
+
+STEP = 1024
+
+
+def next_position(course_id):
+    """Order value placing a new module after the last one of the course.
+
+    Locks the course row: call it in the transaction that inserts the module.
+    """
+    lock_course(course_id)
+    last = Module.objects.filter(course_id=course_id).aggregate(last=Max('order'))['last']
+    return (last or 0) + STEP
+
+
+def move_module(module, after=None):
+    """Move ``module`` right after the module ``after`` (None: to the top).
+
+    Writes the new ``order`` of ``module`` only, unless the gap is exhausted
+    and the course has to be rebalanced first. Returns the new order value.
+    """
+    if after is not None and after.course_id != module.course_id:
+        raise ValueError("Modules belong to different courses.")
+    with transaction.atomic():
+        lock_course(module.course_id)
+        position = _between(module, after)
+        if position is None:
+            rebalance(module.course_id)
+            position = _between(module, after)
+        Module.objects.filter(pk=module.pk).update(order=position, updated_at=timezone.now())
+        # update() sends no post_save.
+        invalidate_on_commit(f'course:{module.course_id}')
+    module.order = position
+    return position
+
+
+def lock_course(course_id):
+    """Take the row lock on the course until the end of the transaction."""
+    # Evaluated, unlike exists(), which may drop the FOR UPDATE.
+    list(Course.objects.select_for_update().filter(pk=course_id).values_list('pk', flat=True))
+
+
+def rebalance(course_id):
+    """Renumber the modules of a course ``STEP`` apart, keeping their current order."""
+    modules = list(Module.objects.filter(course_id=course_id).order_by('order', 'pk').only('pk', 'order'))
+    for index, module in enumerate(modules, start=1):
+        module.order = index * STEP
+    Module.objects.bulk_update(modules, ['order'], batch_size=500)
+    return len(modules)
+
+
+def _between(module, after):
+    """Free order value between ``after`` and its successor, or None if there is no gap."""
+    siblings = Module.objects.filter(course_id=module.course_id).exclude(pk=module.pk)
+    if after is None:
+        low = 0
+        high = siblings.order_by('order', 'pk').values_list('order', flat=True).first()
+    else:
+        low = siblings.filter(pk=after.pk).values_list('order', flat=True).get()
+        # The successor in (order, pk) order, which may share the value of ``after``.
+        high = (
+            siblings.filter(Q(order__gt=low) | Q(order=low, pk__gt=after.pk))
+            .order_by('order', 'pk').values_list('order', flat=True).first()
+        )
+    if high is None:
+        return low + STEP
+    if high - low < 2:
+        return None
+    return (low + high) // 2
@@ -0,0 +1,143 @@
+"""Learner progress computed in a constant number of queries.
+
+``CourseEnrollment.progress`` and ``is_completed`` cost two queries each per
+enrollment. The helpers here let the database count modules and completions
+in the enrollment query itself, and keep the learner's weekly completion
+history in the tiered cache under the ``learner:<id>`` tag, which is
+invalidated whenever the learner completes a module or (un)enrolls.
+
+Completions are written with ``INSERT ... ON CONFLICT DO NOTHING``
+(``bulk_create(ignore_conflicts=True)``), so repeated or concurrent
+submissions of the same module are no-ops instead of ``IntegrityError``.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncWeek
+from django.utils import timezone
+
+from core.cache import tiered_cache
+from core.context import current_author, current_ip
+from .models import CourseEnrollment, Module, ModuleCompletion
+from .signals import invalidate_on_commit
+
+WEEKS = 12
+MAX_BULK_COMPLETIONS = 500
+
+
+def with_progress(queryset):
+    """Annotate enrollments with ``total_modules`` and ``completed_modules``."""
+    total = (
+        Module.objects.filter(course=OuterRef('course'))
+        .order_by().values('course').annotate(n=Count('pk')).values('n')
+    )
+    completed = (
+        ModuleCompletion.objects.filter(user=OuterRef('user'), module__course=OuterRef('course'))
+        .order_by().values('user').annotate(n=Count('pk')).values('n')
+    )
+    return queryset.annotate(
+        total_modules=Coalesce(Subquery(total, output_field=IntegerField()), 0),
+        completed_modules=Coalesce(Subquery(completed, output_field=IntegerField()), 0),
+    )
+
+
+def learner_enrollments(user):
+    """Return the learner's enrollments (one query), each with ``percent`` and ``completed`` set."""
+    enrollments = list(
+        with_progress(CourseEnrollment.objects.filter(user=user))
+        .select_related('course__teacher__user')
+        .order_by('-created_at')
+    )
+    for enrollment in enrollments:
+        total = enrollment.total_modules
+        enrollment.percent = round(enrollment.completed_modules * 100 / total) if total else 0
+        enrollment.completed = bool(total) and enrollment.completed_modules >= total
+    return enrollments
+
+
+def weekly_completions(user, weeks=WEEKS):
+    """Module completions per week over the last ``weeks`` weeks, oldest first."""
+    return tiered_cache.get_or_set(
+        f'learner:{user.pk}:weekly:{weeks}',
+        lambda: _weekly_completions(user, weeks),
+        tags=[f'learner:{user.pk}'],
+    )
+
+
+def _weekly_completions(user, weeks):
+    today = timezone.localdate()
+    monday = today - timedelta(days=today.weekday())
+    labels = [monday - timedelta(weeks=offset) for offset in range(weeks - 1, -1, -1)]
+    counts = (
+        ModuleCompletion.objects
+        .filter(user=user, created_at__date__gte=labels[0])
+        .order_by()
+        .annotate(week=TruncWeek('created_at'))
+        .values_list('week')
+        .annotate(n=Count('pk'))
+    )
+    # TruncWeek yields midnight on Monday in the current time zone.
+    counts = {week.date(): n for week, n in counts}
+    return {
+        'labels': [week.isoformat() for week in labels],
+        'completions': [counts.get(week, 0) for week in labels],
+    }
+
+
+def progress_summary(user):
+    """Serializable progress overview used by the progress API."""
+    enrollments = learner_enrollments(user)
+    return {
+        'courses': [
+            {
+                'id': str(enrollment.course_id),
+                'title': enrollment.course.title,
+                'teacher': enrollment.course.teacher.user.full_name,
+                'enrolled_at': enrollment.created_at.isoformat(),
+                'completed_modules': enrollment.completed_modules,
+                'total_modules': enrollment.total_modules,
+                'percent': enrollment.percent,
+                'completed': enrollment.completed,
+            }
+            for enrollment in enrollments
+        ],
+        'certificates': [str(e.course_id) for e in enrollments if e.completed],
+        'weekly_completions': weekly_completions(user),
+    }
+
+
+def complete_module(user, module_id):
+    """Mark one module complete; idempotent.
+
+    Returns False, writing nothing, unless the module exists and belongs to a
+    course the learner is enrolled in (see ``complete_modules``).
+    """
+    return bool(complete_modules(user, [module_id]))
+
+
+def complete_modules(user, module_ids):
+    """Mark several modules complete at once; idempotent.
+
+    Only modules of courses the learner is enrolled in are accepted. Returns
+    the accepted module ids; the others are ignored.
+    """
+    accepted = list(
+        Module.objects.filter(pk__in=module_ids[:MAX_BULK_COMPLETIONS], course__enrollments__user=user)
+        .values_list('pk', flat=True)
+    )
+    if accepted:
+        with transaction.atomic():
+            _insert_completions(user, accepted)
+    return accepted
+
+
+def _insert_completions(user, module_ids):
+    # bulk_create() bypasses BaseModel.save() and post_save, so fill the
+    # audit fields and invalidate the learner's cached progress here.
+    ip, author = current_ip(), current_author()
+    ModuleCompletion.objects.bulk_create(
+        [ModuleCompletion(user=user, module_id=pk, ip_address=ip, author=author) for pk in module_ids],
+        ignore_conflicts=True,
+    )
+    invalidate_on_commit(f'learner:{user.pk}')
@@ -0,0 +1,218 @@
+"""Incremental daily rollups of course activity for the teacher dashboard.
+
+``update_rollups()`` folds the enrollments and module completions created
+since the last run into ``CourseDailyStats`` / ``ModuleDailyStats`` and moves
+a ``RollupWatermark`` forward, all in one transaction, so each run reads only
+the new rows. Rows younger than ``LAG`` are left for the next run: their
+``created_at`` is set before their transaction commits, so a row may become
+visible slightly after a later one.
+
+Counters are additive, except ``active_learners`` (distinct learners per
+day), which is recounted for the days touched by the run. Rollups are not
+decremented when enrollments or completions are deleted; rebuild them with
+``manage.py update_rollups --backfill``.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import (
+    CourseDailyStats, CourseEnrollment, Module, ModuleCompletion, ModuleDailyStats, RollupWatermark,
+)
+
+WATERMARK = 'course_activity'
+LAG = timedelta(minutes=1)
+STEP = timedelta(days=7)
+
+
+def update_rollups(now=None, step=STEP):
+    """Roll up activity up to ``now - LAG``. Returns the number of rows folded in."""
+    upper = (now or timezone.now()) - LAG
+    lower = last_position()
+    if lower is None:
+        earliest = [
+            value for value in (
+                CourseEnrollment.objects.aggregate(m=Min('created_at'))['m'],
+                ModuleCompletion.objects.aggregate(m=Min('created_at'))['m'],
+            ) if value is not None
+        ]
+        if not earliest:
+            return 0
+        lower = min(earliest) - timedelta(microseconds=1)
+    folded = 0
+    # Large gaps (first run, backfill) are processed in slices, one
+    # transaction each, so memory and lock time stay bounded.
+    while lower < upper:
+        end = min(lower + step, upper)
+        folded += _fold(lower, end)
+        lower = end
+    return folded
+
+
+def rebuild_rollups(now=None, step=STEP):
+    """Drop every rollup and recompute them from the full history."""
+    with transaction.atomic():
+        CourseDailyStats.objects.all().delete()
+        ModuleDailyStats.objects.all().delete()
+        RollupWatermark.objects.filter(name=WATERMARK).delete()
+    return update_rollups(now=now, step=step)
+
+
+def last_position():
+    """Instant up to which activity has been rolled up, or None before the first run."""
+    return RollupWatermark.objects.filter(name=WATERMARK).values_list('position', flat=True).first()
+
+
+def _fold(lower, upper):
+    with transaction.atomic():
+        watermark, created = RollupWatermark.objects.get_or_create(
+            name=WATERMARK, defaults={'position': lower}
+        )
+        if not created:
+            # Serialize concurrent runs; the loser re-reads the position.
+            watermark = RollupWatermark.objects.select_for_update().get(pk=watermark.pk)
+            if watermark.position >= upper:
+                return 0
+            lower = max(lower, watermark.position)
+
+        window = {'created_at__gt': lower, 'created_at__lte': upper}
+        enrollments = (
+            CourseEnrollment.objects.filter(**window).order_by()
+            .annotate(day=TruncDate('created_at'))
+            .values_list('course_id', 'day').annotate(n=Count('pk'))
+        )
+        completions = list(
+            ModuleCompletion.objects.filter(**window).order_by()
+            .annotate(day=TruncDate('created_at'))
+            .values_list('module_id', 'module__course_id', 'day').annotate(n=Count('pk'))
+        )
+
+        course_rows = {}
+        for course_id, day, n in enrollments:
+            course_rows.setdefault((course_id, day), {'enrollments': 0, 'completions': 0})['enrollments'] += n
+        module_rows = {}
+        for module_id, course_id, day, n in completions:
+            module_rows[(module_id, day)] = n
+            course_rows.setdefault((course_id, day), {'enrollments': 0, 'completions': 0})['completions'] += n
+
+        active = _active_learners(completions, upper)
+        _apply(CourseDailyStats, 'course_id', course_rows, active)
+        _apply(ModuleDailyStats, 'module_id', {key: {'completions': n} for key, n in module_rows.items()})
+
+        watermark.position = upper
+        watermark.save(update_fields=['position', 'updated_at'])
+    return sum(n for *_, n in completions) + sum(row['enrollments'] for row in course_rows.values())
+
+
+def _active_learners(completions, upper):
+    """Recount distinct learners for the (course, day) pairs with new completions."""
+    touched = {(course_id, day) for _, course_id, day, _ in completions}
+    if not touched:
+        return {}
+    first_day = min(day for _, day in touched)
+    start = timezone.make_aware(datetime.combine(first_day, time.min), timezone.get_current_timezone())
+    counts = (
+        ModuleCompletion.objects
+        .filter(module__course_id__in={course_id for course_id, _ in touched},
+                created_at__gte=start, created_at__lte=upper)
+        .order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values_list('module__course_id', 'day')
+        .annotate(n=Count('user_id', distinct=True))
+    )
+    return {(course_id, day): n for course_id, day, n in counts if (course_id, day) in touched}
+
+
+def _apply(model, key_field, increments, replacements=None):
+    """Add ``increments`` to existing rollup rows and create the missing ones."""
+    if not increments:
+        return
+    replacements = replacements or {}
+    fields = sorted({field for values in increments.values() for field in values})
+    existing = {
+        (getattr(row, key_field), row.day): row
+        for row in model.objects.filter(**{
+            f'{key_field}__in': {key for key, _ in increments},
+            'day__in': {day for _, day in increments},
+        })
+    }
+    now = timezone.now()
+    changed, new = [], []
+    for key, values in increments.items():
+        row = existing.get(key)
+        if row is None:
+            row = model(**{key_field: key[0], 'day': key[1]})
+            new.append(row)
+        else:
+            row.updated_at = now
+            changed.append(row)
+        for field, n in values.items():
+            setattr(row, field, getattr(row, field) + n)
+        if key in replacements:
+            row.active_learners = replacements[key]
+    if replacements:
+        fields.append('active_learners')
+    model.objects.bulk_update(changed, fields + ['updated_at'], batch_size=500)
+    model.objects.bulk_create(new, batch_size=500)
+
+
+def dashboard_data(course_ids, days=30):
+    """Chart data for the teacher dashboard, read from the rollups only.
+
+    Returns ``{course_id: {...}}`` with daily series for the last ``days``
+    days, all-time totals and a per-module completion funnel. Costs three
+    queries whatever the number of courses.
+    """
+    today = timezone.localdate()
+    labels = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    index = {day: position for position, day in enumerate(labels)}
+    data = {
+        str(course_id): {
+            'labels': [day.isoformat() for day in labels],
+            'enrollments': [0] * days,
+            'completions': [0] * days,
+            'active_learners': [0] * days,
+            'total_enrollments': 0,
+            'funnel': {'labels': [], 'completions': []},
+            'completion_rate': 0,
+        }
+        for course_id in course_ids
+    }
+    rows = CourseDailyStats.objects.filter(course_id__in=course_ids, day__gte=labels[0]).values_list(
+        'course_id', 'day', 'enrollments', 'completions', 'active_learners'
+    )
+    for course_id, day, enrolled, completed, active in rows:
+        entry, position = data[str(course_id)], index.get(day)
+        if position is None:
+            continue
+        entry['enrollments'][position] = enrolled
+        entry['completions'][position] = completed
+        entry['active_learners'][position] = active
+
+    totals = (
+        CourseDailyStats.objects.filter(course_id__in=course_ids).order_by()
+        .values_list('course_id').annotate(n=Sum('enrollments'))
+    )
+    for course_id, n in totals:
+        data[str(course_id)]['total_enrollments'] = n
+
+    funnel = (
+        Module.objects.filter(course_id__in=course_ids)
+        .annotate(total=Coalesce(Sum('daily_stats__completions'), 0))
+        .order_by('course_id', 'order', 'pk')
+        .values_list('course_id', 'title', 'total')
+    )
+    for course_id, title, total in funnel:
+        entry = data[str(course_id)]
+        entry['funnel']['labels'].append(title)
+        entry['funnel']['completions'].append(total)
+    for entry in data.values():
+        steps = entry['funnel']['completions']
+        if steps and entry['total_enrollments']:
+            # Learners who reached the last module, out of everyone enrolled.
+            entry['completion_rate'] = round(steps[-1] * 100 / entry['total_enrollments'], 1)
+    return data
+
@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import tiered_cache
+from users.models import Teacher, User
+from .enrollment import promote_waitlist, release_seat
+from .models import Course, CourseEnrollment, Module, ModuleCompletion, TeacherApplication
+
+
+def invalidate_on_commit(*tags):
+    """Invalidate cache tags once the current transaction commits."""
+    transaction.on_commit(lambda: tiered_cache.invalidate_tags(*tags))
+
+
+@receiver([post_save, post_delete], sender=Course)
+def invalidate_course(sender, instance, **kwargs):
+    invalidate_on_commit(f'course:{instance.pk}', f'teacher:{instance.teacher_id}', 'catalog')
+
+
+@receiver([post_save, post_delete], sender=Module)
+def invalidate_module(sender, instance, **kwargs):
+    invalidate_on_commit(f'course:{instance.course_id}')
+
+
+@receiver([post_save, post_delete], sender=Teacher)
+def invalidate_teacher(sender, instance, **kwargs):
+    invalidate_on_commit(f'teacher:{instance.pk}', 'catalog')
+
+
+# User columns shown with a teacher's courses (catalog cards, course pages).
+TEACHER_DISPLAY_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver(post_save, sender=User)
+def invalidate_teacher_user(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not TEACHER_DISPLAY_FIELDS & set(update_fields)):
+        return  # e.g. last_login on every login
+    teacher_ids = list(Teacher.objects.filter(user_id=instance.pk).values_list('pk', flat=True))
+    if teacher_ids:
+        invalidate_on_commit('catalog', *(f'teacher:{pk}' for pk in teacher_ids))
+
+
+@receiver([post_save, post_delete], sender=CourseEnrollment)
+def invalidate_enrollment(sender, instance, **kwargs):
+    invalidate_on_commit(f'course:{instance.course_id}', f'learner:{instance.user_id}')
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def release_enrollment_seat(sender, instance, **kwargs):
+    release_seat(instance.course_id)
+    transaction.on_commit(lambda: promote_waitlist(instance.course_id))
+
+
+@receiver(post_save, sender=Course)
+def promote_on_capacity_change(sender, instance, created, **kwargs):
+    if not created:
+        # The capacity may have grown; a no-op unless someone is waiting.
+        transaction.on_commit(lambda: promote_waitlist(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=ModuleCompletion)
+def invalidate_module_completion(sender, instance, **kwargs):
+    invalidate_on_commit(f'learner:{instance.user_id}')
+
+
+@receiver([post_save, post_delete], sender=TeacherApplication)
+def invalidate_teacher_application(sender, instance, **kwargs):
+    invalidate_on_commit(f'applications:{instance.user_id}')
@@ -1,6 +1,7 @@
 from django import template
 
 from django import template
+from core.cache import tiered_cache
 from course.models import TeacherApplication
 
 register = template.Library()
@@ -11,12 +12,23 @@ def lookup(dictionary, key):
     return dictionary.get(key)
 
 
+def application_statuses(user):
+    """Statuses of the user's teacher applications, cached until one changes."""
+    if not user.is_authenticated:
+        return frozenset()
+    tag = f'applications:{user.pk}'
+    return tiered_cache.get_or_set(
+        tag,
+        lambda: frozenset(TeacherApplication.objects.filter(user=user).values_list('status', flat=True)),
+        tags=[tag],
+    )
+
 @register.filter
 def has_pending_application(user):
     """Check if the user has a pending teacher application."""
-    return TeacherApplication.objects.filter(user=user, status='pending').exists()
+    return 'pending' in application_statuses(user)
 
 @register.filter
 def has_approved_application(user):
     """Check if the user has an approved teacher application."""
-    return TeacherApplication.objects.filter(user=user, status='approved').exists()
\ No newline at end of file
+    return 'approved' in application_statuses(user)
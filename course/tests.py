@@ -1,3 +1,372 @@
+import json
+from unittest import mock
+
+from django.http import QueryDict
 from django.test import TestCase
+from django.urls import reverse
+
+from core.cache import tiered_cache
+from core.events import activity_log
+from users.models import Teacher, User
+from . import ordering
+from .content import render, sanitize
+from .enrollment import ALREADY_ENROLLED, ENROLLED, WAITLISTED, enroll, waitlist_position
+from .enums import ClassLevel, CourseStatus
+from .jsonl import export_courses, import_courses
+from .models import Course, CourseEnrollment, CourseWaitlistEntry, Module, ModuleCompletion
+from .module_editor import bind_modules, module_page, module_prefix, save_modules
+from .progress import complete_module
+
+
+class CourseTestCase(TestCase):
+    def setUp(self):
+        tiered_cache.clear_local()
+        user = User.objects.create_user('teacher@example.com', 'Teacher', is_active=True)
+        self.teacher = Teacher.objects.create(user=user)
+
+    def make_course(self, **fields):
+        fields = {'title': 'Fractions', 'description': '', 'class_level': ClassLevel.CLASS_6, 'content': '', **fields}
+        return Course.objects.create(teacher=self.teacher, **fields)
+
+    def make_learner(self, name):
+        return User.objects.create_user(f'{name}@example.com', name, is_active=True)
+
+
+class CacheInvalidationTests(CourseTestCase):
+    def test_renaming_a_teacher_invalidates_the_catalog(self):
+        tiered_cache.set('catalog:test', 'cached', tags=['catalog'])
+        user = self.teacher.user
+        user.last_login = None
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=['last_login'])
+        self.assertEqual(tiered_cache.get('catalog:test'), 'cached')
+        user.last_name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertIsNone(tiered_cache.get('catalog:test'))
+
+
+class JsonLinesTests(CourseTestCase):
+    def line(self, **fields):
+        record = {
+            'external_key': 'fractions', 'title': 'Fractions', 'teacher': 'teacher@example.com',
+            'class_level': ClassLevel.CLASS_6,
+        }
+        record.update(fields)
+        return json.dumps(record)
+
+    def test_import_creates_courses_and_modules(self):
+        stats = import_courses([self.line(modules=[{'title': 'One'}, {'title': 'Two', 'order': 5000}])])
+        self.assertEqual((stats['courses'], stats['modules'], stats['errors']), (1, 2, []))
+        course = Course.objects.get(external_key='fractions')
+        self.assertEqual(course.teacher, self.teacher)
+        self.assertEqual(
+            list(course.modules.order_by('order').values_list('title', 'order')),
+            [('One', 1024), ('Two', 5000)],
+        )
+
+    def test_partial_line_keeps_the_other_columns(self):
+        import_courses([self.line(description='Intro', content='Body', status=CourseStatus.PUBLISHED)])
+        import_courses([self.line(title='Fractions II')])
+        course = Course.objects.get(external_key='fractions')
+        self.assertEqual(
+            (course.title, course.description, course.content, course.status),
+            ('Fractions II', 'Intro', 'Body', CourseStatus.PUBLISHED),
+        )
+
+    def test_last_line_wins_for_a_repeated_key(self):
+        stats = import_courses([self.line(title='First'), self.line(title='Second')])
+        self.assertEqual(stats['errors'], [])
+        self.assertEqual(list(Course.objects.values_list('title', flat=True)), ['Second'])
+
+    def test_invalid_lines_are_reported_and_skipped(self):
+        stats = import_courses([
+            '{not json',
+            self.line(class_level='class_99'),
+            self.line(external_key='other', teacher='nobody@example.com'),
+            self.line(),
+        ])
+        self.assertEqual([number for number, _ in stats['errors']], [1, 2, 3])
+        self.assertEqual(stats['courses'], 1)
+
+    def test_export_can_be_imported_back(self):
+        course = self.make_course(content='Body')
+        Module.objects.create(course=course, title='One', description='', content='')
+        lines = list(export_courses())
+        Course.objects.filter(pk=course.pk).update(title='Changed')
+        stats = import_courses(lines)
+        self.assertEqual(stats['errors'], [])
+        course.refresh_from_db()
+        self.assertEqual((course.title, course.external_key), ('Fractions', str(course.pk)))
+        self.assertEqual(course.modules.count(), 1)
+
+
+class CompletionTests(CourseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.module = Module.objects.create(course=self.make_course(), title='One', description='', content='')
+        self.learner = self.make_learner('learner')
+        self.client.force_login(self.learner)
+        # The write-behind thread would insert from outside the test transaction.
+        patcher = mock.patch.object(activity_log, 'enabled', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def completions(self):
+        return ModuleCompletion.objects.filter(user=self.learner).count()
+
+    def test_enrolled_learner_completes_a_module_once(self):
+        CourseEnrollment.objects.create(course=self.module.course, user=self.learner)
+        self.assertTrue(complete_module(self.learner, self.module.pk))
+        self.assertTrue(complete_module(self.learner, self.module.pk))
+        self.assertEqual(self.completions(), 1)
+
+    def test_modules_of_other_courses_are_refused(self):
+        self.assertFalse(complete_module(self.learner, self.module.pk))
+        response = self.client.post(reverse('courses:module_detail', args=[self.module.pk]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.completions(), 0)
+
+    def test_completing_from_the_module_page(self):
+        CourseEnrollment.objects.create(course=self.module.course, user=self.learner)
+        url = reverse('courses:module_detail', args=[self.module.pk])
+        self.assertRedirects(self.client.post(url), url, fetch_redirect_response=False)
+        self.assertEqual(self.completions(), 1)
+
+    def test_bulk_completion_ignores_modules_outside_the_enrollments(self):
+        CourseEnrollment.objects.create(course=self.module.course, user=self.learner)
+        other = Module.objects.create(course=self.make_course(title='Other'), title='X', description='', content='')
+        response = self.client.post(
+            reverse('courses:module_bulk_complete'),
+            json.dumps({'modules': [str(self.module.pk), str(other.pk)]}), content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'completed': [str(self.module.pk)], 'ignored': [str(other.pk)]})
+        self.assertEqual(self.completions(), 1)
+
+class EnrollmentTests(CourseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.course = self.make_course(capacity=2)
+        self.learners = [self.make_learner(f'learner{i}') for i in range(4)]
+
+    def test_seats_are_taken_then_learners_wait(self):
+        results = [enroll(learner, self.course) for learner in self.learners]
+        self.assertEqual(results, [ENROLLED, ENROLLED, WAITLISTED, WAITLISTED])
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.seats_taken, 2)
+        self.assertEqual(self.course.seats_left, 0)
+        self.assertEqual(waitlist_position(self.learners[2], self.course), 1)
+        self.assertEqual(waitlist_position(self.learners[3], self.course), 2)
+        self.assertIsNone(waitlist_position(self.learners[0], self.course))
+
+    def test_enrolling_twice_takes_one_seat(self):
+        enroll(self.learners[0], self.course)
+        self.assertEqual(enroll(self.learners[0], self.course), ALREADY_ENROLLED)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.seats_taken, 1)
+
+    def test_unlimited_course_never_waitlists(self):
+        course = self.make_course(title='Open')
+        self.assertEqual({enroll(learner, course) for learner in self.learners}, {ENROLLED})
+
+    def test_freed_seat_goes_to_the_head_of_the_waitlist(self):
+        for learner in self.learners:
+            enroll(learner, self.course)
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseEnrollment.objects.get(user=self.learners[0], course=self.course).delete()
+        self.assertTrue(CourseEnrollment.objects.filter(user=self.learners[2], course=self.course).exists())
+        self.assertEqual(waitlist_position(self.learners[3], self.course), 1)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.seats_taken, 2)
+
+    def test_raising_the_capacity_promotes_waiting_learners(self):
+        for learner in self.learners:
+            enroll(learner, self.course)
+        self.course.capacity = 10
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.save()
+        self.assertFalse(CourseWaitlistEntry.objects.filter(course=self.course).exists())
+        self.assertEqual(CourseEnrollment.objects.filter(course=self.course).count(), 4)
+
+    def test_saving_a_course_keeps_the_seat_count(self):
+        stale = Course.objects.get(pk=self.course.pk)
+        enroll(self.learners[0], self.course)
+        stale.title = 'Renamed'
+        stale.save()
+        self.course.refresh_from_db()
+        self.assertEqual((self.course.title, self.course.seats_taken), ('Renamed', 1))
+
+    def test_save_is_otherwise_a_plain_save(self):
+        enroll(self.learners[0], self.course)
+        self.course.refresh_from_db()
+        # Naming the counter writes it.
+        self.course.seats_taken = 0
+        self.course.save(update_fields=['seats_taken'])
+        self.assertEqual(Course.objects.get(pk=self.course.pk).seats_taken, 0)
+        # A course whose row is gone is inserted again.
+        Course.objects.filter(pk=self.course.pk).delete()
+        self.course.save()
+        self.assertTrue(Course.objects.filter(pk=self.course.pk).exists())
+
+
+class OrderingTests(CourseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.course = self.make_course()
+        self.modules = [
+            Module.objects.create(course=self.course, title=title, description='', content='')
+            for title in 'ABC'
+        ]
+
+    def titles(self):
+        return list(Module.objects.filter(course=self.course).values_list('title', flat=True))
+
+    def test_new_modules_are_appended_a_step_apart(self):
+        self.assertEqual([module.order for module in self.modules], [1024, 2048, 3072])
+
+    def test_move_rewrites_only_the_moved_module(self):
+        a, b, c = self.modules
+        self.assertEqual(ordering.move_module(c, after=a), 1536)
+        self.assertEqual(self.titles(), ['A', 'C', 'B'])
+        self.assertEqual(ordering.move_module(b), 512)
+        self.assertEqual(self.titles(), ['B', 'A', 'C'])
+        a.refresh_from_db()
+        self.assertEqual(a.order, 1024)
+
+    def test_exhausted_gap_rebalances_the_course(self):
+        a, b, c = self.modules
+        for _ in range(12):
+            ordering.move_module(c, after=a)
+            ordering.move_module(b, after=a)
+        self.assertEqual(self.titles(), ['A', 'B', 'C'])
+        orders = list(Module.objects.filter(course=self.course).order_by('order').values_list('order', flat=True))
+        self.assertEqual(len(set(orders)), 3)
+
+    def test_rebalance_keeps_the_order(self):
+        Module.objects.filter(pk=self.modules[0].pk).update(order=3)
+        Module.objects.filter(pk=self.modules[1].pk).update(order=4)
+        Module.objects.filter(pk=self.modules[2].pk).update(order=2)
+        ordering.rebalance(self.course.pk)
+        self.assertEqual(self.titles(), ['C', 'A', 'B'])
+        self.assertEqual(
+            sorted(Module.objects.filter(course=self.course).values_list('order', flat=True)),
+            [1024, 2048, 3072],
+        )
+
+    def test_modules_of_another_course_are_refused(self):
+        other = Module.objects.create(course=self.make_course(title='Other'), title='X', description='', content='')
+        with self.assertRaises(ValueError):
+            ordering.move_module(other, after=self.modules[0])
+
+    def test_move_next_to_modules_sharing_an_order(self):
+        Module.objects.filter(course=self.course).update(order=1024)
+        first, middle, last = Module.objects.filter(course=self.course)
+        ordering.move_module(last, after=first)
+        self.assertEqual(self.titles(), [first.title, last.title, middle.title])
+        orders = list(Module.objects.filter(course=self.course).values_list('order', flat=True))
+        self.assertEqual(len(set(orders)), 3)
+
+
+class ModuleEditorTests(CourseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.course = self.make_course()
+        self.modules = [
+            Module.objects.create(course=self.course, title=f'Module {i}', description='Old', content='')
+            for i in range(3)
+        ]
+
+    def post_data(self, module, **values):
+        data = QueryDict(mutable=True)
+        data['modules'] = str(module.pk)
+        prefix = module_prefix(module)
+        data.update({f'{prefix}-title': module.title, f'{prefix}-description': module.description})
+        data.update({f'{prefix}-{field}': value for field, value in values.items()})
+        return data
+
+    def test_pages_follow_the_module_order(self):
+        first, has_more = module_page(self.course, limit=2)
+        self.assertEqual(first, self.modules[:2])
+        self.assertTrue(has_more)
+        rest, has_more = module_page(self.course, after=first[-1], limit=2)
+        self.assertEqual(rest, self.modules[2:])
+        self.assertFalse(has_more)
+
+    def test_only_the_changed_columns_are_written(self):
+        module = self.modules[0]
+        forms = bind_modules(self.course, self.post_data(module, title='Renamed'), {})
+        # Changed by someone else since the page was loaded.
+        Module.objects.filter(pk=module.pk).update(description='Edited elsewhere')
+        self.assertTrue(all(form.is_valid() for form in forms))
+        self.assertEqual(save_modules(forms), [module])
+        module.refresh_from_db()
+        self.assertEqual((module.title, module.description), ('Renamed', 'Edited elsewhere'))
+
+    def test_unchanged_forms_are_not_saved(self):
+        forms = bind_modules(self.course, self.post_data(self.modules[0]), {})
+        self.assertTrue(all(form.is_valid() for form in forms))
+        self.assertEqual(save_modules(forms), [])
+
+    def test_modules_of_other_courses_are_ignored(self):
+        other = Module.objects.create(course=self.make_course(title='Other'), title='X', description='', content='')
+        data = self.post_data(other, title='Hijacked')
+        data.appendlist('modules', 'not-a-uuid')
+        self.assertEqual(bind_modules(self.course, data, {}), [])
+
+    def test_new_modules_are_appended(self):
+        data = QueryDict(mutable=True)
+        data.update({'new': '0', 'new-0-title': 'Added', 'new-0-description': 'New'})
+        forms = bind_modules(self.course, data, {})
+        self.assertTrue(all(form.is_valid() for form in forms))
+        module, = save_modules(forms)
+        self.assertEqual((module.course, module.order), (self.course, 4 * ordering.STEP))
+
+
+class ContentTests(TestCase):
+    def test_markdown_and_html_are_rendered(self):
+        self.assertEqual(render('Hello *world*'), ('<p>Hello <em>world</em></p>', 2, 1))
+        self.assertEqual(render('<p>Already HTML</p>')[0], '<p>Already HTML</p>')
+        self.assertEqual(render('  '), ('', 0, 0))
+
+    def test_scripts_and_unknown_markup_are_removed(self):
+        html, words = sanitize('<div onclick="x()"><script>alert(1)</script><blink>Hi</blink> there</div>')
+        self.assertEqual(html, '<div>Hi there</div>')
+        self.assertEqual(words, 2)
+
+    def test_unsafe_urls_are_dropped(self):
+        html, _ = sanitize('<a href=" java\tscript:alert(1)">x</a><img src="data:image/png;base64,AA">')
+        self.assertEqual(html, '<a>x</a><img>')
+
+    def test_links_to_other_sites_get_rel(self):
+        for href in ('https://example.com', 'HTTP://example.com', '//example.com', '/\\example.com'):
+            html, _ = sanitize(f'<a href="{href}">x</a>')
+            self.assertIn('rel="nofollow noopener"', html, href)
+        html, _ = sanitize('<a href="/courses/">x</a>')
+        self.assertNotIn('rel=', html)
+
+    def test_unclosed_tags_are_closed(self):
+        self.assertEqual(sanitize('<p><strong>bold</p></em>')[0], '<p><strong>bold</strong></p>')
+
+    def test_reading_time_rounds_up(self):
+        self.assertEqual(render(' '.join(['word'] * 201))[1:], (201, 2))
+
+
+class RenderedContentTests(CourseTestCase):
+    def test_content_is_rendered_on_save(self):
+        course = self.make_course(content='Some *words*')
+        self.assertEqual((course.content_html, course.word_count), ('<p>Some <em>words</em></p>', 2))
+        Course.objects.filter(pk=course.pk).update(content_html='kept')
+        course.title = 'Renamed'
+        course.save(update_fields=['title'])
+        course.refresh_from_db()
+        self.assertEqual(course.content_html, 'kept')
 
-# Create your tests here.
+    def test_imported_content_is_rendered(self):
+        import_courses([json.dumps({
+            'external_key': 'fractions', 'title': 'Fractions', 'teacher': 'teacher@example.com',
+            'class_level': ClassLevel.CLASS_6, 'content': 'Body',
+            'modules': [{'title': 'One', 'content': 'a b c'}],
+        })])
+        course = Course.objects.get(external_key='fractions')
+        self.assertEqual(course.content_html, '<p>Body</p>')
+        self.assertEqual(course.modules.get().word_count, 3)
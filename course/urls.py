@@ -4,9 +4,12 @@ from course.views.urse_edit_view import CourseEditView
 
 from .views.course_list_view import CourseListView
 from .views.teacher_course_list_view import TeacherCourseListView
+from .views.teacher_enrollment_export_view import TeacherEnrollmentExportView
 from .views.course_detail_view import CourseDetailView, CourseEnrollView, DownloadCertificateView
 
-from .views.module_detail_view import ModuleDetailView
+from .views.module_detail_view import ModuleBulkCompleteView, ModuleDetailView
+from .views.module_forms_view import ModuleFormsView
+from .views.module_reorder_view import ModuleReorderView
 from .views.teacher_application_view import (
     CourseCreateView, TeacherApplicationStep1View, TeacherApplicationStep1QualificationsView,
     TeacherApplicationStep2View, TeacherApplicationConfirmView, TeacherDashboardView
@@ -19,9 +22,12 @@ urlpatterns = [
     path('create-course/', CourseCreateView.as_view(), name='create_course'),
     path('course/<uuid:pk>/', CourseDetailView.as_view(), name='course_detail'),
     path('course/<uuid:pk>/edit/', CourseEditView.as_view(), name='course_edit'),
+    path('course/<uuid:pk>/edit/modules/', ModuleFormsView.as_view(), name='course_edit_modules'),
+    path('course/<uuid:pk>/modules/reorder/', ModuleReorderView.as_view(), name='module_reorder'),
     path('course/<uuid:pk>/enroll/', CourseEnrollView.as_view(), name='course_enroll'),
     path('course/<uuid:pk>/certificate/', DownloadCertificateView.as_view(), name='download_certificate'),
     path('module/<uuid:pk>/', ModuleDetailView.as_view(), name='module_detail'),
+    path('module/complete/', ModuleBulkCompleteView.as_view(), name='module_bulk_complete'),
     path('teacher-application/step1/', TeacherApplicationStep1View.as_view(), name='teacher_application_step1'),
     path('teacher-application/step1/qualifications/', TeacherApplicationStep1QualificationsView.as_view(), name='teacher_application_step1_qualifications'),
     path('teacher-application/step2/', TeacherApplicationStep2View.as_view(), name='teacher_application_step2'),
@@ -29,4 +35,5 @@ urlpatterns = [
     path('teacher-dashboard/', TeacherDashboardView.as_view(), name='teacher_dashboard'),
     path('teacher-courses/', TeacherCourseListView.as_view(), name='teacher_courses'),
     path('teacher-course/<uuid:pk>/', TeacherCourseListView.as_view(), name='teacher_course_detail'),
+    path('teacher-course/<uuid:pk>/enrollments.csv', TeacherEnrollmentExportView.as_view(), name='teacher_enrollment_export'),
 ]
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""Version tokens for the student course pages, for conditional GET.
+
+A page's version is every ``updated_at`` (and row count, so deletions show)
+that its template reads from, gathered by ONE query: the viewer's own user
+row annotated with a scalar subquery per dependency. Each subquery is an
+``ORDER BY ... LIMIT 1`` or ``COUNT(*)`` over an indexed foreign key, so the
+query stays cheap however large the tables grow.
+
+The viewer row also covers the sidebar of ``base_student.html`` (the user's
+name, unread badge and teacher application statuses), which every
+page shares.
+
+The functions are coroutines, for the async page views.
+"""
+from django.db.models import IntegerField, OuterRef, Subquery
+
+from users.models import User
+from .enums import CourseStatus
+from .models import Course, CourseEnrollment, CourseReview, Module, ModuleCompletion, TeacherApplication
+
+
+class SubqueryCount(Subquery):
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = IntegerField()
+
+
+def _latest(queryset, field='updated_at'):
+    return Subquery(queryset.order_by(f'-{field}').values(field)[:1])
+
+
+def _count(queryset):
+    return SubqueryCount(queryset.order_by().values('pk'))
+
+
+async def _page_version(user, **dependencies):
+    """The viewer's row plus ``dependencies``, as a dict; None if the user is gone."""
+    return await (
+        User.objects.filter(pk=user.pk)
+        .values('updated_at', 'unread_messages', 'unread_notifications')
+        .annotate(
+            applications=_latest(TeacherApplication.objects.filter(user=OuterRef('pk'))),
+            application_count=_count(TeacherApplication.objects.filter(user=OuterRef('pk'))),
+            **dependencies,
+        )
+        .afirst()
+    )
+
+
+def _catalog(queryset, prefix):
+    return {
+        prefix: _latest(queryset),
+        f'{prefix}_count': _count(queryset),
+        f'{prefix}_teachers': _latest(queryset, 'teacher__user__updated_at'),
+    }
+
+
+def _enrollments(user):
+    enrollments = CourseEnrollment.objects.filter(user=user)
+    return {'enrollments': _latest(enrollments), 'enrollment_count': _count(enrollments)}
+
+
+async def acourse_list_version(user):
+    """Published catalog, its teachers' names and the viewer's enrollments."""
+    return await _page_version(
+        user,
+        **_catalog(Course.objects.filter(status=CourseStatus.PUBLISHED), 'catalog'),
+        **_enrollments(user),
+    )
+
+
+async def acourse_detail_version(user, course_id):
+    """The course with its teacher, modules and reviews, the viewer's enrollment and
+    completions in it, and the "other courses" column.
+
+    ``enrollment`` is None when the viewer is not enrolled (or the course does
+    not exist); such requests take the normal, uncached path.
+    """
+    modules = Module.objects.filter(course_id=course_id)
+    completions = ModuleCompletion.objects.filter(user=user, module__course_id=course_id)
+    reviews = CourseReview.objects.filter(course_id=course_id)
+    course = Course.objects.filter(pk=course_id)
+    return await _page_version(
+        user,
+        course=_latest(course),
+        teacher=_latest(course, 'teacher__user__updated_at'),
+        enrollment=_latest(CourseEnrollment.objects.filter(user=user, course_id=course_id)),
+        modules=_latest(modules),
+        module_count=_count(modules),
+        completions=_latest(completions, 'created_at'),
+        completion_count=_count(completions),
+        reviews=_latest(reviews),
+        review_count=_count(reviews),
+        **_catalog(Course.objects.filter(is_public=True, status=CourseStatus.PUBLISHED), 'others'),
+        **_enrollments(user),
+    )
+
+
+async def amodule_detail_version(user, module_id):
+    """The module and whether the viewer completed it; ``module`` is None if it does not exist."""
+    return await _page_version(
+        user,
+        module=_latest(Module.objects.filter(pk=module_id)),
+        completion=_latest(ModuleCompletion.objects.filter(user=user, module_id=module_id), 'created_at'),
+    )
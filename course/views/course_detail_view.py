@@ -1,48 +1,78 @@
-from django.views.generic import DetailView, View
+import asyncio
+from functools import partial
+
+from django.views.generic import View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.urls import reverse_lazy
+from django.contrib import messages
+from course.enrollment import ENROLLED, WAITLISTED, enroll, waitlist_position
 from course.models import Course, CourseEnrollment, ModuleCompletion
+from course.versions import acourse_detail_version
+from core.db.aio import alist, aset
+from core.enums import ActivityKind
+from core.http import aconditional_page, auser
+from core.events import activity_log
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 from django.http import HttpResponse
 import io
 
-class CourseDetailView(DetailView):
-    model = Course
+class CourseDetailView(View):
     template_name = 'users/student/course/course_detail.html'
-    context_object_name = 'course'
 
-    def get(self, request, *args, **kwargs):
-        self.object = self.get_object()
-        if not request.user.is_authenticated:
+    async def get(self, request, pk):
+        user = await auser(request)
+        if not user.is_authenticated:
+            await aget_object_or_404(Course, pk=pk)
             return redirect(f"{reverse_lazy('users:login')}?next={request.path}")
-        if not CourseEnrollment.objects.filter(user=request.user, course=self.object).exists():
+        version = await acourse_detail_version(user, pk)
+        if version is None or version['enrollment'] is None:
+            await aget_object_or_404(Course, pk=pk)
             return redirect('courses:course_list')  # Redirect non-enrolled users
-        return super().get(request, *args, **kwargs)
+        return await aconditional_page(request, version, partial(self.render, request, user, pk))
+
+    async def render(self, request, user, pk):
+        course, other_courses, completed, enrolled = await asyncio.gather(
+            Course.objects.select_related('teacher__user').prefetch_related('modules', 'reviews__user').aget(pk=pk),
+            alist(Course.objects.filter(
+                is_public=True, status='published'
+            ).exclude(id=pk).select_related('teacher__user')[:3]),
+            aset(ModuleCompletion.objects.filter(
+                user=user, module__course_id=pk
+            ).values_list('module_id', flat=True)),
+            aset(CourseEnrollment.objects.filter(user=user).values_list('course_id', flat=True)),
+        )
+        modules = course.modules.all()
+        return TemplateResponse(request, self.template_name, {
+            'course': course,
+            'object': course,
+            'other_courses': other_courses,
+            'enrolled_course_ids': enrolled,
+            'is_enrolled': True,  # User must be enrolled to reach this point
+            # CourseEnrollment.is_completed, from the rows already loaded.
+            'can_download_certificate': bool(modules) and len(completed) == len(modules),
+            'module_completions': {module.id: module.id in completed for module in modules},
+        })
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['other_courses'] = Course.objects.filter(
-            is_public=True, status='published'
-        ).exclude(id=self.object.id)[:3]
-        context['is_enrolled'] = True  # User must be enrolled to reach this point
-        context['can_download_certificate'] = CourseEnrollment.objects.get(
-            user=self.request.user, course=self.object
-        ).is_completed
-        # Add module completion status
-        context['module_completions'] = {
-            module.id: ModuleCompletion.objects.filter(
-                user=self.request.user, module=module
-            ).exists() for module in self.object.modules.all()
-        }
-        return context
 
 class CourseEnrollView(LoginRequiredMixin, View):
     def post(self, request, pk):
         course = get_object_or_404(Course, pk=pk)
-        CourseEnrollment.objects.get_or_create(user=request.user, course=course)
+        outcome = enroll(request.user, course)
+        if outcome == ENROLLED:
+            activity_log.record(ActivityKind.ENROLL, target=course)
+        elif outcome == WAITLISTED:
+            position = waitlist_position(request.user, course)
+            messages.info(
+                request,
+                f"Ce cours est complet. Vous êtes sur la liste d'attente (position {position}) "
+                f"et serez inscrit automatiquement dès qu'une place se libère.",
+                extra_tags='toast-info',
+            )
+            return redirect('courses:course_list')
         return redirect('courses:course_detail', pk=pk)
 
 class DownloadCertificateView(LoginRequiredMixin, View):
@@ -69,6 +99,7 @@ class DownloadCertificateView(LoginRequiredMixin, View):
         story.append(Paragraph(f"Enseignant: {course.teacher.user.full_name}", styles['Normal']))
 
         doc.build(story)
+        activity_log.record(ActivityKind.CERTIFICATE_DOWNLOAD, target=course)
         buffer.seek(0)
         response = HttpResponse(content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="certificate_{course.title}.pdf"'
@@ -1,9 +1,46 @@
-from django.views.generic import ListView
-from course.models import Course
+import asyncio
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.template.response import TemplateResponse
+from django.views import View
+from core.cache import tiered_cache
+from core.db.aio import aset
+from core.http import aconditional_page, auser
+from course.models import Course, CourseEnrollment
 from course.enums import CourseStatus
+from course.versions import acourse_list_version
+
+
+def published_courses():
+    """Published courses, cached until any course or teacher changes."""
+    return tiered_cache.get_or_set(
+        'catalog:published',
+        lambda: list(Course.objects.filter(status=CourseStatus.PUBLISHED).select_related('teacher__user')),
+        tags=['catalog'],
+    )
+
 
-class CourseListView(ListView):
-    model = Course
+class CourseListView(View):
     template_name = 'users/student/course/course_list.html'
-    context_object_name = 'courses'
-    queryset = Course.objects.filter(status=CourseStatus.PUBLISHED)
\ No newline at end of file
+
+    async def get(self, request, *args, **kwargs):
+        user = await auser(request)
+        version = await acourse_list_version(user) if user.is_authenticated else None
+        return await aconditional_page(request, version, partial(self.render, request, user))
+
+    async def render(self, request, user):
+        courses, enrolled = await asyncio.gather(
+            sync_to_async(published_courses)(),
+            enrolled_course_ids(user),
+        )
+        return TemplateResponse(request, self.template_name, {
+            'courses': courses,
+            'enrolled_course_ids': enrolled,
+        })
+
+
+async def enrolled_course_ids(user):
+    if not user.is_authenticated:
+        return set()
+    return await aset(CourseEnrollment.objects.filter(user=user).values_list('course_id', flat=True))
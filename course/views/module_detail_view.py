@@ -1,21 +1,76 @@
-from django.views.generic import DetailView
+import json
+import uuid
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.views.generic import View
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
+from django.db.models import Exists, OuterRef
+from django.http import Http404, JsonResponse
+from django.template.response import TemplateResponse
 from course.models import Module, ModuleCompletion
+from course.progress import MAX_BULK_COMPLETIONS, complete_module, complete_modules
+from course.versions import amodule_detail_version
 from django.shortcuts import redirect
+from core.enums import ActivityKind
+from core.events import activity_log
+from core.http import aconditional_page, auser
 
-class ModuleDetailView(LoginRequiredMixin, DetailView):
-    model = Module
+class ModuleDetailView(View):
     template_name = 'users/student/course/module_detail.html'
-    context_object_name = 'module'
-
-    def post(self, request, *args, **kwargs):
-        module = self.get_object()
-        ModuleCompletion.objects.get_or_create(user=request.user, module=module)
-        return redirect('courses:module_detail', pk=module.id)
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['is_completed'] = ModuleCompletion.objects.filter(
-            user=self.request.user, module=self.object
-        ).exists()
-        return context
\ No newline at end of file
+
+    async def get(self, request, pk):
+        user = await auser(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        version = await amodule_detail_version(user, pk)
+        if version is None or version['module'] is None:
+            raise Http404("Module introuvable.")
+        return await aconditional_page(request, version, partial(self.render, request, user, pk))
+
+    async def render(self, request, user, pk):
+        # content_html is rendered and sanitized on save (course.content).
+        module = await Module.objects.defer('content').annotate(is_completed=Exists(
+            ModuleCompletion.objects.filter(user=user, module=OuterRef('pk'))
+        )).aget(pk=pk)
+        return TemplateResponse(request, self.template_name, {
+            'module': module,
+            'object': module,
+            'is_completed': module.is_completed,
+        })
+
+    async def post(self, request, pk):
+        user = await auser(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        if not await sync_to_async(complete_module)(user, pk):
+            raise Http404("Module introuvable.")
+        activity_log.record(ActivityKind.MODULE_COMPLETE, target=Module(pk=pk))
+        return redirect('courses:module_detail', pk=pk)
+
+class ModuleBulkCompleteView(LoginRequiredMixin, View):
+    """Mark several modules complete at once, e.g. when a client syncs offline progress.
+
+    Expects a JSON body ``{"modules": ["<uuid>", ...]}``.
+    """
+
+    def post(self, request):
+        try:
+            module_ids = json.loads(request.body)['modules']
+            if not isinstance(module_ids, list) or len(module_ids) > MAX_BULK_COMPLETIONS:
+                raise ValueError
+            module_ids = [str(uuid.UUID(str(pk))) for pk in module_ids]
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse(
+                {'error': f"Expected {{\"modules\": [...]}} with at most {MAX_BULK_COMPLETIONS} ids."},
+                status=400,
+            )
+        accepted = complete_modules(request.user, module_ids)
+        for pk in accepted:
+            activity_log.record(ActivityKind.MODULE_COMPLETE, target=Module(pk=pk))
+        accepted = {str(pk) for pk in accepted}
+        return JsonResponse({
+            'completed': sorted(accepted),
+            'ignored': [pk for pk in module_ids if pk not in accepted],
+        })
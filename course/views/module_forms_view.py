@@ -0,0 +1,32 @@
+import uuid
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import get_object_or_404, render
+from django.views import View
+
+from course.models import Course, Module
+from course.module_editor import module_forms, module_page
+
+
+class ModuleFormsView(LoginRequiredMixin, View):
+    """Next page of module forms for the course editor (HTML fragment).
+
+    ``after`` is the id of the last module shown; without it the first page
+    is returned.
+    """
+    template_name = 'users/teacher/module_forms.html'
+
+    def get(self, request, pk):
+        course = get_object_or_404(Course, pk=pk, teacher__user=request.user)
+        after = None
+        try:
+            after_id = uuid.UUID(request.GET['after']) if request.GET.get('after') else None
+        except ValueError:
+            after_id = None
+        if after_id is not None:
+            after = get_object_or_404(Module.objects.only('pk', 'order'), course=course, pk=after_id)
+        modules, has_more = module_page(course, after)
+        return render(request, self.template_name, {
+            'module_forms': module_forms(modules),
+            'has_more_modules': has_more,
+        })
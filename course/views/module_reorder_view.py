@@ -0,0 +1,32 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from core.http import json_response
+from course.models import Course, Module
+from course.ordering import move_module
+
+
+class ModuleReorderView(LoginRequiredMixin, View):
+    """Move one module of the teacher's course (drag and drop in the course editor).
+
+    POST ``module`` and ``after``, the id of the module it now follows
+    (empty to move it to the top). Only the moved module is written.
+    """
+
+    def post(self, request, pk):
+        course = get_object_or_404(Course, pk=pk, teacher__user=request.user)
+        module = self.get_module(course, request.POST.get('module'))
+        after = self.get_module(course, request.POST['after']) if request.POST.get('after') else None
+        if after is not None and after.pk == module.pk:
+            return json_response({'error': "A module cannot follow itself."}, status=400)
+        order = move_module(module, after)
+        return json_response({'module': module.pk, 'order': order})
+
+    def get_module(self, course, pk):
+        try:
+            return get_object_or_404(Module.objects.only('pk', 'course_id', 'order'), course=course, pk=pk)
+        except ValidationError:
+            raise Http404
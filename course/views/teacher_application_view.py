@@ -5,8 +5,10 @@ from django.urls import reverse_lazy
 from django.http import JsonResponse
 from django.contrib import messages
 from ..models import TeacherApplication, Qualification, Course
+from ..rollups import dashboard_data, last_position
 from ..forms import QualificationForm, TeacherApplicationStep1Form, TeacherApplicationStep2Form, CourseForm, ModuleFormSet
 from users.models import Teacher
+from core.cache import tiered_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -157,7 +159,14 @@ class TeacherDashboardView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['courses'] = self.request.user.teacher_profile.courses.all()
+        teacher = self.request.user.teacher_profile
+        context['courses'] = tiered_cache.get_or_set(
+            f'teacher:{teacher.pk}:courses',
+            lambda: list(teacher.courses.all()),
+            tags=[f'teacher:{teacher.pk}'],
+        )
+        context['analytics'] = dashboard_data([course.pk for course in context['courses']])
+        context['analytics_updated_at'] = last_position()
         return context
 
 class CourseCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
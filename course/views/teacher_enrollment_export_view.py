@@ -0,0 +1,16 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import get_object_or_404
+from django.views.generic import View
+from django.utils.text import slugify
+from course.exports import stream_enrollments_csv
+from course.models import Course, CourseEnrollment
+
+class TeacherEnrollmentExportView(LoginRequiredMixin, View):
+    """Download the enrollments and progress of one of the teacher's courses as CSV."""
+
+    def get(self, request, pk):
+        course = get_object_or_404(Course, pk=pk, teacher__user=request.user)
+        return stream_enrollments_csv(
+            CourseEnrollment.objects.filter(course=course),
+            f"inscriptions-{slugify(course.title) or course.pk}.csv",
+        )
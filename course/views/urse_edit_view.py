@@ -1,11 +1,15 @@
 from django.views.generic import UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import transaction
+from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.contrib import messages
 from course.models import Course
-from course.forms import CourseForm, ModuleFormSet
+from course.forms import CourseForm
+from course.module_editor import bind_modules, module_forms, module_page, new_module_form, save_modules
 
 class CourseEditView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+    """Edit a course and, page by page, its modules (see course.module_editor)."""
     model = Course
     form_class = CourseForm
     template_name = 'users/teacher/edit_course.html'
@@ -14,30 +18,41 @@ class CourseEditView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     def test_func(self):
         """Restrict access to active teachers who own the course."""
         course = self.get_object()
-        return (hasattr(self.request.user, 'teacher_profile') and 
-                self.request.user.teacher_profile.is_active and 
+        return (hasattr(self.request.user, 'teacher_profile') and
+                self.request.user.teacher_profile.is_active and
                 course.teacher == self.request.user.teacher_profile)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        if self.request.POST:
-            context['module_formset'] = ModuleFormSet(self.request.POST, self.request.FILES, instance=self.object)
-        else:
-            context['module_formset'] = ModuleFormSet(instance=self.object)
+        if 'module_forms' not in kwargs:
+            modules, has_more = module_page(self.object)
+            context['module_forms'] = module_forms(modules)
+            context['has_more_modules'] = has_more
+            context['modules_after'] = modules[-1].pk if modules else ''
+        context['empty_module_forms'] = [new_module_form()]
         return context
 
     def form_valid(self, form):
-        """Save the course and associated modules."""
-        context = self.get_context_data()
-        module_formset = context['module_formset']
-        if module_formset.is_valid():
-            self.object = form.save()
-            module_formset.instance = self.object
-            module_formset.save()
-            messages.success(self.request, "Cours mis à jour avec succès !", extra_tags='toast-success')
-            return super().form_valid(form)
-        return self.form_invalid(form)
+        """Save the course if it changed and the modules that were edited."""
+        forms = [module_form for module_form in bind_modules(self.object, self.request.POST, self.request.FILES)
+                 if module_form.has_changed()]
+        if not all([module_form.is_valid() for module_form in forms]):
+            return self.form_invalid(form, forms)
+        with transaction.atomic():
+            if form.has_changed():
+                self.object = form.save()
+            save_modules(forms)
+        messages.success(self.request, "Cours mis à jour avec succès !", extra_tags='toast-success')
+        # Not super().form_valid(), which would save the course again.
+        return HttpResponseRedirect(self.get_success_url())
 
-    def form_invalid(self, form):
+    def form_invalid(self, form, edited=None):
         messages.error(self.request, "Veuillez corriger les erreurs dans le formulaire.", extra_tags='toast-error')
-        return super().form_invalid(form)
\ No newline at end of file
+        if edited is None:
+            edited = [module_form for module_form in bind_modules(self.object, self.request.POST, self.request.FILES)
+                      if module_form.has_changed()]
+        # The edited modules come back with their errors; the others can be
+        # loaded again (already shown ones are skipped).
+        return self.render_to_response(self.get_context_data(
+            form=form, module_forms=edited, has_more_modules=self.object.modules.exists(),
+        ))
@@ -0,0 +1,41 @@
+from django.contrib import admin
+
+from .models import Announcement, Conversation, Message, Participant
+
+
+class ParticipantInline(admin.TabularInline):
+    model = Participant
+    fields = ('user', 'unread_count', 'last_message_at', 'last_read_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ('course', 'student', 'teacher', 'last_message_at')
+    search_fields = ('student__email', 'teacher__email', 'course__title')
+    list_select_related = ('course', 'student', 'teacher')
+    raw_id_fields = ('course', 'student', 'teacher')
+    inlines = [ParticipantInline]
+
+
+@admin.register(Message)
+class MessageAdmin(admin.ModelAdmin):
+    list_display = ('conversation', 'sender', 'created_at')
+    search_fields = ('sender__email', 'body')
+    list_select_related = ('sender',)
+    raw_id_fields = ('conversation', 'sender')
+
+
+@admin.register(Announcement)
+class AnnouncementAdmin(admin.ModelAdmin):
+    list_display = ('title', 'course', 'recipients', 'email_status', 'emails_sent', 'emails_failed', 'created_at')
+    list_filter = ('email_status',)
+    search_fields = ('title', 'course__title')
+    list_select_related = ('course',)
+    raw_id_fields = ('course', 'sender')
+    readonly_fields = (
+        'recipients', 'email_status', 'emails_sent', 'emails_failed', 'email_cursor',
+        'lease_expires_at', 'emails_finished_at',
+    )
@@ -0,0 +1,198 @@
+"""Course announcements: in-app notifications plus a background e-mail fan-out.
+
+``announce`` runs in the teacher's request and does not send e-mail. In
+one transaction it inserts the announcement, one ``Notification`` per
+enrolled learner (``bulk_create``) and increments every recipient's
+``User.unread_notifications`` with a single UPDATE.
+
+The e-mails are sent by ``manage.py send_announcements`` (cron, or
+``--interval``), which calls ``deliver_pending``:
+
+* A worker claims an announcement with a conditional UPDATE that sets
+  ``lease_expires_at``. Announcements whose lease ran out (the worker
+  crashed) can be claimed again, so several workers never send the same
+  announcement at once.
+* Recipients are read in ``BATCH_SIZE`` pages of notifications, by
+  primary key after ``email_cursor``. Each page goes out with ONE
+  ``send_messages()`` call, over a single SMTP connection kept open for
+  the whole announcement.
+* Batches are spaced to stay under ``RATE_PER_MINUTE``, the provider's limit.
+* After each batch the cursor and the sent/failed counters are saved,
+  and the lease is extended, all in one UPDATE. That UPDATE is
+  conditional on the lease value this worker set. If another worker has
+  taken over, the update matches no row and this worker stops.
+
+A crash therefore resends at most the batch in flight (at-least-once
+delivery). The counters are the progress shown to the teacher.
+"""
+import logging
+import smtplib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.urls import reverse
+from django.utils import timezone
+
+from core.http import encode_cursor
+from course.models import CourseEnrollment
+from users.models import User
+from .enums import DeliveryStatus
+from .inbox import audited
+from .models import Announcement, Notification
+
+logger = logging.getLogger(__name__)
+
+_options = getattr(settings, 'ANNOUNCEMENTS', {})
+BATCH_SIZE = _options.get('BATCH_SIZE', 50)
+RATE_PER_MINUTE = _options.get('RATE_PER_MINUTE', 60)
+LEASE = timedelta(seconds=_options.get('LEASE_SECONDS', 300))
+MAX_RETRIES = _options.get('MAX_RETRIES', 3)
+SITE_URL = _options.get('SITE_URL', '').rstrip('/')
+NOTIFICATIONS_PAGE_SIZE = 20
+
+
+def announce(course, sender, title, body):
+    """Publish an announcement to the learners enrolled in ``course``; returns it."""
+    url = reverse('courses:course_detail', args=[course.pk])
+    user_ids = list(CourseEnrollment.objects.filter(course=course).values_list('user_id', flat=True))
+    with transaction.atomic():
+        announcement = Announcement.objects.create(
+            course=course, sender=sender, title=title, body=body, recipients=len(user_ids),
+            email_status=DeliveryStatus.PENDING if user_ids else DeliveryStatus.DONE,
+        )
+        Notification.objects.bulk_create([
+            audited(Notification(user_id=user_id, announcement=announcement, title=title, url=url))
+            for user_id in user_ids
+        ], batch_size=1000)
+        User.objects.filter(
+            pk__in=Notification.objects.filter(announcement=announcement).values('user_id'),
+        ).update(unread_notifications=F('unread_notifications') + 1)
+    return announcement
+
+
+def mark_notifications_read(user):
+    """Mark all of ``user``'s notifications read; returns how many were unread."""
+    with transaction.atomic():
+        read = Notification.objects.filter(user=user, read_at__isnull=True).update(read_at=timezone.now())
+        if read:
+            User.objects.filter(pk=user.pk).update(
+                unread_notifications=Greatest(F('unread_notifications') - read, 0),
+            )
+    return read
+
+
+def notifications_page(user, cursor=None, limit=NOTIFICATIONS_PAGE_SIZE):
+    """``(notifications, next_cursor)``: a page of ``user``'s notifications, newest first."""
+    queryset = Notification.objects.filter(user=user)
+    if cursor:
+        position, pk = cursor
+        queryset = queryset.filter(Q(created_at__lt=position) | Q(created_at=position, pk__lt=pk))
+    rows = list(queryset.order_by('-created_at', '-pk')[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].pk) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+class Throttle:
+    """Spaces out sends so that at most ``per_minute`` messages go out per minute."""
+
+    def __init__(self, per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60 / per_minute if per_minute else 0
+        self.clock = clock
+        self.sleep = sleep
+        self.next_at = None
+
+    def wait(self, count):
+        """Block until ``count`` more messages may be sent."""
+        if not self.interval:
+            return
+        now = self.clock()
+        if self.next_at is not None and self.next_at > now:
+            self.sleep(self.next_at - now)
+            now = self.next_at
+        self.next_at = now + count * self.interval
+
+
+def claim():
+    """Take the lease on the oldest announcement with e-mails to send; None if there is none."""
+    now = timezone.now()
+    claimable = Q(email_status=DeliveryStatus.PENDING) | Q(email_status=DeliveryStatus.SENDING, lease_expires_at__lt=now)
+    for pk in Announcement.objects.filter(claimable).order_by('created_at').values_list('pk', flat=True)[:10]:
+        lease = now + LEASE
+        if Announcement.objects.filter(claimable, pk=pk).update(
+            email_status=DeliveryStatus.SENDING, lease_expires_at=lease,
+        ):
+            return Announcement.objects.select_related('course').get(pk=pk)
+    return None
+
+
+def deliver(announcement, connection=None, throttle=None):
+    """Send the remaining e-mails of a claimed ``announcement``.
+
+    Returns False if the lease was lost to another worker, True otherwise.
+    """
+    throttle = throttle or Throttle(RATE_PER_MINUTE)
+    connection = connection or get_connection()
+    lease = announcement.lease_expires_at
+    cursor = announcement.email_cursor
+    notifications = (
+        Notification.objects.filter(announcement=announcement)
+        .select_related('user').only('pk', 'user__email', 'user__first_name', 'user__last_name')
+        .order_by('pk')
+    )
+    with connection:
+        while True:
+            batch = list((notifications.filter(pk__gt=cursor) if cursor else notifications)[:BATCH_SIZE])
+            if not batch:
+                break
+            throttle.wait(len(batch))
+            sent = _send(
+                connection, [_email(announcement, notification.user) for notification in batch], throttle.sleep,
+            )
+            cursor = batch[-1].pk
+            new_lease = timezone.now() + LEASE
+            if not Announcement.objects.filter(pk=announcement.pk, lease_expires_at=lease).update(
+                email_cursor=cursor, emails_sent=F('emails_sent') + sent,
+                emails_failed=F('emails_failed') + len(batch) - sent, lease_expires_at=new_lease,
+            ):
+                logger.warning("Lost the lease on announcement %s; another worker took over.", announcement.pk)
+                return False
+            lease = new_lease
+    Announcement.objects.filter(pk=announcement.pk, lease_expires_at=lease).update(
+        email_status=DeliveryStatus.DONE, lease_expires_at=None, emails_finished_at=timezone.now(),
+    )
+    return True
+
+
+def deliver_pending(connection=None, throttle=None):
+    """Deliver announcements until none is left to claim; returns how many were completed."""
+    throttle = throttle or Throttle(RATE_PER_MINUTE)
+    completed = 0
+    while (announcement := claim()) is not None:
+        completed += deliver(announcement, connection=connection, throttle=throttle)
+    return completed
+
+
+def _email(announcement, user):
+    course = announcement.course
+    link = f"{SITE_URL}{reverse('courses:course_detail', args=[course.pk])}"
+    body = f"Bonjour {user.full_name},\n\n{announcement.body}\n\n{course.title} : {link}\n"
+    return EmailMessage(f"[{course.title}] {announcement.title}", body, to=[user.email])
+
+
+def _send(connection, messages, sleep=time.sleep):
+    """Send ``messages`` in one call, retrying on transport errors; returns the number sent."""
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            connection.open()  # no-op while the connection is up
+            return connection.send_messages(messages) or 0
+        except (smtplib.SMTPException, OSError) as exc:
+            logger.warning("Sending %d e-mails failed (attempt %d/%d): %s", len(messages), attempt, MAX_RETRIES, exc)
+            connection.close()
+            if attempt < MAX_RETRIES:
+                sleep(2 ** attempt)
+    return 0
@@ -0,0 +1,8 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class DeliveryStatus(models.TextChoices):
+    PENDING = 'pending', _('Pending')
+    SENDING = 'sending', _('Sending')
+    DONE = 'done', _('Done')
@@ -0,0 +1,39 @@
+from django import forms
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from .models import Announcement, Conversation
+
+
+class MessageForm(forms.Form):
+    body = forms.CharField(
+        max_length=5000,
+        label=_('Message'),
+        widget=forms.Textarea(attrs={'rows': 3, 'class': 'form-control', 'placeholder': 'Votre message...'}),
+    )
+
+
+class BulkReplyForm(MessageForm):
+    """One message sent to every checked conversation of the inbox."""
+    conversations = forms.ModelMultipleChoiceField(
+        queryset=Conversation.objects.none(),
+        label=_('Conversations'),
+    )
+
+    def __init__(self, user, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['conversations'].queryset = Conversation.objects.filter(Q(student=user) | Q(teacher=user))
+
+
+class AnnouncementForm(forms.ModelForm):
+    class Meta:
+        model = Announcement
+        fields = ['title', 'body']
+        widgets = {
+            'title': forms.TextInput(attrs={'class': 'form-control'}),
+            'body': forms.Textarea(attrs={'rows': 5, 'class': 'form-control'}),
+        }
+        labels = {
+            'title': _('Title'),
+            'body': _('Message'),
+        }
@@ -0,0 +1,185 @@
+"""Conversations between learners and the teachers of their courses.
+
+Unread counts are counters, never ``COUNT`` queries. Each ``Participant``
+row holds the unread count of one side of a conversation, and
+``User.unread_messages`` their total, so the sidebar badge reads a column of
+the ``request.user`` row that is loaded anyway.
+
+``send_messages`` posts the same text to any number of conversations (a
+teacher answering many learners at once) in a constant number of queries:
+one bulk INSERT of the messages and one UPDATE per counter, in a single
+transaction. Opening a conversation resets its count with a conditional
+UPDATE (``WHERE unread_count = <the value read>``) and takes the same
+amount off the user's total, so a message arriving in between is never
+lost from either counter. ``recount_unread`` rebuilds every counter
+(including ``User.unread_notifications``) should they ever drift.
+
+Inbox and thread pages are keyset-paginated on ``(last_message_at, id)`` and
+``(created_at, id)``, each read by one range scan of a composite index.
+"""
+from collections import Counter, defaultdict
+
+from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from core.context import current_author, current_ip
+from core.http import encode_cursor
+from course.models import CourseEnrollment
+from users.models import User
+from .models import Conversation, Message, Notification, Participant
+
+INBOX_PAGE_SIZE = 20
+THREAD_PAGE_SIZE = 50
+PREVIEW_LENGTH = 120
+
+
+def start_conversation(course, student):
+    """The conversation between ``student`` and the teacher of ``course``, created if needed.
+
+    Raises PermissionDenied unless the student is enrolled in the course.
+    """
+    teacher_id = course.teacher.user_id
+    if student.pk == teacher_id or not CourseEnrollment.objects.filter(course=course, user=student).exists():
+        raise PermissionDenied
+    conversation = Conversation.objects.filter(course=course, student=student).first()
+    if conversation is not None:
+        return conversation
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            conversation = Conversation.objects.create(
+                course=course, student=student, teacher_id=teacher_id, last_message_at=now,
+            )
+            Participant.objects.bulk_create([
+                audited(Participant(conversation=conversation, user_id=user_id, last_message_at=now))
+                for user_id in (student.pk, teacher_id)
+            ])
+    except IntegrityError:
+        # Started concurrently by the other party.
+        conversation = Conversation.objects.get(course=course, student=student)
+    return conversation
+
+
+def send_message(sender, conversation, body):
+    return send_messages(sender, [conversation], body)[0]
+
+
+def send_messages(sender, conversations, body):
+    """Post ``body`` from ``sender`` to each of ``conversations``; returns the messages."""
+    conversations = list(conversations)
+    if not conversations:
+        return []
+    recipients = Counter()
+    for conversation in conversations:
+        if sender.pk == conversation.student_id:
+            recipients[conversation.teacher_id] += 1
+        elif sender.pk == conversation.teacher_id:
+            recipients[conversation.student_id] += 1
+        else:
+            raise PermissionDenied
+    # A learner in several of the teacher's courses gets several messages:
+    # one UPDATE per distinct increment, usually a single one.
+    increments = defaultdict(list)
+    for user_id, count in recipients.items():
+        increments[count].append(user_id)
+
+    now = timezone.now()
+    ids = [conversation.pk for conversation in conversations]
+    messages = [
+        audited(Message(conversation=conversation, sender=sender, body=body))
+        for conversation in conversations
+    ]
+    with transaction.atomic():
+        Message.objects.bulk_create(messages)
+        Conversation.objects.filter(pk__in=ids).update(
+            last_message=Truncator(body).chars(PREVIEW_LENGTH), last_message_at=now, updated_at=now,
+        )
+        Participant.objects.filter(conversation_id__in=ids, user=sender).update(last_message_at=now)
+        Participant.objects.filter(conversation_id__in=ids).exclude(user=sender).update(
+            last_message_at=now, unread_count=F('unread_count') + 1,
+        )
+        for count, user_ids in increments.items():
+            User.objects.filter(pk__in=user_ids).update(unread_messages=F('unread_messages') + count)
+    return messages
+
+
+def mark_read(participant):
+    """Reset the unread count of ``participant``; returns the number of messages marked read."""
+    while participant.unread_count:
+        count = participant.unread_count
+        with transaction.atomic():
+            if Participant.objects.filter(pk=participant.pk, unread_count=count).update(
+                unread_count=0, last_read_at=timezone.now(),
+            ):
+                User.objects.filter(pk=participant.user_id).update(
+                    unread_messages=Greatest(F('unread_messages') - count, 0),
+                )
+                participant.unread_count = 0
+                return count
+        # A message arrived since the row was read: try again with the new count.
+        participant.unread_count = Participant.objects.values_list('unread_count', flat=True).get(pk=participant.pk)
+    return 0
+
+
+def inbox_page(user, cursor=None, limit=INBOX_PAGE_SIZE):
+    """``(participants, next_cursor)``: a page of ``user``'s conversations, latest activity first."""
+    queryset = Participant.objects.filter(user=user).select_related(
+        'conversation__course', 'conversation__student', 'conversation__teacher',
+    )
+    if cursor:
+        position, pk = cursor
+        queryset = queryset.filter(Q(last_message_at__lt=position) | Q(last_message_at=position, pk__lt=pk))
+    rows = list(queryset.order_by('-last_message_at', '-pk')[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1].last_message_at, rows[limit - 1].pk) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def thread_page(conversation, cursor=None, limit=THREAD_PAGE_SIZE):
+    """``(messages, next_cursor)``: a page of messages, newest first; the cursor leads to older ones."""
+    queryset = Message.objects.filter(conversation=conversation).select_related('sender')
+    if cursor:
+        position, pk = cursor
+        queryset = queryset.filter(Q(created_at__lt=position) | Q(created_at=position, pk__lt=pk))
+    rows = list(queryset.order_by('-created_at', '-pk')[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].pk) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def recount_unread():
+    """Rebuild the unread counters from the messages and notifications; returns the users updated."""
+    def unread(**filters):
+        messages = (
+            Message.objects.filter(conversation=OuterRef('conversation'), **filters)
+            .exclude(sender=OuterRef('user'))
+            .order_by().values('conversation').annotate(n=Count('pk')).values('n')
+        )
+        return Coalesce(Subquery(messages, output_field=IntegerField()), 0)
+
+    with transaction.atomic():
+        Participant.objects.filter(last_read_at__isnull=True).update(unread_count=unread())
+        Participant.objects.filter(last_read_at__isnull=False).update(
+            unread_count=unread(created_at__gt=OuterRef('last_read_at')),
+        )
+        totals = (
+            Participant.objects.filter(user=OuterRef('pk'))
+            .order_by().values('user').annotate(n=Sum('unread_count')).values('n')
+        )
+        notifications = (
+            Notification.objects.filter(user=OuterRef('pk'), read_at__isnull=True)
+            .order_by().values('user').annotate(n=Count('pk')).values('n')
+        )
+        return User.objects.update(
+            unread_messages=Coalesce(Subquery(totals, output_field=IntegerField()), 0),
+            unread_notifications=Coalesce(Subquery(notifications, output_field=IntegerField()), 0),
+        )
+
+
+def audited(instance):
+    """Fill in the audit fields that ``bulk_create()`` skips (``BaseModel.save()`` sets them)."""
+    instance.ip_address = current_ip()
+    instance.author = current_author()
+    return instance
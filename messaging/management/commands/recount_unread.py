@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from messaging.inbox import recount_unread
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the unread message and notification counters from the messages and "
+        "notifications, e.g. after a bulk import or a manual fix in the database."
+    )
+
+    def handle(self, *args, **options):
+        users = recount_unread()
+        self.stdout.write(self.style.SUCCESS(f"Recounted unread messages for {users} users."))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from messaging.announcements import deliver_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the e-mail copies of course announcements, in batches over one SMTP "
+        "connection and within the provider's rate limit. Run it from cron, or with "
+        "--interval; interrupted announcements resume where they stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="Look for new announcements every N seconds instead of exiting when none is left.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            completed = deliver_pending()
+            if completed:
+                self.stdout.write(f"Sent {completed} announcement(s) in {time.perf_counter() - start:.1f}s.")
+            if not options['interval']:
+                return
+            connection.close()
+            time.sleep(options['interval'])
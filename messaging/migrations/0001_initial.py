@@ -0,0 +1,87 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:39
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('course', '0010_course_capacity_waitlist'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('last_message', models.CharField(blank=True, help_text='Preview of the latest message, shown in the inbox.', max_length=255, verbose_name='Last Message')),
+                ('last_message_at', models.DateTimeField(blank=True, help_text='Date and time of the latest message.', null=True, verbose_name='Last Message At')),
+                ('course', models.ForeignKey(help_text='Course the conversation is about.', on_delete=django.db.models.deletion.CASCADE, related_name='conversations', to='course.course', verbose_name='Course')),
+                ('student', models.ForeignKey(help_text='Learner taking part in the conversation.', on_delete=django.db.models.deletion.CASCADE, related_name='student_conversations', to=settings.AUTH_USER_MODEL, verbose_name='Student')),
+                ('teacher', models.ForeignKey(help_text='User account of the course teacher.', on_delete=django.db.models.deletion.CASCADE, related_name='teacher_conversations', to=settings.AUTH_USER_MODEL, verbose_name='Teacher')),
+            ],
+            options={
+                'verbose_name': 'Conversation',
+                'verbose_name_plural': 'Conversations',
+                'ordering': ['-last_message_at'],
+                'unique_together': {('course', 'student')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Message',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('body', models.TextField(help_text='Text of the message.', verbose_name='Body')),
+                ('conversation', models.ForeignKey(help_text='Conversation the message belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='messaging.conversation', verbose_name='Conversation')),
+                ('sender', models.ForeignKey(help_text='User who wrote the message.', on_delete=django.db.models.deletion.CASCADE, related_name='sent_messages', to=settings.AUTH_USER_MODEL, verbose_name='Sender')),
+            ],
+            options={
+                'verbose_name': 'Message',
+                'verbose_name_plural': 'Messages',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['conversation', '-created_at', '-id'], name='messaging_thread_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Participant',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('unread_count', models.PositiveIntegerField(default=0, help_text='Messages of the other party not read yet.', verbose_name='Unread Count')),
+                ('last_message_at', models.DateTimeField(help_text="Copy of the conversation's latest message time, the inbox sort key.", verbose_name='Last Message At')),
+                ('last_read_at', models.DateTimeField(blank=True, help_text='Date and time the user last opened the conversation.', null=True, verbose_name='Last Read At')),
+                ('conversation', models.ForeignKey(help_text='Conversation the user takes part in.', on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='messaging.conversation', verbose_name='Conversation')),
+                ('user', models.ForeignKey(help_text='User taking part in the conversation.', on_delete=django.db.models.deletion.CASCADE, related_name='conversation_memberships', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Participant',
+                'verbose_name_plural': 'Participants',
+                'ordering': ['-last_message_at', '-id'],
+                'indexes': [models.Index(fields=['user', '-last_message_at', '-id'], name='messaging_inbox_idx')],
+                'unique_together': {('conversation', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:42
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0010_course_capacity_waitlist'),
+        ('messaging', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Announcement',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('title', models.CharField(help_text='Title of the announcement, also the e-mail subject.', max_length=200, verbose_name='Title')),
+                ('body', models.TextField(help_text='Text of the announcement.', verbose_name='Body')),
+                ('recipients', models.PositiveIntegerField(default=0, help_text='Number of learners notified.', verbose_name='Recipients')),
+                ('email_status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('done', 'Done')], default='pending', help_text='State of the e-mail fan-out.', max_length=20, verbose_name='E-mail Status')),
+                ('emails_sent', models.PositiveIntegerField(default=0, help_text='E-mails accepted by the mail server so far.', verbose_name='E-mails Sent')),
+                ('emails_failed', models.PositiveIntegerField(default=0, help_text='E-mails given up on after the retries.', verbose_name='E-mails Failed')),
+                ('email_cursor', models.UUIDField(blank=True, help_text='Last notification whose e-mail was handed to the mail server; the fan-out resumes after it.', null=True, verbose_name='E-mail Cursor')),
+                ('lease_expires_at', models.DateTimeField(blank=True, help_text='The worker sending the e-mails owns the announcement until then.', null=True, verbose_name='Lease Expires At')),
+                ('emails_finished_at', models.DateTimeField(blank=True, help_text='Date and time the last e-mail was sent.', null=True, verbose_name='E-mails Finished At')),
+                ('course', models.ForeignKey(help_text='Course whose learners are notified.', on_delete=django.db.models.deletion.CASCADE, related_name='announcements', to='course.course', verbose_name='Course')),
+                ('sender', models.ForeignKey(help_text='Teacher who published the announcement.', on_delete=django.db.models.deletion.CASCADE, related_name='announcements', to=settings.AUTH_USER_MODEL, verbose_name='Sender')),
+            ],
+            options={
+                'verbose_name': 'Announcement',
+                'verbose_name_plural': 'Announcements',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when the record was created.', verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when the record was last updated.', verbose_name='Updated at')),
+                ('is_deleted', models.BooleanField(default=False, help_text='Indicates whether the record is marked as deleted.', verbose_name='Is deleted')),
+                ('id', models.UUIDField(default=uuid.uuid4, help_text='Unique identifier for the model instance.', primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(blank=True, help_text='IP address of the user who created the record.', null=True, verbose_name='IP address')),
+                ('author', models.EmailField(blank=True, help_text='Email of the user who created the record.', max_length=254, null=True, verbose_name='Author')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional metadata stored as JSON.', null=True, verbose_name='Metadata')),
+                ('title', models.CharField(help_text='Title of the notification.', max_length=255, verbose_name='Title')),
+                ('url', models.CharField(blank=True, help_text='Page the notification links to (optional).', max_length=255, verbose_name='URL')),
+                ('read_at', models.DateTimeField(blank=True, help_text='Date and time the user saw the notification.', null=True, verbose_name='Read At')),
+                ('announcement', models.ForeignKey(blank=True, help_text='Announcement the notification comes from (optional).', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='messaging.announcement', verbose_name='Announcement')),
+                ('user', models.ForeignKey(help_text='User notified.', on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Notification',
+                'verbose_name_plural': 'Notifications',
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['email_status', 'created_at'], name='messaging_a_email_s_776c70_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='messaging_notifications_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['announcement', 'id'], name='messaging_fanout_idx'),
+        ),
+    ]
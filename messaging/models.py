@@ -0,0 +1,269 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from users.models import BaseModel
+from .enums import DeliveryStatus
+
+
+class Conversation(BaseModel):
+    """Private thread between a learner and the teacher of a course they are enrolled in."""
+    course = models.ForeignKey(
+        'course.Course',
+        on_delete=models.CASCADE,
+        related_name="conversations",
+        verbose_name=_("Course"),
+        help_text=_("Course the conversation is about.")
+    )
+    student = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name="student_conversations",
+        verbose_name=_("Student"),
+        help_text=_("Learner taking part in the conversation.")
+    )
+    teacher = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name="teacher_conversations",
+        verbose_name=_("Teacher"),
+        help_text=_("User account of the course teacher.")
+    )
+    last_message = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_("Last Message"),
+        help_text=_("Preview of the latest message, shown in the inbox.")
+    )
+    last_message_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Last Message At"),
+        help_text=_("Date and time of the latest message.")
+    )
+
+    class Meta:
+        verbose_name = _("Conversation")
+        verbose_name_plural = _("Conversations")
+        unique_together = ('course', 'student')
+        ordering = ["-last_message_at"]
+
+    def __str__(self):
+        return f"{self.student_id} / {self.teacher_id} about {self.course_id}"
+
+    def other_user(self, user):
+        return self.teacher if user.pk == self.student_id else self.student
+
+
+class Participant(BaseModel):
+    """A user's side of a conversation: their inbox entry and unread count."""
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name="participants",
+        verbose_name=_("Conversation"),
+        help_text=_("Conversation the user takes part in.")
+    )
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name="conversation_memberships",
+        verbose_name=_("User"),
+        help_text=_("User taking part in the conversation.")
+    )
+    unread_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Unread Count"),
+        help_text=_("Messages of the other party not read yet.")
+    )
+    last_message_at = models.DateTimeField(
+        verbose_name=_("Last Message At"),
+        help_text=_("Copy of the conversation's latest message time, the inbox sort key.")
+    )
+    last_read_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Last Read At"),
+        help_text=_("Date and time the user last opened the conversation.")
+    )
+
+    class Meta:
+        verbose_name = _("Participant")
+        verbose_name_plural = _("Participants")
+        unique_together = ('conversation', 'user')
+        ordering = ["-last_message_at", "-id"]
+        indexes = [models.Index(fields=['user', '-last_message_at', '-id'], name='messaging_inbox_idx')]
+
+    def __str__(self):
+        return f"{self.user_id} in {self.conversation_id} ({self.unread_count} unread)"
+
+
+class Message(BaseModel):
+    """A message in a conversation."""
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name="messages",
+        verbose_name=_("Conversation"),
+        help_text=_("Conversation the message belongs to.")
+    )
+    sender = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name="sent_messages",
+        verbose_name=_("Sender"),
+        help_text=_("User who wrote the message.")
+    )
+    body = models.TextField(
+        verbose_name=_("Body"),
+        help_text=_("Text of the message.")
+    )
+
+    class Meta:
+        verbose_name = _("Message")
+        verbose_name_plural = _("Messages")
+        ordering = ["-created_at", "-id"]
+        indexes = [models.Index(fields=['conversation', '-created_at', '-id'], name='messaging_thread_idx')]
+
+    def __str__(self):
+        return f"Message from {self.sender_id} in {self.conversation_id}"
+
+
+class Announcement(BaseModel):
+    """Message from a teacher to every learner enrolled in a course.
+
+    Learners get a ``Notification`` each; the e-mail copies are sent in the
+    background by ``manage.py send_announcements`` (see
+    ``messaging.announcements``), which records its progress here.
+    """
+    course = models.ForeignKey(
+        'course.Course',
+        on_delete=models.CASCADE,
+        related_name="announcements",
+        verbose_name=_("Course"),
+        help_text=_("Course whose learners are notified.")
+    )
+    sender = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name="announcements",
+        verbose_name=_("Sender"),
+        help_text=_("Teacher who published the announcement.")
+    )
+    title = models.CharField(
+        max_length=200,
+        verbose_name=_("Title"),
+        help_text=_("Title of the announcement, also the e-mail subject.")
+    )
+    body = models.TextField(
+        verbose_name=_("Body"),
+        help_text=_("Text of the announcement.")
+    )
+    recipients = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Recipients"),
+        help_text=_("Number of learners notified.")
+    )
+    email_status = models.CharField(
+        max_length=20,
+        choices=DeliveryStatus.choices,
+        default=DeliveryStatus.PENDING,
+        verbose_name=_("E-mail Status"),
+        help_text=_("State of the e-mail fan-out.")
+    )
+    emails_sent = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("E-mails Sent"),
+        help_text=_("E-mails accepted by the mail server so far.")
+    )
+    emails_failed = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("E-mails Failed"),
+        help_text=_("E-mails given up on after the retries.")
+    )
+    email_cursor = models.UUIDField(
+        null=True,
+        blank=True,
+        verbose_name=_("E-mail Cursor"),
+        help_text=_("Last notification whose e-mail was handed to the mail server; the fan-out resumes after it.")
+    )
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Lease Expires At"),
+        help_text=_("The worker sending the e-mails owns the announcement until then.")
+    )
+    emails_finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("E-mails Finished At"),
+        help_text=_("Date and time the last e-mail was sent.")
+    )
+
+    class Meta:
+        verbose_name = _("Announcement")
+        verbose_name_plural = _("Announcements")
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=['email_status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.title} ({self.course_id})"
+
+    @property
+    def emails_done(self):
+        return self.emails_sent + self.emails_failed
+
+    @property
+    def email_progress(self):
+        """Share of the e-mails handled, in percent."""
+        if not self.recipients:
+            return 100
+        return round(100 * self.emails_done / self.recipients)
+
+
+class Notification(BaseModel):
+    """In-app notice shown to a user, e.g. a course announcement."""
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        verbose_name=_("User"),
+        help_text=_("User notified.")
+    )
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="notifications",
+        verbose_name=_("Announcement"),
+        help_text=_("Announcement the notification comes from (optional).")
+    )
+    title = models.CharField(
+        max_length=255,
+        verbose_name=_("Title"),
+        help_text=_("Title of the notification.")
+    )
+    url = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_("URL"),
+        help_text=_("Page the notification links to (optional).")
+    )
+    read_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Read At"),
+        help_text=_("Date and time the user saw the notification.")
+    )
+
+    class Meta:
+        verbose_name = _("Notification")
+        verbose_name_plural = _("Notifications")
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='messaging_notifications_idx'),
+            models.Index(fields=['announcement', 'id'], name='messaging_fanout_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} for {self.user_id}"
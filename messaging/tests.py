@@ -0,0 +1,198 @@
+import smtplib
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.exceptions import PermissionDenied
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+from django.utils import timezone
+
+from course.enums import ClassLevel
+from course.models import Course, CourseEnrollment
+from users.models import Teacher, User
+from . import announcements
+from .announcements import Throttle, announce, claim, deliver, mark_notifications_read
+from .enums import DeliveryStatus
+from .inbox import mark_read, recount_unread, send_message, send_messages, start_conversation
+from .models import Announcement, Participant
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ScriptedBackend(EmailBackend):
+    """Locmem backend running the next of ``steps`` (if not None) before each send."""
+
+    def __init__(self, *steps, **kwargs):
+        super().__init__(**kwargs)
+        self.steps = list(steps)
+
+    def send_messages(self, messages):
+        step = self.steps.pop(0) if self.steps else None
+        if step is not None:
+            step()
+        return super().send_messages(messages)
+
+
+class MessagingTestCase(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user('teacher@example.com', 'Teacher', is_active=True)
+        self.course = Course.objects.create(
+            teacher=Teacher.objects.create(user=self.teacher), title='Fractions', description='',
+            class_level=ClassLevel.CLASS_6, content='',
+        )
+        self.learners = [
+            User.objects.create_user(f'learner{i}@example.com', f'Learner {i}', is_active=True)
+            for i in range(2)
+        ]
+        for learner in self.learners:
+            CourseEnrollment.objects.create(course=self.course, user=learner)
+
+    def unread(self, user):
+        return User.objects.values_list('unread_messages', 'unread_notifications').get(pk=user.pk)
+
+
+class InboxTests(MessagingTestCase):
+    def test_only_enrolled_learners_can_start_a_conversation(self):
+        outsider = User.objects.create_user('outsider@example.com', 'Outsider', is_active=True)
+        with self.assertRaises(PermissionDenied):
+            start_conversation(self.course, outsider)
+        conversation = start_conversation(self.course, self.learners[0])
+        self.assertEqual(start_conversation(self.course, self.learners[0]), conversation)
+
+    def test_messages_count_as_unread_for_the_recipient_only(self):
+        conversation = start_conversation(self.course, self.learners[0])
+        send_message(self.learners[0], conversation, 'Hello')
+        send_message(self.learners[0], conversation, 'Anyone?')
+        self.assertEqual(self.unread(self.teacher), (2, 0))
+        self.assertEqual(self.unread(self.learners[0]), (0, 0))
+
+    def test_reading_a_conversation_resets_both_counters(self):
+        conversation = start_conversation(self.course, self.learners[0])
+        send_message(self.learners[0], conversation, 'Hello')
+        participant = Participant.objects.get(conversation=conversation, user=self.teacher)
+        self.assertEqual(mark_read(participant), 1)
+        self.assertEqual(self.unread(self.teacher), (0, 0))
+        self.assertEqual(mark_read(participant), 0)
+
+    def test_one_send_reaches_many_conversations(self):
+        conversations = [start_conversation(self.course, learner) for learner in self.learners]
+        send_messages(self.teacher, conversations, 'Homework is due on Monday')
+        self.assertEqual([self.unread(learner) for learner in self.learners], [(1, 0), (1, 0)])
+
+    def test_strangers_cannot_post(self):
+        conversation = start_conversation(self.course, self.learners[0])
+        with self.assertRaises(PermissionDenied):
+            send_message(self.learners[1], conversation, 'Hi')
+
+    def test_recount_repairs_drifted_counters(self):
+        conversation = start_conversation(self.course, self.learners[0])
+        send_message(self.teacher, conversation, 'Hello')
+        User.objects.update(unread_messages=7)
+        Participant.objects.update(unread_count=7)
+        recount_unread()
+        self.assertEqual(self.unread(self.learners[0]), (1, 0))
+        self.assertEqual(self.unread(self.teacher), (0, 0))
+        self.assertEqual(Participant.objects.get(user=self.learners[0]).unread_count, 1)
+
+
+class AnnouncementTests(MessagingTestCase):
+    def test_announcement_notifies_every_enrolled_learner(self):
+        announcement = announce(self.course, self.teacher, 'Welcome', 'First lesson on Monday')
+        self.assertEqual(announcement.recipients, 2)
+        self.assertEqual([self.unread(learner) for learner in self.learners], [(0, 1), (0, 1)])
+        self.assertEqual(self.unread(self.teacher), (0, 0))
+
+    def test_marking_notifications_read(self):
+        announce(self.course, self.teacher, 'Welcome', 'First lesson on Monday')
+        announce(self.course, self.teacher, 'Reminder', 'Bring a ruler')
+        self.assertEqual(mark_notifications_read(self.learners[0]), 2)
+        self.assertEqual(self.unread(self.learners[0]), (0, 0))
+        self.assertEqual(self.unread(self.learners[1]), (0, 2))
+
+    def test_recount_repairs_drifted_notification_counters(self):
+        announce(self.course, self.teacher, 'Welcome', 'First lesson on Monday')
+        mark_notifications_read(self.learners[1])
+        User.objects.update(unread_notifications=7)
+        recount_unread()
+        self.assertEqual([self.unread(learner) for learner in self.learners], [(0, 1), (0, 0)])
+
+
+@mock.patch.object(announcements, 'BATCH_SIZE', 1)
+class DeliveryTests(MessagingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.announcement = announce(self.course, self.teacher, 'Welcome', 'First lesson on Monday')
+        self.clock = FakeClock()
+
+    def deliver(self, *steps):
+        announcement = claim()
+        throttle = Throttle(60, clock=self.clock, sleep=self.clock.sleep)
+        return deliver(announcement, connection=ScriptedBackend(*steps), throttle=throttle)
+
+    def recipients(self):
+        return [message.to[0] for message in mail.outbox]
+
+    def test_every_learner_gets_one_email(self):
+        self.assertTrue(self.deliver())
+        self.assertEqual(sorted(self.recipients()), [learner.email for learner in self.learners])
+        self.announcement.refresh_from_db()
+        self.assertEqual(self.announcement.email_status, DeliveryStatus.DONE)
+        self.assertEqual((self.announcement.emails_sent, self.announcement.emails_failed), (2, 0))
+        self.assertIsNone(self.announcement.lease_expires_at)
+        self.assertIsNone(claim())
+
+    def test_batches_are_spaced_to_the_rate(self):
+        self.deliver()
+        # 60 e-mails a minute, one per batch: the second batch waits a second.
+        self.assertEqual(self.clock.sleeps, [1.0])
+
+    def test_interrupted_run_resumes_after_the_last_batch(self):
+        def crash():
+            raise RuntimeError("worker killed")
+
+        with self.assertRaises(RuntimeError):
+            self.deliver(None, crash)
+        self.announcement.refresh_from_db()
+        self.assertEqual((self.announcement.email_status, self.announcement.emails_sent),
+                         (DeliveryStatus.SENDING, 1))
+        self.assertIsNone(claim())  # still leased
+        Announcement.objects.update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(self.deliver())
+        self.assertEqual(sorted(self.recipients()), [learner.email for learner in self.learners])
+        self.announcement.refresh_from_db()
+        self.assertEqual((self.announcement.email_status, self.announcement.emails_sent),
+                         (DeliveryStatus.DONE, 2))
+
+    def test_worker_stops_when_its_lease_is_taken(self):
+        def steal():
+            Announcement.objects.update(lease_expires_at=timezone.now() + timedelta(hours=1))
+
+        with self.assertLogs('messaging.announcements', 'WARNING'):
+            self.assertFalse(self.deliver(steal))
+        self.assertEqual(len(mail.outbox), 1)
+        self.announcement.refresh_from_db()
+        self.assertEqual((self.announcement.email_status, self.announcement.emails_sent),
+                         (DeliveryStatus.SENDING, 0))
+
+    def test_transport_errors_are_retried_then_counted_as_failed(self):
+        def refuse():
+            raise smtplib.SMTPServerDisconnected("connection lost")
+
+        with self.assertLogs('messaging.announcements', 'WARNING'):
+            self.assertTrue(self.deliver(refuse, None, refuse, refuse, refuse))
+        # 2s before the retry that succeeds; 2s then 4s for the batch that never goes out.
+        self.assertEqual(self.clock.sleeps, [2, 2, 4])
+        self.announcement.refresh_from_db()
+        self.assertEqual((self.announcement.emails_sent, self.announcement.emails_failed), (1, 1))
@@ -0,0 +1,20 @@
+from django.urls import path
+
+from .views import (
+    AnnouncementProgressView, AnnouncementView, ConversationView, InboxView, NotificationListView,
+    StartConversationView,
+)
+
+app_name = 'messaging'
+
+urlpatterns = [
+    path('', InboxView.as_view(), name='inbox'),
+    path('<uuid:pk>/', ConversationView.as_view(), name='conversation'),
+    path('start/<uuid:course_pk>/', StartConversationView.as_view(), name='start'),
+    path('notifications/', NotificationListView.as_view(), name='notifications'),
+    path('course/<uuid:course_pk>/announcements/', AnnouncementView.as_view(), name='announcements'),
+    path(
+        'course/<uuid:course_pk>/announcements/progress/',
+        AnnouncementProgressView.as_view(), name='announcement_progress',
+    ),
+]
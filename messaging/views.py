@@ -0,0 +1,168 @@
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views import View
+
+from core.http import decode_cursor, json_response
+from course.models import Course
+from users.models import Teacher, User
+from .announcements import announce, mark_notifications_read, notifications_page
+from .enums import DeliveryStatus
+from .forms import AnnouncementForm, BulkReplyForm, MessageForm
+from .inbox import inbox_page, mark_read, send_message, send_messages, start_conversation, thread_page
+from .models import Participant
+
+STUDENT_BASE = 'users/student/base_student.html'
+TEACHER_BASE = 'users/teacher/teacher_base.html'
+
+
+def _cursor(request):
+    try:
+        return decode_cursor(request.GET.get('cursor'))
+    except ValueError:
+        raise Http404
+
+
+class InboxView(LoginRequiredMixin, View):
+    template_name = 'users/student/messages.html'
+
+    def get(self, request):
+        return self.render(request, BulkReplyForm(request.user))
+
+    def post(self, request):
+        """Send one reply to all the checked conversations."""
+        form = BulkReplyForm(request.user, request.POST)
+        if not form.is_valid():
+            return self.render(request, form)
+        sent = send_messages(request.user, form.cleaned_data['conversations'], form.cleaned_data['body'])
+        messages.success(request, f"Message envoyé dans {len(sent)} conversation(s).", extra_tags='toast-success')
+        return redirect('messaging:inbox')
+
+    def render(self, request, form):
+        participants, next_cursor = inbox_page(request.user, _cursor(request))
+        is_teacher = Teacher.objects.filter(user=request.user, is_approved=True).exists()
+        return render(request, self.template_name, {
+            'participants': participants,
+            'next_cursor': next_cursor,
+            'form': form,
+            'base_template': TEACHER_BASE if is_teacher else STUDENT_BASE,
+        })
+
+
+class ConversationView(LoginRequiredMixin, View):
+    template_name = 'users/student/conversation.html'
+
+    def get(self, request, pk):
+        participant = self.get_participant(request, pk)
+        # The badge is rendered from the user row loaded before the reset.
+        read = mark_read(participant)
+        request.user.unread_messages = max(0, request.user.unread_messages - read)
+        return self.render(request, participant, MessageForm())
+
+    def post(self, request, pk):
+        participant = self.get_participant(request, pk)
+        form = MessageForm(request.POST)
+        if not form.is_valid():
+            return self.render(request, participant, form)
+        send_message(request.user, participant.conversation, form.cleaned_data['body'])
+        return redirect('messaging:conversation', pk=pk)
+
+    def get_participant(self, request, pk):
+        return get_object_or_404(
+            Participant.objects.select_related(
+                'conversation__course', 'conversation__student', 'conversation__teacher',
+            ),
+            conversation_id=pk, user=request.user,
+        )
+
+    def render(self, request, participant, form):
+        conversation = participant.conversation
+        thread, next_cursor = thread_page(conversation, _cursor(request))
+        return render(request, self.template_name, {
+            'conversation': conversation,
+            'other_user': conversation.other_user(request.user),
+            'thread': thread[::-1],
+            'next_cursor': next_cursor,
+            'form': form,
+            'base_template': TEACHER_BASE if request.user.pk == conversation.teacher_id else STUDENT_BASE,
+        })
+
+
+class StartConversationView(LoginRequiredMixin, View):
+    """Open (or reopen) the conversation about a course.
+
+    A learner writes to the course teacher; the teacher posts ``student`` to
+    write to one of the enrolled learners.
+    """
+
+    def post(self, request, course_pk):
+        course = get_object_or_404(Course.objects.select_related('teacher'), pk=course_pk)
+        if course.teacher.user_id == request.user.pk:
+            try:
+                student = get_object_or_404(User, pk=request.POST.get('student'))
+            except ValidationError:
+                raise Http404
+        else:
+            student = request.user
+        conversation = start_conversation(course, student)
+        return redirect('messaging:conversation', pk=conversation.pk)
+
+
+class NotificationListView(LoginRequiredMixin, View):
+    template_name = 'users/student/notifications.html'
+
+    def get(self, request):
+        notifications, next_cursor = notifications_page(request.user, _cursor(request))
+        mark_notifications_read(request.user)
+        request.user.unread_notifications = 0
+        is_teacher = Teacher.objects.filter(user=request.user, is_approved=True).exists()
+        return render(request, self.template_name, {
+            'notifications': notifications,
+            'next_cursor': next_cursor,
+            'base_template': TEACHER_BASE if is_teacher else STUDENT_BASE,
+        })
+
+
+class AnnouncementView(LoginRequiredMixin, View):
+    """Announcements of one of the teacher's courses, with their e-mail progress."""
+    template_name = 'users/teacher/announcements.html'
+
+    def get(self, request, course_pk):
+        return self.render(request, _teacher_course(request, course_pk), AnnouncementForm())
+
+    def post(self, request, course_pk):
+        course = _teacher_course(request, course_pk)
+        form = AnnouncementForm(request.POST)
+        if not form.is_valid():
+            return self.render(request, course, form)
+        announcement = announce(course, request.user, form.cleaned_data['title'], form.cleaned_data['body'])
+        messages.success(
+            request, f"Annonce publiée pour {announcement.recipients} apprenant(s).", extra_tags='toast-success',
+        )
+        return redirect('messaging:announcements', course_pk=course.pk)
+
+    def render(self, request, course, form):
+        announcements = list(course.announcements.all()[:20])
+        return render(request, self.template_name, {
+            'course': course,
+            'announcements': announcements,
+            'sending': any(announcement.email_status != DeliveryStatus.DONE for announcement in announcements),
+            'form': form,
+        })
+
+
+class AnnouncementProgressView(LoginRequiredMixin, View):
+    """E-mail progress of the course's latest announcements, polled by the announcements page."""
+
+    def get(self, request, course_pk):
+        course = _teacher_course(request, course_pk)
+        rows = course.announcements.values(
+            'id', 'email_status', 'recipients', 'emails_sent', 'emails_failed',
+        )[:20]
+        return json_response({'announcements': list(rows)})
+
+
+def _teacher_course(request, course_pk):
+    return get_object_or_404(Course, pk=course_pk, teacher__user=request.user)
@@ -72,12 +72,12 @@ class TeacherAdmin(admin.ModelAdmin):
 
 @admin.register(TwoFactorCode)
 class TwoFactorCodeAdmin(admin.ModelAdmin):
-    list_display = ['user', 'code', 'expiry', 'created_at']
-    search_fields = ['user__email', 'user__first_name', 'user__last_name', 'code']
-    readonly_fields = ['created_at', 'updated_at']
+    list_display = ['user', 'expiry', 'attempts', 'created_at']
+    search_fields = ['user__email', 'user__first_name', 'user__last_name']
+    readonly_fields = ['created_at', 'updated_at', 'code']
     fieldsets = (
         (None, {
-            'fields': ('user', 'code', 'expiry')
+            'fields': ('user', 'code', 'expiry', 'attempts')
         }),
         ('Metadata', {
             'fields': ('created_at', 'updated_at', 'id', 'ip_address', 'author', 'metadata')
@@ -0,0 +1,12 @@
+from django.utils import timezone
+
+from core.db.purge import PurgeCommand
+from users.models import TwoFactorCode
+
+
+class Command(PurgeCommand):
+    help = "Delete expired two-factor codes in small batches, walking the expiry index (see core.db.purge)."
+    noun = 'two-factor codes'
+
+    def expired(self):
+        return TwoFactorCode.objects.filter(expiry__lt=timezone.now()).order_by('expiry')
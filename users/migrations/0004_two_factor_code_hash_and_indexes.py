@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_remove_teacher_qualifications_teacher_is_approved_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='twofactorcode',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Failed verification attempts for this code.', verbose_name='Attempts'),
+        ),
+        migrations.AlterField(
+            model_name='twofactorcode',
+            name='code',
+            field=models.CharField(help_text='Keyed hash of the 6-digit verification code.', max_length=128, verbose_name='Code'),
+        ),
+        migrations.AddIndex(
+            model_name='twofactorcode',
+            index=models.Index(fields=['user', 'expiry'], name='users_twofa_user_id_4c97e0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='twofactorcode',
+            index=models.Index(fields=['expiry'], name='users_twofa_expiry_2ef6c8_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_two_factor_code_hash_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_messages',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of unread messages, maintained by conditional updates in messaging.inbox.', verbose_name='Unread messages'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_user_unread_messages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_notifications',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of unread notifications, maintained by updates in messaging.announcements.', verbose_name='Unread notifications'),
+        ),
+    ]
@@ -6,6 +6,7 @@ from django.utils import timezone
 from datetime import timedelta
 import uuid
 from .managers import UserManager
+from core.context import current_author, current_ip
 
 # Choices pour le rôle de l'utilisateur
 USER_ROLES = (
@@ -67,11 +68,32 @@ class BaseModel(models.Model):
         help_text=_("Additional metadata stored as JSON.")
     )
 
+    # Counter columns, changed only by conditional UPDATEs. The UPDATE of a
+    # save() that does not name them in update_fields leaves them out, so the
+    # copy loaded with the instance, possibly stale, is never written back.
+    # Otherwise save() behaves as usual: update_fields stays None for signal
+    # receivers, and a missing row is inserted (with the loaded values).
+    COUNTER_FIELDS = frozenset()
+
     class Meta:
         abstract = True
         verbose_name = _("Base Model")
         verbose_name_plural = _("Base Models")
 
+    def save(self, *args, **kwargs):
+        # Audit fields come from the current request (core.context), if any.
+        if self._state.adding:
+            if self.ip_address is None:
+                self.ip_address = current_ip()
+            if self.author is None:
+                self.author = current_author()
+        super().save(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        if update_fields is None and self.COUNTER_FIELDS:
+            values = [value for value in values if value[0].name not in self.COUNTER_FIELDS]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
 class User(AbstractUser, BaseModel):
     """Custom user model managing users: superuser, learner, and admin."""
     
@@ -123,11 +145,25 @@ class User(AbstractUser, BaseModel):
         verbose_name=_("Role"),
         help_text=_("User's role (learner or admin).")
     )
+    unread_messages = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Unread messages"),
+        help_text=_("Number of unread messages, maintained by conditional updates in messaging.inbox.")
+    )
+    unread_notifications = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Unread notifications"),
+        help_text=_("Number of unread notifications, maintained by updates in messaging.announcements.")
+    )
     username = None
     EMAIL_FIELD = "email"
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ['last_name']
 
+    COUNTER_FIELDS = frozenset({'unread_messages', 'unread_notifications'})
+
     objects = UserManager()
 
     class Meta:
@@ -280,7 +316,12 @@ class Teacher(BaseModel):
 #         return f"Teacher Request by {self.user.email} - {self.get_status_display()}"
 
 class TwoFactorCode(BaseModel):
-    """Model for two-factor authentication codes."""
+    """Two-factor code kept in the database when the cache cannot be used.
+
+    Codes normally live only in the cache (see ``users.two_factor``); rows
+    here are the fallback and audit trail, and are purged by
+    ``manage.py purge_two_factor_codes``.
+    """
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -288,14 +329,19 @@ class TwoFactorCode(BaseModel):
         help_text=_("User associated with the 2FA code.")
     )
     code = models.CharField(
-        max_length=6,
+        max_length=128,
         verbose_name=_("Code"),
-        help_text=_("6-digit verification code.")
+        help_text=_("Keyed hash of the 6-digit verification code.")
     )
     expiry = models.DateTimeField(
         verbose_name=_("Expiry"),
         help_text=_("Date and time when the code expires.")
     )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_("Attempts"),
+        help_text=_("Failed verification attempts for this code.")
+    )
 
     def is_valid(self):
         """Check if the code is still valid (not expired)."""
@@ -310,6 +356,10 @@ class TwoFactorCode(BaseModel):
     class Meta:
         verbose_name = _("Two Factor Code")
         verbose_name_plural = _("Two Factor Codes")
+        indexes = [
+            models.Index(fields=['user', 'expiry']),
+            models.Index(fields=['expiry']),
+        ]
 
     def __str__(self):
-        return f"2FA Code for {self.user.email} - {self.code}"
\ No newline at end of file
+        return f"2FA Code for {self.user.email} (expires {self.expiry:%Y-%m-%d %H:%M})"
\ No newline at end of file
@@ -1,3 +1,111 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.db.models import F
 from django.test import TestCase
+from django.urls import reverse
+
+from . import two_factor
+from .models import TwoFactorCode, User
+
+
+class BrokenCache:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("cache down")
+        return fail
+
+
+class TwoFactorCodeTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user('staff@example.com', 'Staff', 'secret', is_active=True)
+
+    def test_code_is_consumed_by_a_successful_check(self):
+        code = two_factor.issue_code(self.user.pk)
+        self.assertTrue(two_factor.verify_code(self.user.pk, f' {code} '))
+        self.assertFalse(two_factor.verify_code(self.user.pk, code))
+
+    def test_new_code_replaces_the_previous_one(self):
+        first = two_factor.issue_code(self.user.pk)
+        second = two_factor.issue_code(self.user.pk)
+        if first != second:
+            self.assertFalse(two_factor.verify_code(self.user.pk, first))
+        self.assertTrue(two_factor.verify_code(self.user.pk, second))
+
+    def test_code_is_burnt_after_too_many_attempts(self):
+        code = two_factor.issue_code(self.user.pk)
+        wrong = f'{(int(code) + 1) % 10 ** 6:06d}'
+        for _ in range(two_factor.MAX_ATTEMPTS):
+            self.assertFalse(two_factor.verify_code(self.user.pk, wrong))
+        self.assertFalse(two_factor.verify_code(self.user.pk, code))
+
+    def test_codes_fall_back_to_the_database_without_a_cache(self):
+        with mock.patch.object(two_factor, 'caches', {two_factor.CACHE_ALIAS: BrokenCache()}), \
+                self.assertLogs('users.two_factor', 'WARNING'):
+            code = two_factor.issue_code(self.user.pk)
+            self.assertEqual(TwoFactorCode.objects.filter(user=self.user).count(), 1)
+            self.assertFalse(two_factor.verify_code(self.user.pk, 'nope'))
+            self.assertTrue(two_factor.verify_code(self.user.pk, code))
+        self.assertFalse(TwoFactorCode.objects.filter(user=self.user).exists())
+
+    def test_discard_drops_cached_and_stored_codes(self):
+        code = two_factor.issue_code(self.user.pk)
+        with mock.patch.object(two_factor, 'caches', {two_factor.CACHE_ALIAS: BrokenCache()}), \
+                self.assertLogs('users.two_factor', 'WARNING'):
+            two_factor.issue_code(self.user.pk)
+        two_factor.discard(self.user.pk)
+        self.assertFalse(two_factor.verify_code(self.user.pk, code))
+        self.assertFalse(TwoFactorCode.objects.filter(user=self.user).exists())
+
+    def test_pending_token_round_trip(self):
+        token = two_factor.pending_token(self.user.pk)
+        self.assertEqual(two_factor.pending_user_id(token), str(self.user.pk))
+        self.assertIsNone(two_factor.pending_user_id(token + 'x'))
+
+
+class TwoFactorVerifyViewTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user('staff@example.com', 'Staff', 'secret', is_active=True)
+        self.url = reverse('users:two_factor_verify')
+
+    def post(self, code):
+        return self.client.post(self.url, {'token': two_factor.pending_token(self.user.pk), 'code': code})
+
+    def test_valid_code_logs_in(self):
+        response = self.post(two_factor.issue_code(self.user.pk))
+        self.assertRedirects(response, reverse('users:student_dashboard'), fetch_redirect_response=False)
+        self.assertEqual(self.client.session['_auth_user_id'], str(self.user.pk))
+
+    def test_invalid_code_asks_again(self):
+        two_factor.issue_code(self.user.pk)
+        response = self.post('000000x')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_deactivated_user_is_sent_back_to_login(self):
+        code = two_factor.issue_code(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.post(code)
+        self.assertRedirects(response, reverse('users:login'), fetch_redirect_response=False)
+        self.assertNotIn('_auth_user_id', self.client.session)
+        # The pending code is gone.
+        self.assertFalse(two_factor.verify_code(self.user.pk, code))
+
+    def test_deleted_user_is_sent_back_to_login(self):
+        code = two_factor.issue_code(self.user.pk)
+        token = two_factor.pending_token(self.user.pk)
+        self.user.delete()
+        response = self.client.post(self.url, {'token': token, 'code': code})
+        self.assertRedirects(response, reverse('users:login'), fetch_redirect_response=False)
+
 
-# Create your tests here.
+class UserCountersTests(TestCase):
+    def test_save_never_writes_back_the_counters(self):
+        user = User.objects.create_user('learner@example.com', 'Learner', 'secret')
+        User.objects.filter(pk=user.pk).update(unread_messages=F('unread_messages') + 3)
+        user.first_name = 'Ada'
+        user.save()
+        user.refresh_from_db()
+        self.assertEqual((user.first_name, user.unread_messages), ('Ada', 3))
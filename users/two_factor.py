@@ -0,0 +1,122 @@
+"""One-time email codes for two-factor login, stored in the cache.
+
+A code lives under ``2fa:<user id>`` with the cache's own TTL, so it expires
+without any cleanup, and only a keyed hash (HMAC with ``SECRET_KEY``) is
+stored. Failed attempts are counted in a sibling key with ``incr()``; after
+``MAX_ATTEMPTS`` the code is burnt. Issuing and verifying a code therefore
+never touches the database.
+
+If the cache is unavailable, codes fall back to ``TwoFactorCode`` rows
+(same hash, same attempt limit), looked up through the ``(user, expiry)``
+index; expired rows are removed by ``manage.py purge_two_factor_codes``.
+"""
+import hashlib
+import hmac
+import logging
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TwoFactorCode
+
+logger = logging.getLogger(__name__)
+
+_options = getattr(settings, 'TWO_FACTOR', {})
+TTL = _options.get('TTL', 600)
+MAX_ATTEMPTS = _options.get('MAX_ATTEMPTS', 5)
+CACHE_ALIAS = _options.get('CACHE_ALIAS', 'default')
+SALT = 'users.two_factor'
+
+
+def _hash(user_id, code):
+    message = f"{user_id}:{code}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def _keys(user_id):
+    return f"2fa:{user_id}", f"2fa:{user_id}:attempts"
+
+
+def issue_code(user_id):
+    """Create a fresh code for the user (replacing any previous one) and return it."""
+    code = f"{secrets.randbelow(10 ** 6):06d}"
+    code_key, attempts_key = _keys(user_id)
+    cache = caches[CACHE_ALIAS]
+    try:
+        cache.set_many({code_key: _hash(user_id, code), attempts_key: 0}, TTL)
+    except Exception:
+        logger.warning("2FA cache unavailable; storing the code in the database", exc_info=True)
+        TwoFactorCode.objects.create(
+            user_id=user_id, code=_hash(user_id, code), expiry=timezone.now() + timedelta(seconds=TTL)
+        )
+    return code
+
+
+def verify_code(user_id, code):
+    """Return True if ``code`` is the user's current code; the code is then consumed."""
+    code = (code or '').strip()
+    code_key, attempts_key = _keys(user_id)
+    cache = caches[CACHE_ALIAS]
+    try:
+        expected = cache.get(code_key)
+    except Exception:
+        logger.warning("2FA cache unavailable; checking the database", exc_info=True)
+        return _verify_from_db(user_id, code)
+    if expected is None:
+        return False
+    if hmac.compare_digest(expected, _hash(user_id, code)):
+        cache.delete_many([code_key, attempts_key])
+        return True
+    try:
+        attempts = cache.incr(attempts_key)
+    except ValueError:
+        # The counter expired a moment before the code; nothing left to guess.
+        attempts = MAX_ATTEMPTS
+    if attempts >= MAX_ATTEMPTS:
+        cache.delete_many([code_key, attempts_key])
+    return False
+
+
+def discard(user_id):
+    """Drop the user's pending code, wherever it is stored."""
+    try:
+        caches[CACHE_ALIAS].delete_many(list(_keys(user_id)))
+    except Exception:
+        logger.warning("2FA cache unavailable; discarding the database codes only", exc_info=True)
+    TwoFactorCode.objects.filter(user_id=user_id).delete()
+
+
+def _verify_from_db(user_id, code):
+    row = (
+        TwoFactorCode.objects.filter(user_id=user_id, expiry__gte=timezone.now(), attempts__lt=MAX_ATTEMPTS)
+        .order_by('-expiry').first()
+    )
+    if row is None:
+        return False
+    if hmac.compare_digest(row.code, _hash(user_id, code)):
+        TwoFactorCode.objects.filter(user_id=user_id).delete()
+        return True
+    TwoFactorCode.objects.filter(pk=row.pk).update(attempts=F('attempts') + 1)
+    return False
+
+
+def is_required(user):
+    return _options.get('REQUIRED_FOR_STAFF', False) and user.is_staff
+
+
+def pending_token(user_id):
+    """Signed, timestamped token carrying the user between the password and code steps."""
+    return signing.dumps(str(user_id), salt=SALT)
+
+
+def pending_user_id(token):
+    """User id from a ``pending_token``, or None if it is forged or older than the code TTL."""
+    try:
+        return signing.loads(token, salt=SALT, max_age=TTL)
+    except signing.BadSignature:
+        return None
@@ -8,6 +8,7 @@ urlpatterns = [
     path('signup/', views.signup, name='signup'),
     path('activate/<str:uidb64>/<str:token>/', views.activate, name='activate'),
     path('login/', views.login_view, name='login'),
+    path('login/verify/', views.two_factor_verify, name='two_factor_verify'),
     path('profile/', views.profile, name='profile'),
     path('submit-teacher-request/', views.submit_teacher_request, name='submit_teacher_request'),
     path('admin/teacher-requests/', views.admin_teacher_requests, name='admin_teacher_requests'),
@@ -21,8 +22,8 @@ urlpatterns = [
     path('student/dashboard/', views.StudentDashboardView.as_view(), name='student_dashboard'),
     path('student/my-courses/', views.MyCoursesView.as_view(), name='my_courses'),
     path('student/progress/', views.ProgressView.as_view(), name='progress'),
+    path('student/api/progress/', views.ProgressAPIView.as_view(), name='progress_api'),
     path('student/certificates/', views.CertificatesView.as_view(), name='certificates'),
-    path('student/messages/', views.MessagesView.as_view(), name='messages'),
     path('student/settings/', views.SettingsView.as_view(), name='settings'),
 
     # path('admin/teacher/<uuid:user_id>/approve/', views.approve_teacher, name='approve_teacher'),
@@ -1,4 +1,8 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
+from django.http import JsonResponse
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.sites.shortcuts import get_current_site
@@ -12,11 +16,21 @@ from django.utils import timezone
 from .forms import SignUpForm
 from .models import User
 from .tokens import registration_token
+from . import two_factor
 from django.views.generic import TemplateView
 from django.views.generic import TemplateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
 from django.shortcuts import render
-from course.models import Course
+from django.template.response import TemplateResponse
+from core.cache import tiered_cache
+from core.db.aio import alist
+from core.enums import ActivityKind
+from core.events import activity_log
+from core.http import auser
+from core.ratelimit import ratelimit
+from course.models import Course, CourseEnrollment
+from course.progress import learner_enrollments, progress_summary, weekly_completions
 from course.enums import ClassLevel
 
 def home(request):
@@ -24,6 +38,7 @@ def home(request):
     if request.user.is_authenticated:
         return redirect('users:profile')
     return render(request, 'index.html')
+@ratelimit('signup')
 def signup(request):
     """Vue pour l'inscription des utilisateurs."""
     if request.method == 'POST':
@@ -50,6 +65,7 @@ def signup(request):
         form = SignUpForm()
     return render(request, 'users/signup.html', {'form': form})
 
+@ratelimit('activate', methods=('GET', 'POST'))
 def activate(request, uidb64, token):
     """Vue pour activer le compte via le lien d'activation."""
     try:
@@ -67,6 +83,7 @@ def activate(request, uidb64, token):
         messages.error(request, _("Le lien d'activation est invalide ou a expiré."))
         return redirect('users:signup')
 
+@ratelimit('login')
 def login_view(request):
     """Vue pour la connexion des utilisateurs."""
     if request.method == 'POST':
@@ -75,26 +92,81 @@ def login_view(request):
         user = authenticate(request, email=email, password=password)
         if user is not None:
             if user.is_active:
+                if two_factor.is_required(user):
+                    return _start_two_factor(request, user)
                 login(request, user)
-                if user.is_superuser:
-                    return redirect('users:admin_dashboard')
-                elif user.role == 'teacher':
-                    return redirect('users:teacher_dashboard')
-                else:  # learner
-                    return redirect('users:student_dashboard')
+                return _after_login(request, user)
             else:
                 messages.error(request, _("Votre compte n'est pas activé. Vérifiez votre email."))
         else:
             messages.error(request, _("Email ou mot de passe incorrect."))
     return render(request, 'users/login.html')
 
-class StudentDashboardView(LoginRequiredMixin, TemplateView):
+def _after_login(request, user):
+    activity_log.record(ActivityKind.LOGIN, user=user)
+    if user.is_superuser:
+        return redirect('users:admin_dashboard')
+    elif user.role == 'teacher':
+        return redirect('users:teacher_dashboard')
+    else:  # learner
+        return redirect('users:student_dashboard')
+
+def _start_two_factor(request, user):
+    """Email a one-time code and ask for it; nothing is written to the session yet."""
+    code = two_factor.issue_code(user.pk)
+    message = render_to_string('users/two_factor_email.html', {
+        'user': user, 'code': code, 'minutes': two_factor.TTL // 60,
+    })
+    EmailMessage(_("Votre code de connexion After School"), message, to=[user.email]).send()
+    return render(request, 'users/two_factor.html', {'token': two_factor.pending_token(user.pk)})
+
+@ratelimit('two_factor')
+def two_factor_verify(request):
+    """Vue pour la saisie du code de connexion à deux facteurs."""
+    if request.method != 'POST':
+        return redirect('users:login')
+    token = request.POST.get('token', '')
+    user_id = two_factor.pending_user_id(token)
+    if user_id is None:
+        messages.error(request, _("La vérification a expiré. Veuillez vous reconnecter."))
+        return redirect('users:login')
+    # The account may have been deleted or deactivated since the password step.
+    user = User.objects.filter(pk=user_id, is_active=True).first()
+    if user is None:
+        two_factor.discard(user_id)
+        messages.error(request, _("La vérification a expiré. Veuillez vous reconnecter."))
+        return redirect('users:login')
+    if not two_factor.verify_code(user_id, request.POST.get('code')):
+        messages.error(request, _("Code invalide ou expiré."))
+        return render(request, 'users/two_factor.html', {'token': token})
+    login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+    return _after_login(request, user)
+
+class StudentDashboardView(View):
     template_name = 'users/student/admin_student.html'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['courses'] = Course.objects.filter(is_public=True, status='published')
-        return context
+    async def get(self, request):
+        user = await auser(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        enrollments, courses = await asyncio.gather(
+            alist(CourseEnrollment.objects.filter(user=user).select_related('course__teacher__user')),
+            sync_to_async(public_courses)(),
+        )
+        return TemplateResponse(request, self.template_name, {
+            'enrollments': enrollments,
+            'enrolled_course_ids': {enrollment.course_id for enrollment in enrollments},
+            'courses': courses,
+        })
+
+
+def public_courses():
+    """Public, published courses, cached until any course or teacher changes."""
+    return tiered_cache.get_or_set(
+        'catalog:public',
+        lambda: list(Course.objects.filter(is_public=True, status='published').select_related('teacher__user')),
+        tags=['catalog'],
+    )
 
 class MyCoursesView(LoginRequiredMixin, View):
     def get(self, request):
@@ -107,17 +179,34 @@ class MyCoursesView(LoginRequiredMixin, View):
         if class_level:
             context['courses'] = Course.objects.filter(
                 is_public=True, status='published', class_level=class_level
+            ).select_related('teacher__user')
+            context['enrolled_course_ids'] = set(
+                CourseEnrollment.objects.filter(user=request.user).values_list('course_id', flat=True)
             )
         return render(request, 'users/student/my_courses.html', context)
 
 class ProgressView(LoginRequiredMixin, TemplateView):
     template_name = 'users/student/progress.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['enrollments'] = learner_enrollments(self.request.user)
+        context['weekly_completions'] = weekly_completions(self.request.user)
+        return context
+
+class ProgressAPIView(LoginRequiredMixin, View):
+    """Progress, certificates and weekly history of the learner, as JSON."""
+
+    def get(self, request):
+        return JsonResponse(progress_summary(request.user))
+
 class CertificatesView(LoginRequiredMixin, TemplateView):
     template_name = 'users/student/certificates.html'
 
-class MessagesView(LoginRequiredMixin, TemplateView):
-    template_name = 'users/student/messages.html'
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['enrollments'] = [e for e in learner_enrollments(self.request.user) if e.completed]
+        return context
 
 class SettingsView(LoginRequiredMixin, TemplateView):
     template_name = 'users/student/settings.html'